@@ -0,0 +1,266 @@
+"""
+Audio Store
+Shared local store of downloaded audio streams keyed by video ID and format ID,
+so MP3 conversion, transcription and playlist runs download each video only once
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import metadata_cache
+import metrics
+
+# Store location (override with YTTOOL_AUDIO_CACHE)
+DEFAULT_STORE_DIR = Path.home() / ".cache" / "yttool" / "audio"
+
+# Byte budget in MB (override with YTTOOL_AUDIO_CACHE_MAX_MB)
+DEFAULT_MAX_MB = 2048
+
+# Eviction policy (override with YTTOOL_AUDIO_CACHE_POLICY):
+#   lru     - evict the least recently used streams first
+#   largest - evict the biggest streams first (keeps many short videos)
+EVICTION_POLICIES = ('lru', 'largest')
+DEFAULT_POLICY = 'lru'
+
+# Same stream every command asks yt-dlp for
+AUDIO_FORMAT = 'bestaudio/best'
+
+PARTIAL_SUFFIXES = ('.part', '.ytdl', '.temp')
+
+# Streams in use by this process (store key -> number of users); prune() skips
+# them, so one download's eviction cannot delete audio another thread still needs
+_pins = {}
+_pins_lock = threading.Lock()
+
+
+def get_store_dir():
+    """Get the audio store directory"""
+    return Path(os.environ.get('YTTOOL_AUDIO_CACHE', DEFAULT_STORE_DIR))
+
+
+def get_max_bytes():
+    """Get the store byte budget"""
+    try:
+        max_mb = float(os.environ.get('YTTOOL_AUDIO_CACHE_MAX_MB', DEFAULT_MAX_MB))
+    except ValueError:
+        max_mb = DEFAULT_MAX_MB
+    return int(max_mb * 1024 * 1024)
+
+
+def get_policy():
+    """Get the eviction policy"""
+    policy = os.environ.get('YTTOOL_AUDIO_CACHE_POLICY', DEFAULT_POLICY)
+    return policy if policy in EVICTION_POLICIES else DEFAULT_POLICY
+
+
+def get_key(info):
+    """Store key for a processed yt-dlp info dict: <video id>.<format id>"""
+    format_id = str(info.get('format_id') or 'unknown').replace(os.sep, '_')
+    return f"{info['id']}.{format_id}"
+
+
+def _key_of(path):
+    """Store key of a stored stream's path (<key>.<ext>)"""
+    return Path(path).name.rsplit('.', 1)[0]
+
+
+def _pin(key):
+    with _pins_lock:
+        _pins[key] = _pins.get(key, 0) + 1
+
+
+def _unpin(key):
+    with _pins_lock:
+        if key not in _pins:
+            return
+        _pins[key] -= 1
+        if not _pins[key]:
+            del _pins[key]
+
+
+def release(stored):
+    """Unpin a stream returned by ensure_audio(..., pin=True)
+
+    Paths outside the store (or not pinned) are ignored, so callers can release
+    whatever audio file they were handed.
+    """
+    if Path(stored).parent == get_store_dir():
+        _unpin(_key_of(stored))
+
+
+def find(info):
+    """Path of the stored stream for an info dict, or None"""
+    store_dir = get_store_dir()
+    if not store_dir.exists():
+        return None
+    key = get_key(info)
+    for path in store_dir.glob(f"{key}.*"):
+        if path.is_file() and path.suffix not in PARTIAL_SUFFIXES:
+            return path
+    return None
+
+
+def extract_info(url, quiet=True, refresh=False):
+    """Extract info for a URL with the store's format selection applied
+
+    Served from the metadata cache while fresh; refresh=True always extracts.
+    """
+    with metrics.stage('metadata'):
+        return metadata_cache.extract_info(
+            url,
+            {'format': AUDIO_FORMAT, 'quiet': quiet, 'no_warnings': quiet},
+            variant=AUDIO_FORMAT,
+            refresh=refresh,
+        )
+
+
+def ensure_audio(url, info=None, quiet=False, pin=False):
+    """Return (path, info) for a video's audio stream, downloading it only if not stored
+
+    info may be an info dict already extracted with AUDIO_FORMAT, which saves a
+    metadata round-trip. If a download from cached metadata fails (its stream
+    URLs may have expired), the metadata is extracted again and the download
+    retried once. Raises on download failure.
+    With pin=True the stream stays pinned (never evicted by this process) until
+    the caller passes the path to release(); nothing stays pinned if this raises.
+    """
+    if info is None:
+        info = extract_info(url)
+
+    key = get_key(info)
+    _pin(key)
+    try:
+        stored = find(info)
+        if stored:
+            if not quiet:
+                print(f"⚡ Using stored audio: {stored.name}")
+            try:
+                os.utime(stored)  # mtime is the LRU clock
+            except OSError:
+                pass
+        else:
+            try:
+                stored = _download(info, quiet)
+            except Exception as e:
+                if not info.get(metadata_cache.CACHED_AT_KEY):
+                    raise
+                if not quiet:
+                    print(f"⚠️  Download from cached metadata failed ({e}), refreshing metadata")
+                info = extract_info(url, refresh=True)
+                _pin(get_key(info))
+                _unpin(key)
+                key = get_key(info)
+                stored = find(info) or _download(info, quiet)
+
+            prune(get_max_bytes(), get_policy(), keep=stored)
+    except BaseException:
+        _unpin(key)
+        raise
+
+    if not pin:
+        _unpin(key)
+    return stored, info
+
+
+def _download(info, quiet=False):
+    """Download the stream for an info dict into the store and return its path"""
+    import yt_dlp
+
+    store_dir = get_store_dir()
+    store_dir.mkdir(parents=True, exist_ok=True)
+    ydl_opts = {
+        'format': AUDIO_FORMAT,
+        'outtmpl': str(store_dir / f"{get_key(info)}.%(ext)s"),
+        'quiet': quiet,
+        'no_warnings': quiet,
+    }
+    with metrics.stage('download'):
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            ydl.process_ie_result(info, download=True)
+
+    stored = find(info)
+    if not stored:
+        raise FileNotFoundError(f"Downloaded audio not found in store for {info.get('id')}")
+    metrics.add('bytes_downloaded', stored.stat().st_size)
+    return stored
+
+
+def link(stored, target):
+    """Place a stored stream at target (hard link, falling back to a copy)"""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.exists():
+        target.unlink()
+    try:
+        os.link(stored, target)
+    except OSError:
+        shutil.copyfile(stored, target)
+    return target
+
+
+def list_entries():
+    """List stored streams, most recently used first"""
+    store_dir = get_store_dir()
+    if not store_dir.exists():
+        return []
+
+    entries = []
+    for path in store_dir.iterdir():
+        if not path.is_file() or path.suffix in PARTIAL_SUFFIXES:
+            continue
+        stat = path.stat()
+        video_id, _, rest = path.name.partition('.')
+        entries.append({
+            'path': path,
+            'video_id': video_id,
+            'format_id': rest.rsplit('.', 1)[0],
+            'size': stat.st_size,
+            'last_used': stat.st_mtime,
+        })
+    entries.sort(key=lambda e: e['last_used'], reverse=True)
+    return entries
+
+
+def prune(max_bytes=None, policy=DEFAULT_POLICY, keep=None):
+    """Evict stored streams until the store fits in max_bytes
+
+    keep is never evicted (the stream the caller is about to use), and
+    neither are streams pinned by ensure_audio() in this process.
+    Returns (removed_count, freed_bytes).
+    """
+    entries = list_entries()
+    total = sum(e['size'] for e in entries)
+    if max_bytes is None or total <= max_bytes:
+        return 0, 0
+
+    if policy == 'largest':
+        entries.sort(key=lambda e: e['size'], reverse=True)
+    else:
+        entries.sort(key=lambda e: e['last_used'])
+
+    removed = 0
+    freed = 0
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if keep is not None and Path(entry['path']) == Path(keep):
+            continue
+        with _pins_lock:
+            if _key_of(entry['path']) in _pins:
+                continue
+            try:
+                entry['path'].unlink()
+            except OSError:
+                continue
+        total -= entry['size']
+        removed += 1
+        freed += entry['size']
+
+    return removed, freed
+
+
+def clear():
+    """Remove every stored stream. Returns (removed_count, freed_bytes)"""
+    return prune(max_bytes=0)
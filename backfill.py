@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+Backfill Queue
+Spreads a large transcription backfill over many hosts: a shared SQLite queue
+(e.g. on NFS) holds one job per video, workers lease jobs, keep their leases
+alive with heartbeats and record each job's transcript result, and jobs whose
+worker stalled or died are leased again once the lease expires
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import inference_config
+import transcript_cache
+
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+# A leased job is handed to another worker if not renewed within this many seconds
+DEFAULT_LEASE = 300
+DEFAULT_HEARTBEAT = 30
+
+# Attempts (including stalled leases) before a job is marked failed
+DEFAULT_MAX_ATTEMPTS = 3
+
+# A failed job waits this long before its next attempt, doubling per attempt
+# (capped), so a job that always fails is not retried back-to-back by every worker
+DEFAULT_RETRY_DELAY = 60
+MAX_RETRY_DELAY = 3600
+
+# Idle workers check for new or expired jobs this often (seconds)
+DEFAULT_POLL = 15
+
+# Throughput in `status` is measured over this window (seconds)
+DEFAULT_WINDOW = 3600
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        item TEXT NOT NULL UNIQUE,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        worker TEXT,
+        lease_token TEXT,
+        lease_until REAL,
+        retry_after REAL,
+        result TEXT,
+        error TEXT,
+        audio_seconds REAL,
+        processing_seconds REAL,
+        added REAL NOT NULL,
+        started REAL,
+        finished REAL
+    );
+    CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+    CREATE TABLE IF NOT EXISTS workers (
+        id TEXT PRIMARY KEY,
+        host TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        started REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        stopped REAL,
+        current_job INTEGER,
+        jobs_done INTEGER NOT NULL DEFAULT 0,
+        jobs_failed INTEGER NOT NULL DEFAULT 0,
+        audio_seconds REAL NOT NULL DEFAULT 0,
+        busy_seconds REAL NOT NULL DEFAULT 0
+    );
+"""
+
+
+def connect(path):
+    """Open the queue database, creating it if needed
+
+    Transactions are explicit (BEGIN IMMEDIATE) and short, and the rollback
+    journal is used instead of WAL, which does not work on network filesystems.
+    """
+    db = sqlite3.connect(str(path), timeout=60, isolation_level=None)
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    columns = {row['name'] for row in db.execute("PRAGMA table_info(jobs)")}
+    if 'retry_after' not in columns:
+        # Queues created before failed jobs were retried with a delay
+        db.execute("ALTER TABLE jobs ADD COLUMN retry_after REAL")
+    return db
+
+
+@contextmanager
+def transaction(db):
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on errors"""
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        yield db
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+    db.execute('COMMIT')
+
+
+# ---------------------------------------------------------------------------
+# Coordinator side
+# ---------------------------------------------------------------------------
+
+def add_items(db, items):
+    """Queue items (URLs or audio file paths); returns how many were new"""
+    now = time.time()
+    with transaction(db):
+        before = db.total_changes
+        db.executemany(
+            "INSERT OR IGNORE INTO jobs (item, status, added) VALUES (?, ?, ?)",
+            [(item, QUEUED, now) for item in items],
+        )
+        return db.total_changes - before
+
+
+def retry_failed(db):
+    """Queue failed jobs again with a fresh attempt count; returns how many"""
+    with transaction(db):
+        return db.execute(
+            "UPDATE jobs SET status = ?, attempts = 0, error = NULL, retry_after = NULL WHERE status = ?",
+            (QUEUED, FAILED)
+        ).rowcount
+
+
+def get_job(db, item):
+    """A job by ID or item (URL or audio path), with its result decoded; None if not queued"""
+    if str(item).isdigit():
+        row = db.execute("SELECT * FROM jobs WHERE id = ?", (int(item),)).fetchone()
+    else:
+        row = db.execute("SELECT * FROM jobs WHERE item = ?", (item,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+
+def queue_stats(db, window=DEFAULT_WINDOW, lease=DEFAULT_LEASE):
+    """Aggregated progress and throughput across all workers
+
+    Throughput counts jobs finished within the last window seconds; the ETA
+    assumes the remaining jobs go at that rate. Workers not seen within one
+    lease period are reported as stale.
+    """
+    now = time.time()
+    counts = dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+    waiting = db.execute(
+        "SELECT COUNT(*) FROM jobs WHERE status = ? AND retry_after > ?", (QUEUED, now)
+    ).fetchone()[0]
+    totals = db.execute(
+        "SELECT COALESCE(SUM(audio_seconds), 0), COALESCE(SUM(processing_seconds), 0) FROM jobs WHERE status = ?",
+        (DONE,),
+    ).fetchone()
+    recent = db.execute(
+        "SELECT COUNT(*), COALESCE(SUM(audio_seconds), 0), MIN(finished) FROM jobs "
+        "WHERE status = ? AND finished >= ?",
+        (DONE, now - window),
+    ).fetchone()
+
+    recent_jobs, recent_audio, first_finished = recent
+    # Before a full window has passed, measure from the first finish in it
+    elapsed = min(window, now - first_finished) if first_finished else window
+    jobs_per_hour = recent_jobs / elapsed * 3600 if recent_jobs and elapsed > 0 else 0.0
+    remaining = counts.get(QUEUED, 0) + counts.get(LEASED, 0)
+
+    workers = []
+    for row in db.execute("SELECT * FROM workers ORDER BY host, id"):
+        worker = dict(row)
+        worker['stale'] = not worker['stopped'] and now - worker['last_seen'] > lease
+        worker['speed'] = worker['audio_seconds'] / worker['busy_seconds'] if worker['busy_seconds'] else None
+        workers.append(worker)
+
+    return {
+        'counts': {status: counts.get(status, 0) for status in (QUEUED, LEASED, DONE, FAILED)},
+        'waiting_to_retry': waiting,
+        'audio_hours_done': totals[0] / 3600,
+        'processing_hours': totals[1] / 3600,
+        'window_seconds': window,
+        'jobs_per_hour': jobs_per_hour,
+        'audio_hours_per_hour': recent_audio / elapsed if recent_jobs and elapsed > 0 else 0.0,
+        'eta_hours': remaining / jobs_per_hour if jobs_per_hour else None,
+        'active_workers': sum(1 for worker in workers if not worker['stale'] and not worker['stopped']),
+        'workers': workers,
+    }
+
+
+def print_stats(stats):
+    counts = stats['counts']
+    total = sum(counts.values())
+    print(f"📊 Jobs: {total} total, {counts[DONE]} done, {counts[LEASED]} leased, "
+          f"{counts[QUEUED]} queued, {counts[FAILED]} failed")
+    if stats['waiting_to_retry']:
+        print(f"   {stats['waiting_to_retry']} queued jobs are waiting out a retry delay")
+    print(f"   Audio transcribed: {stats['audio_hours_done']:.1f} h "
+          f"in {stats['processing_hours']:.1f} h of worker time")
+    window = stats['window_seconds'] / 60
+    print(f"⚡ Last {window:.0f} min: {stats['jobs_per_hour']:.1f} jobs/h, "
+          f"{stats['audio_hours_per_hour']:.1f} h of audio per hour")
+    if stats['eta_hours'] is not None:
+        print(f"   ETA: {stats['eta_hours']:.1f} h at that rate")
+    print(f"🖥️  Workers: {stats['active_workers']} active")
+    for worker in stats['workers']:
+        if worker['stopped']:
+            state = 'stopped'
+        elif worker['stale']:
+            state = 'stale'
+        else:
+            state = f"job {worker['current_job']}" if worker['current_job'] else 'idle'
+        speed = f"{worker['speed']:.1f}x realtime" if worker['speed'] else '-'
+        print(f"   {worker['id']:32} {state:12} {worker['jobs_done']:6} done {worker['jobs_failed']:4} failed "
+              f"{worker['audio_seconds'] / 3600:7.1f} h audio  {speed}")
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def lease_next(db, worker_id, lease=DEFAULT_LEASE, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Lease the oldest queued job, or one whose lease expired
+
+    Jobs waiting out a retry delay after a failure are skipped until it passes.
+    Returns the job dict (with its lease_token) or None if nothing is
+    available. Expired jobs that used up max_attempts are marked failed.
+    """
+    now = time.time()
+    with transaction(db):
+        while True:
+            row = db.execute(
+                "SELECT * FROM jobs WHERE (status = ? AND (retry_after IS NULL OR retry_after <= ?)) "
+                "OR (status = ? AND lease_until < ?) ORDER BY id LIMIT 1",
+                (QUEUED, now, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            if row['status'] == LEASED and row['attempts'] >= max_attempts:
+                db.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?",
+                    (FAILED, f"lease expired on {row['worker']} after {row['attempts']} attempts", now, row['id']),
+                )
+                continue
+            if row['status'] == LEASED:
+                print(f"🔁 Re-leasing job {row['id']} (lease of {row['worker']} expired)")
+            token = uuid.uuid4().hex
+            db.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_token = ?, lease_until = ?, "
+                "attempts = attempts + 1, started = ? WHERE id = ?",
+                (LEASED, worker_id, token, now + lease, now, row['id']),
+            )
+            job = dict(row)
+            job['lease_token'] = token
+            job['attempts'] += 1
+            return job
+
+
+def renew_lease(db, job, lease=DEFAULT_LEASE):
+    """Extend a lease; False if the job was meanwhile leased to another worker"""
+    with transaction(db):
+        return db.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND lease_token = ?",
+            (time.time() + lease, job['id'], job['lease_token']),
+        ).rowcount == 1
+
+
+def complete_job(db, job, result, audio_seconds, processing_seconds):
+    """Record a finished job; False if the lease was lost (the result is dropped)"""
+    with transaction(db):
+        return db.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, audio_seconds = ?, processing_seconds = ?, "
+            "finished = ?, lease_token = NULL, lease_until = NULL WHERE id = ? AND lease_token = ?",
+            (DONE, json.dumps(result, default=transcript_cache.json_default), audio_seconds, processing_seconds,
+             time.time(),
+             job['id'], job['lease_token']),
+        ).rowcount == 1
+
+
+def retry_delay_for(attempts, retry_delay=DEFAULT_RETRY_DELAY):
+    """Seconds before the next attempt after attempts failed ones (exponential, capped)"""
+    return min(MAX_RETRY_DELAY, retry_delay * 2 ** max(0, attempts - 1))
+
+
+def fail_job(db, job, error, max_attempts=DEFAULT_MAX_ATTEMPTS, retry_delay=DEFAULT_RETRY_DELAY):
+    """Queue a job for another attempt after a backoff, or mark it failed once attempts run out
+
+    Returns the new status, or None if the lease was lost (nothing is changed).
+    """
+    now = time.time()
+    status = FAILED if job['attempts'] >= max_attempts else QUEUED
+    retry_after = now + retry_delay_for(job['attempts'], retry_delay) if status == QUEUED else None
+    with transaction(db):
+        updated = db.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished = ?, retry_after = ?, lease_token = NULL, "
+            "lease_until = NULL WHERE id = ? AND lease_token = ?",
+            (status, error, now, retry_after, job['id'], job['lease_token']),
+        ).rowcount
+    return status if updated else None
+
+
+def release_job(db, job):
+    """Give a leased job back untouched (worker shutting down)"""
+    with transaction(db):
+        db.execute(
+            "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_token = NULL, lease_until = NULL "
+            "WHERE id = ? AND lease_token = ?",
+            (QUEUED, job['id'], job['lease_token']),
+        )
+
+
+def has_pending(db):
+    """Whether any job is queued or still leased (and may come back)"""
+    return db.execute(
+        "SELECT 1 FROM jobs WHERE status IN (?, ?) LIMIT 1", (QUEUED, LEASED)
+    ).fetchone() is not None
+
+
+class Heartbeat(threading.Thread):
+    """Renews the current job's lease and the worker's last_seen in the background
+
+    Uses its own connection: sqlite3 connections are not shared across threads.
+    """
+
+    def __init__(self, queue_path, worker_id, interval, lease):
+        super().__init__(daemon=True)
+        self.queue_path = queue_path
+        self.worker_id = worker_id
+        self.interval = interval
+        self.lease = lease
+        self.job = None
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        db = connect(self.queue_path)
+        try:
+            while not self._stop_event.wait(self.interval):
+                try:
+                    job = self.job
+                    if job is not None and not renew_lease(db, job, self.lease):
+                        self.lost = True
+                        print(f"⚠️  Lost the lease on job {job['id']} (another worker took it over)")
+                    with transaction(db):
+                        db.execute("UPDATE workers SET last_seen = ? WHERE id = ?", (time.time(), self.worker_id))
+                except sqlite3.Error as e:
+                    print(f"⚠️  Heartbeat failed: {e}")
+        finally:
+            db.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def transcribe_item(item, output_dir, model_name, language, format_type, use_daemon, caption_policy):
+    """Transcribe one queue item with the same code paths as whisper_transcribe.py
+
+    Returns (job result, audio seconds). The transcript is saved in output_dir,
+    named after the video ID (or the audio file name), and the job result also
+    carries the full transcript result dict and its transcript cache key, so
+    hosts that do not share output_dir can still read it from the queue.
+    """
+    import metrics
+    import whisper_transcribe
+
+    metrics.start_run()
+    ext = whisper_transcribe.get_output_extension(format_type)
+    if os.path.isfile(item):
+        output_file = os.path.join(output_dir, f"{Path(item).stem}.{ext}")
+        cache_key = None
+        result = whisper_transcribe.make_transcriber(model_name, language, use_daemon)(item)
+        whisper_transcribe.save_transcript(result, output_file, format_type)
+    else:
+        url = whisper_transcribe.sanitize_url(item)
+        video_id = transcript_cache.extract_video_id(url)
+        if video_id is None:
+            raise ValueError(f"Not a YouTube video URL: {item}")
+        output_file = os.path.join(output_dir, f"{video_id}.{ext}")
+        cache_key, _ = whisper_transcribe.get_cache_key(video_id, model_name, language)
+        result = whisper_transcribe.transcribe_url(
+            url, model_name, language, output_file, format_type,
+            use_daemon=use_daemon, caption_policy=caption_policy,
+        )
+
+    report = metrics.report()
+    segments = result.get('segments', [])
+    audio_seconds = report['audio_duration'] or (segments[-1]['end'] if segments else 0.0)
+    summary = {
+        'output_file': output_file,
+        # Caption transcripts are not stored in the transcript cache
+        'cache_key': cache_key if 'source' not in result else None,
+        'language': result.get('language'),
+        'source': result.get('source', 'whisper'),
+        'segments': len(segments),
+        'words': len(result.get('text', '').split()),
+        'stages': report['stages'],
+        'realtime_factor': report['realtime_factor'],
+        'transcript': result,
+    }
+    return summary, audio_seconds
+
+
+def run_worker(queue_path, output_dir, model_name, language=None, format_type='timestamped',
+               use_daemon=True, caption_policy='manual', lease=DEFAULT_LEASE, heartbeat=DEFAULT_HEARTBEAT,
+               max_attempts=DEFAULT_MAX_ATTEMPTS, poll=DEFAULT_POLL, max_jobs=None, worker_id=None,
+               retry_delay=DEFAULT_RETRY_DELAY):
+    """Lease and transcribe jobs until the queue is drained (or max_jobs are done)
+
+    A worker only exits once no job is queued or leased anywhere, so it is still
+    around to pick up jobs whose workers stall. Returns (done, failed) counts.
+    """
+    if heartbeat * 2 > lease:
+        raise ValueError("the heartbeat interval must be at most half the lease time")
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    db = connect(queue_path)
+    now = time.time()
+    with transaction(db):
+        db.execute(
+            "INSERT INTO workers (id, host, pid, started, last_seen) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET pid = excluded.pid, last_seen = excluded.last_seen, stopped = NULL",
+            (worker_id, socket.gethostname(), os.getpid(), now, now),
+        )
+
+    beat = Heartbeat(queue_path, worker_id, heartbeat, lease)
+    beat.start()
+    done = failed = 0
+    print(f"🚀 Worker {worker_id} started (model {model_name}, queue {queue_path})")
+
+    job = None
+    try:
+        while max_jobs is None or done + failed < max_jobs:
+            job = lease_next(db, worker_id, lease, max_attempts)
+            if job is None:
+                if not has_pending(db):
+                    print("✅ Queue drained")
+                    break
+                time.sleep(poll)
+                continue
+
+            print(f"\n{'=' * 60}")
+            print(f"[job {job['id']}, attempt {job['attempts']}] {job['item']}")
+            print("=" * 60)
+            beat.job, beat.lost = job, False
+            with transaction(db):
+                db.execute("UPDATE workers SET current_job = ? WHERE id = ?", (job['id'], worker_id))
+
+            started = time.time()
+            try:
+                summary, audio_seconds = transcribe_item(
+                    job['item'], output_dir, model_name, language, format_type, use_daemon, caption_policy
+                )
+            except Exception as e:
+                busy = time.time() - started
+                status = fail_job(db, job, str(e), max_attempts, retry_delay)
+                failed += 1
+                if status == QUEUED:
+                    outcome = f"retry in {retry_delay_for(job['attempts'], retry_delay):.0f}s"
+                else:
+                    outcome = 'giving up' if status == FAILED else 'lease lost, not recorded'
+                print(f"❌ Failed ({outcome}): {e}")
+                with transaction(db):
+                    db.execute(
+                        "UPDATE workers SET jobs_failed = jobs_failed + 1, busy_seconds = busy_seconds + ?, "
+                        "current_job = NULL WHERE id = ?",
+                        (busy, worker_id),
+                    )
+            else:
+                busy = time.time() - started
+                recorded = complete_job(db, job, summary, audio_seconds, busy)
+                if recorded:
+                    done += 1
+                    print(f"✓ Job {job['id']} done ({audio_seconds / 60:.1f} min of audio in {busy:.0f}s)")
+                else:
+                    print(f"⚠️  Job {job['id']} was re-leased while running; result not recorded")
+                with transaction(db):
+                    db.execute(
+                        "UPDATE workers SET jobs_done = jobs_done + ?, audio_seconds = audio_seconds + ?, "
+                        "busy_seconds = busy_seconds + ?, current_job = NULL WHERE id = ?",
+                        (int(recorded), audio_seconds, busy, worker_id),
+                    )
+            finally:
+                beat.job = None
+            job = None
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+        if job is not None:
+            release_job(db, job)
+            print(f"↩️  Job {job['id']} returned to the queue")
+    finally:
+        beat.stop()
+        with transaction(db):
+            db.execute("UPDATE workers SET current_job = NULL, last_seen = ?, stopped = ? WHERE id = ?",
+                       (time.time(), time.time(), worker_id))
+        db.close()
+
+    print(f"🛑 Worker {worker_id} stopped: {done} done, {failed} failed")
+    return done, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Distribute a large transcription backfill over workers on many hosts",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s add /mnt/shared/backfill.db urls.txt          # Queue URLs (one per line)
+  %(prog)s worker /mnt/shared/backfill.db -o /mnt/shared/transcripts -m small
+  %(prog)s status /mnt/shared/backfill.db                # Progress, throughput, workers
+  %(prog)s status /mnt/shared/backfill.db --watch 60     # Refresh every minute
+  %(prog)s retry /mnt/shared/backfill.db                 # Queue failed jobs again
+  %(prog)s result /mnt/shared/backfill.db "VIDEO_URL" -f srt -o video.srt
+
+Start one worker per host (or one per core group, e.g. with taskset). The queue
+is a SQLite file every worker can reach, such as one on NFS.
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+
+    add_parser = subparsers.add_parser('add', help='Queue URLs or audio files')
+    add_parser.add_argument('queue', help='Queue database path')
+    add_parser.add_argument('batch_file', help="File with one URL or audio path per line ('-' for stdin)")
+
+    worker_parser = subparsers.add_parser('worker', help='Lease and transcribe jobs until the queue is drained')
+    worker_parser.add_argument('queue', help='Queue database path')
+    worker_parser.add_argument('-o', '--output-dir', required=True, help='Directory for transcripts (shared)')
+    worker_parser.add_argument('-m', '--model', choices=['tiny', 'base', 'small', 'medium', 'large'],
+                               help='Whisper model (default: installed default)')
+    worker_parser.add_argument('-l', '--language', help='Language code (default: auto-detect)')
+    worker_parser.add_argument('-f', '--format', choices=['text', 'timestamped', 'srt', 'json', 'jsonl'],
+                               default='timestamped', help='Output format (default: timestamped)')
+    worker_parser.add_argument('--captions', choices=['off', 'manual', 'any'], default='manual',
+                               help='Use existing captions instead of Whisper (default: manual)')
+    worker_parser.add_argument('--preset', choices=list(inference_config.PRESETS),
+                               help='Decoding preset (default: config file setting, else library defaults)')
+    worker_parser.add_argument('--no-daemon', action='store_true',
+                               help="Load the model in-process even if a whisper daemon is running")
+    worker_parser.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                               help=f'Seconds before a silent worker\'s job is re-leased (default: {DEFAULT_LEASE})')
+    worker_parser.add_argument('--heartbeat', type=float, default=DEFAULT_HEARTBEAT,
+                               help=f'Seconds between lease renewals (default: {DEFAULT_HEARTBEAT})')
+    worker_parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                               help=f'Attempts per job before it is marked failed (default: {DEFAULT_MAX_ATTEMPTS})')
+    worker_parser.add_argument('--retry-delay', type=float, default=DEFAULT_RETRY_DELAY,
+                               help=f'Seconds before a failed job is retried, doubling per attempt up to '
+                                    f'{MAX_RETRY_DELAY} (default: {DEFAULT_RETRY_DELAY})')
+    worker_parser.add_argument('--poll', type=float, default=DEFAULT_POLL,
+                               help=f'Seconds between checks while no job is available (default: {DEFAULT_POLL})')
+    worker_parser.add_argument('--max-jobs', type=int, help='Stop after this many jobs')
+    worker_parser.add_argument('--worker-id', help='Worker name (default: host:pid)')
+
+    status_parser = subparsers.add_parser('status', help='Show progress, throughput and workers')
+    status_parser.add_argument('queue', help='Queue database path')
+    status_parser.add_argument('--window', type=float, default=DEFAULT_WINDOW / 60,
+                               help=f'Throughput window in minutes (default: {DEFAULT_WINDOW // 60})')
+    status_parser.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                               help='Lease time the workers use, to spot stale workers')
+    status_parser.add_argument('--watch', type=float, metavar='SECONDS', help='Refresh periodically')
+    status_parser.add_argument('--json', action='store_true', help='Print machine-readable JSON')
+
+    retry_parser = subparsers.add_parser('retry', help='Queue failed jobs again')
+    retry_parser.add_argument('queue', help='Queue database path')
+
+    result_parser = subparsers.add_parser('result', help="Print or save a finished job's transcript")
+    result_parser.add_argument('queue', help='Queue database path')
+    result_parser.add_argument('job', help='Job ID or queued item (URL or audio path)')
+    result_parser.add_argument('-f', '--format', choices=['text', 'timestamped', 'srt', 'json', 'jsonl'],
+                               default='text', help='Transcript format (default: text)')
+    result_parser.add_argument('-o', '--output', help='Save to this file instead of printing')
+    result_parser.add_argument('--json', action='store_true', help="Print the job and its result as JSON")
+
+    args = parser.parse_args()
+
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.command != 'add' and not os.path.exists(args.queue):
+        print(f"❌ Error: Queue not found: {args.queue}")
+        sys.exit(1)
+
+    if args.command == 'add':
+        from whisper_transcribe import read_batch_inputs
+
+        try:
+            items = read_batch_inputs(args.batch_file)
+        except OSError as e:
+            print(f"❌ Error: Could not read batch file: {e}")
+            sys.exit(1)
+        db = connect(args.queue)
+        added = add_items(db, items)
+        print(f"📥 Queued {added} new jobs ({len(items) - added} already in the queue)")
+
+    elif args.command == 'worker':
+        import whisper_transcribe
+
+        whisper_transcribe.check_dependencies()
+        inference_config.configure(preset=args.preset)
+        model_name = args.model or whisper_transcribe.get_default_model()
+        try:
+            done, failed = run_worker(
+                args.queue, args.output_dir, model_name, args.language, args.format,
+                use_daemon=not args.no_daemon, caption_policy=args.captions, lease=args.lease,
+                heartbeat=args.heartbeat, max_attempts=args.max_attempts, poll=args.poll,
+                max_jobs=args.max_jobs, worker_id=args.worker_id, retry_delay=args.retry_delay,
+            )
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        if failed:
+            sys.exit(1)
+
+    elif args.command == 'status':
+        db = connect(args.queue)
+        while True:
+            stats = queue_stats(db, args.window * 60, args.lease)
+            if args.json:
+                print(json.dumps(stats, indent=2))
+            else:
+                print_stats(stats)
+            if not args.watch:
+                break
+            time.sleep(args.watch)
+            print()
+
+    elif args.command == 'retry':
+        db = connect(args.queue)
+        print(f"🔁 Queued {retry_failed(db)} failed jobs again")
+
+    elif args.command == 'result':
+        import tempfile
+
+        from whisper_transcribe import save_transcript
+
+        job = get_job(connect(args.queue), args.job)
+        if job is None:
+            print(f"❌ Error: No job for {args.job}")
+            sys.exit(1)
+        if args.json:
+            print(json.dumps(job, indent=2, ensure_ascii=False))
+            return
+        if job['status'] != DONE:
+            print(f"⏳ Job {job['id']} is {job['status']}" + (f": {job['error']}" if job['error'] else ""))
+            sys.exit(1)
+        transcript = job['result'].get('transcript')
+        if transcript is None:
+            # Recorded before results included the transcript
+            print(f"❌ Error: Job {job['id']} has no stored transcript; see {job['result'].get('output_file')}")
+            sys.exit(1)
+        if args.output:
+            save_transcript(transcript, args.output, args.format)
+            print(f"✓ Transcript saved to: {args.output}")
+        else:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                output_file = os.path.join(temp_dir, 'transcript')
+                save_transcript(transcript, output_file, args.format)
+                print(Path(output_file).read_text(encoding='utf-8'))
+
+
+if __name__ == "__main__":
+    main()
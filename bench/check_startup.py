@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Startup Time Check
+Runs the CLIs' light commands under `python -X importtime` and fails if their
+import time exceeds a budget or if a heavy module (torch, whisper, yt-dlp, ...)
+gets imported on a path that does not need it
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Commands that must start fast, as arguments after the interpreter
+COMMANDS = [
+    ['whisper_transcribe.py', '--help'],
+    ['whisper_transcribe.py'],  # argument error
+    ['yttool.py', '--help'],
+    ['whisper_manager.py', '--help'],
+    ['whisper_manager.py', 'list'],
+    ['whisper_manager.py', 'list-remote'],
+    ['whisper_manager.py', 'info'],
+]
+
+# Top-level packages none of these commands may import
+HEAVY_MODULES = ['torch', 'whisper', 'faster_whisper', 'ctranslate2', 'numpy', 'yt_dlp', 'psutil']
+
+DEFAULT_BUDGET_MS = 300
+
+
+def parse_importtime(stderr):
+    """(total import microseconds, set of imported top-level packages) from -X importtime output
+
+    Lines look like 'import time:   self [us] | cumulative | imported package';
+    nested imports are indented under the module that triggered them, so the
+    total is the sum of the unindented entries' cumulative times.
+    """
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2]
+        modules.add(name.strip().split('.')[0])
+        if not name.startswith('  ', 1):
+            total_us += int(parts[1])
+    return total_us, modules
+
+
+def check_command(args):
+    """Run one command; returns (import_ms, wall_ms, heavy modules imported)"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    cmd = [sys.executable, '-X', 'importtime'] + [str(REPO_DIR / args[0])] + args[1:]
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=REPO_DIR, env=env, capture_output=True, text=True,
+                          stdin=subprocess.DEVNULL, timeout=120)
+    wall_ms = (time.perf_counter() - started) * 1000
+    total_us, modules = parse_importtime(proc.stderr)
+    heavy = sorted(module for module in HEAVY_MODULES if module in modules)
+    return total_us / 1000, wall_ms, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that the CLIs' help and listing commands start without heavy imports",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s                     # Default budget
+  %(prog)s --budget-ms 150     # Stricter budget
+
+Exits non-zero if any command imports more than the budget (sum of top-level
+import times reported by -X importtime) or imports a heavy module.
+        """
+    )
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Import-time budget per command in ms (default: {DEFAULT_BUDGET_MS})")
+    args = parser.parse_args()
+
+    failures = 0
+    for command in COMMANDS:
+        label = ' '.join(command)
+        import_ms, wall_ms, heavy = check_command(command)
+        problems = []
+        if import_ms > args.budget_ms:
+            problems.append(f"imports took {import_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        if heavy:
+            problems.append(f"imported {', '.join(heavy)}")
+        if problems:
+            failures += 1
+            print(f"❌ {label}: {'; '.join(problems)}")
+        else:
+            print(f"✓ {label}: imports {import_ms:.0f} ms, wall {wall_ms:.0f} ms")
+
+    if failures:
+        print(f"\n❌ {failures}/{len(COMMANDS)} commands failed the startup check")
+        sys.exit(1)
+    print(f"\n✓ All {len(COMMANDS)} commands within {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
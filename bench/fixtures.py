@@ -0,0 +1,87 @@
+"""
+Benchmark Fixtures
+Deterministic synthetic audio for benchmarking, generated on first use into
+bench/fixtures/ so no binary files need to be committed
+"""
+
+import math
+import random
+import struct
+import wave
+from pathlib import Path
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+SAMPLE_RATE = 16000
+
+# name -> (generator, seconds)
+FIXTURES = {
+    'tone-30s': ('tone', 30),
+    'speechlike-60s': ('speechlike', 60),
+    'speechlike-300s': ('speechlike', 300),
+    'speechlike-1800s': ('speechlike', 1800),
+}
+
+DEFAULT_FIXTURES = ['speechlike-60s']
+
+
+def _tone(seconds, rng):
+    """Steady 220 Hz tone with a quiet noise floor"""
+    for n in range(int(seconds * SAMPLE_RATE)):
+        t = n / SAMPLE_RATE
+        yield 0.3 * math.sin(2 * math.pi * 220 * t) + 0.01 * (rng.random() - 0.5)
+
+
+def _speechlike(seconds, rng):
+    """Voiced harmonics with syllable-rate amplitude modulation, drifting pitch
+    and pauses between 'phrases', so level-based VAD and chunking see realistic
+    speech/silence structure
+    """
+    total = int(seconds * SAMPLE_RATE)
+    n = 0
+    while n < total:
+        phrase = int(rng.uniform(1.5, 6.0) * SAMPLE_RATE)
+        pause = int(rng.uniform(0.2, 1.2) * SAMPLE_RATE)
+        pitch = rng.uniform(100, 220)
+        syllable_rate = rng.uniform(3.0, 6.0)
+        phase = 0.0
+        for i in range(min(phrase, total - n)):
+            t = i / SAMPLE_RATE
+            f0 = pitch * (1 + 0.05 * math.sin(2 * math.pi * 0.7 * t))
+            phase += 2 * math.pi * f0 / SAMPLE_RATE
+            envelope = max(0.0, math.sin(math.pi * syllable_rate * t)) ** 2
+            voiced = sum(math.sin(k * phase) / k for k in (1, 2, 3, 4, 5))
+            yield 0.25 * envelope * voiced + 0.005 * (rng.random() - 0.5)
+        n += phrase
+        for _ in range(min(pause, max(0, total - n))):
+            yield 0.005 * (rng.random() - 0.5)
+        n += pause
+
+
+def ensure_fixture(name):
+    """Return the path of a fixture WAV, generating it if missing"""
+    if name not in FIXTURES:
+        raise ValueError(f"Unknown fixture '{name}' (available: {', '.join(FIXTURES)})")
+
+    path = FIXTURE_DIR / f"{name}.wav"
+    if path.exists():
+        return path
+
+    kind, seconds = FIXTURES[name]
+    generator = _tone if kind == 'tone' else _speechlike
+    rng = random.Random(name)  # Same samples on every machine
+
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    with wave.open(str(temp_path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        frames = bytearray()
+        for sample in generator(seconds, rng):
+            frames += struct.pack('<h', int(max(-1.0, min(1.0, sample)) * 32767))
+            if len(frames) >= 1 << 20:
+                f.writeframes(bytes(frames))
+                frames.clear()
+        f.writeframes(bytes(frames))
+    temp_path.replace(path)
+    return path
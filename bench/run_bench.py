@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Transcription Benchmark
+Runs transcribe_audio()'s building blocks across models, backends, compute types,
+thread counts and decoding presets on reproducible fixtures and reports timings
+(and word error rates, for audio with a reference transcript) as JSON
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fixtures  # noqa: E402
+import inference_config  # noqa: E402
+import wer  # noqa: E402
+
+# Metrics compared by --compare (lower is better for all of them)
+COMPARED_METRICS = ['rtf', 'wer', 'load_time', 'first_segment_time', 'peak_rss_mb']
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_single(config):
+    """Benchmark one configuration in the current process (called in a fresh subprocess)"""
+    os.environ['WHISPER_BACKEND'] = config['backend']
+    import whisper_transcribe
+
+    inference_config.configure(preset=config.get('preset'))
+
+    if whisper_transcribe.WHISPER_TYPE != config['backend']:
+        raise RuntimeError(f"{config['backend']}-whisper is not installed")
+
+    started = time.perf_counter()
+    model = whisper_transcribe.load_model(
+        config['model'],
+        cpu_threads=config['threads'],
+        compute_type=config['compute_type'],
+    )
+    load_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    audio = whisper_transcribe.decode_audio(config['audio'])
+    decode_time = time.perf_counter() - started
+    duration = len(audio) / whisper_transcribe.SAMPLE_RATE
+
+    started = time.perf_counter()
+    first_segment_time = None
+    segments = 0
+    texts = []
+    _, segment_iter = whisper_transcribe.transcribe_segments(model, audio, config.get('language'))
+    for segment in segment_iter:
+        if first_segment_time is None:
+            first_segment_time = time.perf_counter() - started
+        segments += 1
+        texts.append(segment['text'])
+    transcribe_time = time.perf_counter() - started
+    text = ' '.join(texts)
+
+    reference = wer.find_reference(config['audio'])
+    error_rate = wer.wer(reference.read_text(encoding='utf-8'), text) if reference else None
+
+    return {
+        'audio_duration': round(duration, 3),
+        'load_time': round(load_time, 3),
+        'decode_time': round(decode_time, 3),
+        'first_segment_time': round(first_segment_time if first_segment_time is not None else transcribe_time, 3),
+        'transcribe_time': round(transcribe_time, 3),
+        'rtf': round(transcribe_time / duration, 4) if duration else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'segments': segments,
+        'words': len(text.split()),
+        'wer': round(error_rate, 4) if error_rate is not None else None,
+    }
+
+
+def run_in_subprocess(config, timeout):
+    """Run one configuration in a fresh interpreter so load time and peak RSS are not shared"""
+    cmd = [sys.executable, str(Path(__file__).resolve()), '_worker', json.dumps(config)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {timeout}s"}
+
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith('{'):
+            return json.loads(line)
+    error = (proc.stderr.strip().splitlines() or [f"exit code {proc.returncode}"])[-1]
+    return {'error': error}
+
+
+def build_matrix(args):
+    """All benchmark configurations; compute types only vary for faster-whisper
+
+    A preset of None leaves decoding at the library defaults.
+    """
+    audio_files = [(name, str(fixtures.ensure_fixture(name))) for name in args.fixtures]
+    audio_files += [(Path(path).name, str(Path(path).resolve())) for path in args.audio]
+
+    configs = []
+    for (fixture, audio), model, backend, threads, preset in itertools.product(
+            audio_files, args.models, args.backends, args.threads, args.presets):
+        compute_types = args.compute_types if backend == 'faster' else ['default']
+        for compute_type in compute_types:
+            configs.append({
+                'fixture': fixture,
+                'audio': audio,
+                'model': model,
+                'backend': backend,
+                'compute_type': compute_type,
+                'threads': threads,
+                'preset': preset,
+                'language': args.language,
+            })
+    return configs
+
+
+def config_key(entry):
+    return (entry['fixture'], entry['model'], entry['backend'], entry['compute_type'], entry['threads'],
+            entry.get('preset') or 'default')
+
+
+def get_metadata():
+    """Commit and host details, so reports from different runs can be matched up"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+
+def compare_reports(base, current):
+    """Print per-configuration metric changes between two reports (to stderr)"""
+    base_results = {config_key(r): r for r in base['results'] if not r.get('error')}
+    print(f"Comparing {base['meta'].get('commit')} -> {current['meta'].get('commit')}", file=sys.stderr)
+    print(file=sys.stderr)
+    for result in current['results']:
+        if result.get('error'):
+            continue
+        previous = base_results.get(config_key(result))
+        if not previous:
+            continue
+        label = '/'.join(str(part) for part in config_key(result))
+        changes = []
+        for metric in COMPARED_METRICS:
+            old, new = previous.get(metric), result.get(metric)
+            if old and new is not None:
+                changes.append(f"{metric} {old:g} -> {new:g} ({(new - old) / old * 100:+.1f}%)")
+        print(f"📊 {label}", file=sys.stderr)
+        for change in changes:
+            print(f"   {change}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark Whisper transcription across models, backends, compute types and threads",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s                                        # base model, installed backend, default fixture
+  %(prog)s --models tiny base small --threads 1 4 8 -o bench.json
+  %(prog)s --backends faster --compute-types int8 float32
+  %(prog)s --audio lecture.m4a --fixtures         # Only a local recording
+  %(prog)s --audio lecture.m4a --presets fast balanced accurate   # Speed vs. WER per preset
+  %(prog)s -o new.json --compare old.json         # Compare with an earlier commit
+
+Each configuration runs in a fresh Python process, so model load time and
+peak RSS are measured from a cold start. Word error rate is reported for --audio
+files with a reference transcript next to them (lecture.m4a -> lecture.txt).
+        """
+    )
+    parser.add_argument('--models', nargs='+', default=['base'],
+                        choices=['tiny', 'base', 'small', 'medium', 'large'])
+    parser.add_argument('--backends', nargs='+', choices=['openai', 'faster'],
+                        help='Backends to benchmark (default: the installed one)')
+    parser.add_argument('--compute-types', nargs='+', default=['int8'],
+                        help='faster-whisper compute types (default: int8)')
+    parser.add_argument('--threads', nargs='+', type=int, default=[0],
+                        help='CPU thread counts (0 = library default)')
+    parser.add_argument('--presets', nargs='+', default=[None], choices=list(inference_config.PRESETS),
+                        help='Decoding presets (default: library defaults)')
+    parser.add_argument('--fixtures', nargs='*', default=fixtures.DEFAULT_FIXTURES,
+                        choices=list(fixtures.FIXTURES),
+                        help=f"Synthetic fixtures (default: {' '.join(fixtures.DEFAULT_FIXTURES)})")
+    parser.add_argument('--audio', nargs='+', default=[], metavar='FILE',
+                        help='Local audio files to benchmark as well')
+    parser.add_argument('-l', '--language', default='en',
+                        help='Language passed to the model (default: en, skips detection)')
+    parser.add_argument('--timeout', type=int, default=3600,
+                        help='Per-configuration timeout in seconds (default: 3600)')
+    parser.add_argument('-o', '--output', help='Write the JSON report to this file')
+    parser.add_argument('--compare', metavar='REPORT', help='Compare against an earlier JSON report')
+
+    if len(sys.argv) == 3 and sys.argv[1] == '_worker':
+        print(json.dumps(run_single(json.loads(sys.argv[2]))))
+        return
+
+    args = parser.parse_args()
+    if not args.backends:
+        import importlib.util
+        args.backends = [name for name, module in (('openai', 'whisper'), ('faster', 'faster_whisper'))
+                         if importlib.util.find_spec(module)][:1] or ['openai']
+
+    configs = build_matrix(args)
+    if not configs:
+        print("❌ Nothing to benchmark (no fixtures or audio files selected)")
+        sys.exit(1)
+
+    report = {'meta': get_metadata(), 'results': []}
+    for index, config in enumerate(configs, 1):
+        label = (f"{config['fixture']} {config['model']} {config['backend']} {config['compute_type']} "
+                 f"threads={config['threads']} preset={config['preset'] or 'default'}")
+        print(f"[{index}/{len(configs)}] {label}", file=sys.stderr)
+        result = run_in_subprocess(config, args.timeout)
+        if result.get('error'):
+            print(f"   ❌ {result['error']}", file=sys.stderr)
+        else:
+            accuracy = f"  WER {result['wer']:.1%}" if result.get('wer') is not None else ''
+            print(f"   ✓ RTF {result['rtf']}{accuracy}  load {result['load_time']}s  "
+                  f"first segment {result['first_segment_time']}s  peak RSS {result['peak_rss_mb']} MB",
+                  file=sys.stderr)
+        entry = {key: value for key, value in config.items() if key != 'audio'}
+        entry.update(result)
+        report['results'].append(entry)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+        print(f"\n✓ Report saved to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        print(file=sys.stderr)
+        base = json.loads(Path(args.compare).read_text())
+        compare_reports(base, report)
+
+
+if __name__ == "__main__":
+    main()
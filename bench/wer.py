@@ -0,0 +1,44 @@
+"""
+Word Error Rate
+Scores a transcript against a reference transcript: (substitutions + deletions
++ insertions) / reference words, after normalising case and punctuation
+"""
+
+import re
+from pathlib import Path
+
+WORD = re.compile(r"[\w']+")
+
+
+def normalize(text):
+    """Lowercased words without punctuation ("Hello, world!" -> ['hello', 'world'])"""
+    return [word.strip("'") for word in WORD.findall(text.lower()) if word.strip("'")]
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance between two word lists"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,                            # deletion
+                current[j - 1] + 1,                         # insertion
+                previous[j - 1] + (ref_word != hyp_word),   # substitution / match
+            ))
+        previous = current
+    return previous[-1]
+
+
+def wer(reference, hypothesis):
+    """Word error rate of hypothesis text against reference text (None for an empty reference)"""
+    reference = normalize(reference)
+    if not reference:
+        return None
+    return word_errors(reference, normalize(hypothesis)) / len(reference)
+
+
+def find_reference(audio):
+    """Reference transcript next to an audio file (lecture.m4a -> lecture.txt), or None"""
+    path = Path(audio).with_suffix('.txt')
+    return path if path.exists() else None
@@ -0,0 +1,176 @@
+"""
+YouTube Captions
+Picks an existing caption track from a yt-dlp info dict and parses it into the
+transcript result structure save_transcript() uses, so videos that already have
+acceptable captions skip audio download and Whisper inference
+"""
+
+import html
+import json
+import re
+
+# Caption policies: which tracks are acceptable instead of running Whisper
+POLICIES = ('off', 'manual', 'any')
+DEFAULT_POLICY = 'manual'
+
+# Track formats we can parse, most precise first
+PREFERRED_FORMATS = ('json3', 'vtt')
+
+VTT_TIMING = re.compile(r'(\d+:)?(\d{2}):(\d{2})[.,](\d{3})\s+-->\s+(\d+:)?(\d{2}):(\d{2})[.,](\d{3})')
+TAG = re.compile(r'<[^>]+>')
+
+
+def _matches(track_language, wanted):
+    """'en' accepts 'en', 'en-US', 'en-GB'; 'en-US' only accepts itself"""
+    track_language = track_language.lower()
+    wanted = wanted.lower()
+    return track_language == wanted or track_language.startswith(wanted + '-')
+
+
+def _pick_language(tracks, languages):
+    """First track language matching the preference order (None if none match)"""
+    for wanted in languages:
+        for track_language in tracks:
+            if _matches(track_language, wanted):
+                return track_language
+    return None
+
+
+def _parseable(formats):
+    for ext in PREFERRED_FORMATS:
+        for track_format in formats or ():
+            if track_format.get('ext') == ext and track_format.get('url'):
+                return track_format
+    return None
+
+
+def select_track(info, policy=DEFAULT_POLICY, languages=None):
+    """Choose a caption track allowed by the policy
+
+    languages is a preference list of language codes, defaulting to the video's
+    own language (a track in another language is usually a translation). If
+    that is unknown too, any manual track is accepted.
+    Automatic captions are only accepted in the video's spoken language (or an
+    explicitly requested one): YouTube also offers machine translations of them
+    into every language, which are not transcripts.
+    Returns (language, kind, format dict) with kind 'manual' or 'auto', or None.
+    """
+    if policy == 'off' or not info:
+        return None
+
+    original = info.get('language')
+    candidates = [('manual', info.get('subtitles') or {})]
+    if policy == 'any':
+        candidates.append(('auto', info.get('automatic_captions') or {}))
+
+    for kind, tracks in candidates:
+        tracks = {lang: formats for lang, formats in tracks.items()
+                  if lang != 'live_chat' and _parseable(formats)}
+        if not tracks:
+            continue
+        preferred = list(languages or ()) or ([original] if original else [])
+        language = _pick_language(tracks, preferred)
+        if language is None and kind == 'manual' and not preferred:
+            # Unknown spoken language: any uploaded track is the best guess
+            language = next(iter(tracks))
+        if language is not None:
+            return language, kind, _parseable(tracks[language])
+    return None
+
+
+def parse_json3(data):
+    """Segments from YouTube's json3 caption format"""
+    segments = []
+    for event in json.loads(data).get('events', []):
+        if 'segs' not in event or event.get('aAppend'):
+            continue
+        text = ''.join(seg.get('utf8', '') for seg in event['segs']).replace('\n', ' ').strip()
+        if not text:
+            continue
+        start = event.get('tStartMs', 0) / 1000
+        segments.append({
+            'start': start,
+            'end': start + event.get('dDurationMs', 0) / 1000,
+            'text': text,
+        })
+    return segments
+
+
+def _vtt_seconds(hours, minutes, seconds, millis):
+    return int((hours or '0:')[:-1]) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def parse_vtt(data, rolling=False):
+    """Segments from WebVTT
+
+    YouTube's automatic captions roll: each cue repeats the previous cue's line
+    before adding a new one. With rolling=True, lines already shown in the
+    previous cue are dropped. Manual tracks keep every line, since a repeated
+    line there is really said again.
+    """
+    segments = []
+    previous_lines = []
+    for block in re.split(r'\n\s*\n', data.replace('\r\n', '\n')):
+        lines = block.strip().split('\n')
+        for index, line in enumerate(lines):
+            timing = VTT_TIMING.search(line)
+            if timing:
+                break
+        else:
+            continue
+        groups = timing.groups()
+        text_lines = [html.unescape(TAG.sub('', line)).strip() for line in lines[index + 1:]]
+        text_lines = [line for line in text_lines if line]
+        new_lines = [line for line in text_lines if line not in previous_lines] if rolling else text_lines
+        previous_lines = text_lines
+        text = ' '.join(new_lines)
+        if not text:
+            continue
+        segments.append({
+            'start': _vtt_seconds(*groups[:4]),
+            'end': _vtt_seconds(*groups[4:]),
+            'text': text,
+        })
+    return segments
+
+
+def to_result(segments, language, kind):
+    """Build a transcript result (same shape as Whisper's) from caption segments"""
+    segments = [
+        {'id': index, 'start': segment['start'], 'end': segment['end'], 'text': ' ' + segment['text']}
+        for index, segment in enumerate(segments)
+    ]
+    return {
+        'text': ''.join(segment['text'] for segment in segments),
+        'segments': segments,
+        'language': language.split('-')[0],
+        'source': f"captions ({kind}, {language})",
+    }
+
+
+def get_transcript(info, policy=DEFAULT_POLICY, languages=None):
+    """Transcript result from the best acceptable caption track, or None
+
+    None means Whisper is needed: no acceptable track, or it could not be
+    fetched or parsed.
+    """
+    track = select_track(info, policy, languages)
+    if track is None:
+        return None
+    language, kind, track_format = track
+
+    import yt_dlp
+
+    try:
+        with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
+            data = ydl.urlopen(track_format['url']).read().decode('utf-8')
+        if track_format['ext'] == 'json3':
+            segments = parse_json3(data)
+        else:
+            segments = parse_vtt(data, rolling=kind == 'auto')
+    except Exception as e:
+        print(f"⚠️  Could not fetch {kind} captions ({language}): {e}")
+        return None
+    if not segments:
+        return None
+    return to_result(segments, language, kind)
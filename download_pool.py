@@ -0,0 +1,113 @@
+"""
+Download Pool
+Runs playlist downloads concurrently with per-host limits and retry with backoff,
+handing each finished download to a separate pool of encode slots so ffmpeg keeps
+idle cores busy while the next videos are still downloading
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+class HostLimiter:
+    """Caps the number of concurrent requests to each host"""
+
+    def __init__(self, per_host=2):
+        if per_host < 1:
+            raise ValueError("per_host must be at least 1")
+        self.per_host = per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def limit(self, url):
+        semaphore = self._semaphore(urlparse(url).hostname or '')
+        with semaphore:
+            yield
+
+
+def retry(fn, attempts=3, base_delay=2.0, max_delay=60.0, label=None):
+    """Call fn(), retrying failures with exponential backoff and jitter
+
+    The exception from the last attempt is raised.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= attempts:
+                raise
+            # Jitter keeps workers that failed together from retrying in lockstep
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+            print(f"⚠️  {label or 'Request'} failed ({e}); retry {attempt}/{attempts - 1} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def run_jobs(items, download_fn, encode_fn, url_fn, jobs=4, encode_workers=None,
+             per_host=2, attempts=3, base_delay=2.0, on_complete=None):
+    """Download and encode items concurrently
+
+    download_fn(item) fetches an item (network I/O) and is retried with backoff;
+    at most jobs downloads run at once, and at most per_host of them against the
+    host of url_fn(item). Its return value is passed to encode_fn(item, downloaded),
+    which runs on one of encode_workers slots (default: one per CPU core). Encoders
+    shell out to ffmpeg, so each slot is a separate process doing the CPU work.
+
+    on_complete(item, error), if given, is called as each item finishes.
+
+    Returns a list of (item, result, error) in input order; one failing item
+    never stops the others.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+
+    items = list(items)
+    outcomes = [None] * len(items)
+    limiter = HostLimiter(per_host)
+    encode_workers = encode_workers or os.cpu_count() or 1
+
+    def finish(index, item, result, error):
+        outcomes[index] = (item, result, error)
+        if on_complete:
+            on_complete(item, error)
+
+    def encode(index, item, downloaded):
+        try:
+            result = encode_fn(item, downloaded)
+        except Exception as e:
+            finish(index, item, None, f"encode failed: {e}")
+        else:
+            finish(index, item, result, None)
+
+    with ThreadPoolExecutor(max_workers=encode_workers) as encoders:
+        def download(index, item):
+            label = (item.get('title') or item.get('id')) if isinstance(item, dict) else str(item)
+
+            def fetch():
+                # The host slot is held per attempt, not across backoff sleeps
+                with limiter.limit(url_fn(item)):
+                    return download_fn(item)
+
+            try:
+                downloaded = retry(fetch, attempts, base_delay, label=label)
+            except Exception as e:
+                finish(index, item, None, f"download failed: {e}")
+                return
+            encoders.submit(encode, index, item, downloaded)
+
+        with ThreadPoolExecutor(max_workers=jobs) as downloaders:
+            for index, item in enumerate(items):
+                downloaders.submit(download, index, item)
+
+    return outcomes
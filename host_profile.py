@@ -0,0 +1,209 @@
+"""
+Host Profile
+Measured model performance on this machine (real-time factor, load time), kept
+in a machine-readable profile, and latency-budgeted model selection built on it
+"""
+
+import json
+import os
+import platform
+import re
+import tempfile
+import time
+from pathlib import Path
+
+# Profile location (override with YTTOOL_HOST_PROFILE)
+DEFAULT_PROFILE_PATH = Path.home() / ".cache" / "yttool" / "host_profile.json"
+
+PROFILE_VERSION = 1
+
+# Models from least to most accurate
+MODEL_ORDER = ['tiny', 'base', 'small', 'medium', 'large']
+
+# Conservative CPU guesses used until a model has been measured on this host
+DEFAULT_RTF = {'tiny': 0.1, 'base': 0.2, 'small': 0.6, 'medium': 1.5, 'large': 3.0}
+DEFAULT_LOAD_TIME = {'tiny': 2.0, 'base': 3.0, 'small': 8.0, 'medium': 20.0, 'large': 40.0}
+
+# Weight of each new observation in the running real-time factor
+OBSERVATION_WEIGHT = 0.3
+
+# Settings a calibration measures. num_workers only matters for concurrent
+# transcriptions, which the benchmark does not run, so it is not one of them
+CALIBRATED_SETTINGS = ('cpu_threads', 'compute_type')
+
+
+def get_profile_path():
+    """Get the host profile path"""
+    return Path(os.environ.get('YTTOOL_HOST_PROFILE', DEFAULT_PROFILE_PATH))
+
+
+def load():
+    """Load the host profile (an empty profile if there is none yet)"""
+    try:
+        with open(get_profile_path(), encoding='utf-8') as f:
+            profile = json.load(f)
+        if profile.get('version') == PROFILE_VERSION:
+            return profile
+    except (OSError, ValueError):
+        pass
+    return {'version': PROFILE_VERSION, 'host': platform.node(), 'cpu_count': os.cpu_count(), 'models': {}}
+
+
+def save(profile):
+    """Write the host profile atomically"""
+    path = get_profile_path()
+    profile['updated'] = time.time()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+
+def model_key(model_name, backend):
+    return f"{backend}/{model_name}"
+
+
+def get_model(profile, model_name, backend):
+    """Profile entry for a model (empty dict if it was never measured)"""
+    return profile.get('models', {}).get(model_key(model_name, backend), {})
+
+
+def get_rtf(profile, model_name, backend):
+    """(real-time factor, measured?) for a model on this host"""
+    rtf = get_model(profile, model_name, backend).get('rtf')
+    if rtf:
+        return rtf, True
+    return DEFAULT_RTF.get(model_name, DEFAULT_RTF['large']), False
+
+
+def get_load_time(profile, model_name, backend):
+    load_time = get_model(profile, model_name, backend).get('load_time')
+    return load_time if load_time is not None else DEFAULT_LOAD_TIME.get(model_name, DEFAULT_LOAD_TIME['large'])
+
+
+def record_observation(model_name, backend, rtf, load_time=None):
+    """Fold the real-time factor (and load time) of a real run into the profile
+
+    Observations are blended into a running average, so the profile follows
+    the host's actual performance without one noisy run dominating.
+    """
+    if not rtf or rtf <= 0:
+        return
+    try:
+        profile = load()
+        entry = profile.setdefault('models', {}).setdefault(model_key(model_name, backend), {})
+        previous = entry.get('rtf')
+        entry['rtf'] = rtf if previous is None else previous + OBSERVATION_WEIGHT * (rtf - previous)
+        entry.setdefault('source', 'observed')
+        entry['observations'] = entry.get('observations', 0) + 1
+        if load_time is not None:
+            previous = entry.get('load_time')
+            entry['load_time'] = load_time if previous is None else previous + OBSERVATION_WEIGHT * (load_time - previous)
+        save(profile)
+    except OSError as e:
+        print(f"⚠️  Could not update host profile: {e}")
+
+
+def record_calibration(profile, model_name, backend, results):
+    """Store benchmark results for one model (bench/run_bench.py result dicts)
+
+    The fastest configuration becomes the model's defaults (CALIBRATED_SETTINGS).
+    """
+    results = [r for r in results if not r.get('error') and r.get('rtf')]
+    if not results:
+        return None
+    best = min(results, key=lambda r: r['rtf'])
+    entry = {
+        'rtf': best['rtf'],
+        'load_time': best['load_time'],
+        'peak_rss_mb': max(r['peak_rss_mb'] for r in results),
+        'source': 'calibrated',
+        'calibrated_at': time.time(),
+        'observations': 0,
+        'best': {
+            'cpu_threads': best['threads'],
+            'compute_type': best['compute_type'],
+        },
+        'runs': [{
+            'threads': r['threads'],
+            'compute_type': r['compute_type'],
+            'rtf': r['rtf'],
+            'load_time': r['load_time'],
+            'peak_rss_mb': r['peak_rss_mb'],
+        } for r in results],
+    }
+    profile.setdefault('models', {})[model_key(model_name, backend)] = entry
+    return entry
+
+
+def get_defaults(model_name, backend, profile=None):
+    """Calibrated cpu_threads/compute_type for a model ({} if not calibrated)
+
+    Profiles written by older versions also hold a derived num_workers; it is
+    ignored, as it was never measured.
+    """
+    profile = load() if profile is None else profile
+    best = get_model(profile, model_name, backend).get('best', {})
+    return {name: best[name] for name in CALIBRATED_SETTINGS if name in best}
+
+
+def current_load_factor():
+    """Expected slowdown from other work on the host (1.0 when idle)
+
+    A transcription that would use every core only gets about
+    cpus / (cpus + load) of them while load other tasks are runnable.
+    """
+    try:
+        load1 = os.getloadavg()[0]
+    except (OSError, AttributeError):
+        return 1.0
+    return 1.0 + load1 / (os.cpu_count() or 1)
+
+
+def parse_budget(value):
+    """Parse a latency budget: seconds ('300', '90s', '5m', '1h') or a multiple
+    of the audio duration ('0.5x', 'rtf=0.5'). Returns (kind, number) with kind
+    'seconds' or 'rtf'.
+    """
+    text = str(value).strip().lower()
+    match = re.fullmatch(r'(?:rtf\s*=\s*([\d.]+)|([\d.]+)\s*x)', text)
+    if match:
+        return 'rtf', float(match.group(1) or match.group(2))
+    match = re.fullmatch(r'([\d.]+)\s*([smh]?)', text)
+    if match:
+        scale = {'': 1, 's': 1, 'm': 60, 'h': 3600}[match.group(2)]
+        return 'seconds', float(match.group(1)) * scale
+    raise ValueError(f"Invalid budget '{value}' (use seconds like 300, 5m, or a multiple like 0.5x)")
+
+
+def select_model(duration, budget, backend, candidates=None, profile=None, resident=()):
+    """Pick the most accurate model expected to finish within the budget
+
+    duration is the audio length in seconds; budget is a (kind, number) pair
+    from parse_budget(). Expected time = load time (skipped for models in
+    resident) + duration x real-time factor x current load factor. Returns
+    (model_name, expected_seconds, deadline_seconds, fits); when nothing fits,
+    the fastest candidate is returned with fits=False.
+    """
+    profile = load() if profile is None else profile
+    candidates = [name for name in MODEL_ORDER if name in (candidates or MODEL_ORDER)]
+    kind, number = budget
+    deadline = number * duration if kind == 'rtf' else number
+    load_factor = current_load_factor()
+
+    estimates = []
+    for name in candidates:
+        rtf, _ = get_rtf(profile, name, backend)
+        load_time = 0.0 if name in resident else get_load_time(profile, name, backend)
+        estimates.append((name, load_time + duration * rtf * load_factor))
+
+    for name, expected in reversed(estimates):
+        if expected <= deadline:
+            return name, expected, deadline, True
+    name, expected = min(estimates, key=lambda item: item[1])
+    return name, expected, deadline, False
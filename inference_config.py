@@ -0,0 +1,223 @@
+"""
+Inference Settings
+CPU threads, worker count, compute type, decoding preset, beam size and batch
+size for loading and running Whisper models. Each setting comes from the first
+source that sets it: command-line overrides, the .whisper-config.json file kept
+next to .whisper-version, `whisper_manager.py calibrate` results for this host,
+or automatic defaults derived from the CPUs this process may actually use
+"""
+
+import json
+import os
+from pathlib import Path
+
+# Config file, next to whisper_manager.py's .whisper-version (project first, then global)
+CONFIG_NAME = ".whisper-config.json"
+CONFIG_FILE = Path.home() / CONFIG_NAME
+PROJECT_CONFIG_FILE = Path.cwd() / CONFIG_NAME
+
+# Setting name -> type
+SETTINGS = {
+    'cpu_threads': int,
+    'num_workers': int,
+    'compute_type': str,
+    'preset': str,
+    'beam_size': int,
+    'batch_size': int,
+}
+
+# faster-whisper (CTranslate2) compute types
+COMPUTE_TYPES = ['int8', 'int8_float32', 'int8_float16', 'int8_bfloat16', 'int16',
+                 'float16', 'bfloat16', 'float32', 'default', 'auto']
+
+# Whisper's temperature fallback: a window is decoded again at the next
+# temperature when its output looks like a failure (repetitive or low confidence)
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+# Decoding presets -> transcribe() keyword arguments per backend. Timestamps are
+# always kept (without_timestamps=False) because the output formats use them.
+# openai-whisper decodes greedily when beam_size is None (beam_size=1 would run
+# the slower beam search decoder with a single beam).
+PRESETS = {
+    # Greedy, one pass per window, no fallback and no previous-text prompt
+    'fast': {
+        'openai': {'beam_size': None, 'best_of': None, 'temperature': 0.0,
+                   'condition_on_previous_text': False},
+        'faster': {'beam_size': 1, 'best_of': 1, 'temperature': 0.0,
+                   'condition_on_previous_text': False},
+    },
+    # Greedy with Whisper's temperature fallback for windows that fail
+    'balanced': {
+        'openai': {'beam_size': None, 'best_of': 5, 'temperature': FALLBACK_TEMPERATURES,
+                   'condition_on_previous_text': True},
+        'faster': {'beam_size': 1, 'best_of': 5, 'temperature': FALLBACK_TEMPERATURES,
+                   'condition_on_previous_text': True},
+    },
+    # Beam search (5 beams) with the fallback
+    'accurate': {
+        'openai': {'beam_size': 5, 'best_of': 5, 'temperature': FALLBACK_TEMPERATURES,
+                   'condition_on_previous_text': True},
+        'faster': {'beam_size': 5, 'best_of': 5, 'temperature': FALLBACK_TEMPERATURES,
+                   'condition_on_previous_text': True},
+    },
+}
+
+# Overrides from the command line (see configure())
+_overrides = {}
+
+
+def cgroup_cpu_limit():
+    """CPUs granted by the cgroup CPU quota (e.g. 2.5), or None if unlimited/unknown
+
+    Containers often see every host core in os.cpu_count() but are throttled to
+    their quota; running more threads than the quota only adds contention.
+    """
+    try:
+        # cgroup v2: "max 100000" or "<quota> <period>"
+        quota, period = Path('/sys/fs/cgroup/cpu.max').read_text().split()[:2]
+        if quota != 'max':
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    for directory in ('/sys/fs/cgroup/cpu', '/sys/fs/cgroup/cpu,cpuacct'):
+        try:
+            # cgroup v1: quota is -1 when unlimited
+            quota = int(Path(directory, 'cpu.cfs_quota_us').read_text())
+            period = int(Path(directory, 'cpu.cfs_period_us').read_text())
+            if quota > 0 and period > 0:
+                return quota / period
+            return None
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def available_cpus():
+    """CPUs this process can use: its CPU affinity, capped by the cgroup quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS, Windows
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, int(limit)))
+    return cpus
+
+
+def auto_settings():
+    """Defaults when nothing else sets a value
+
+    One transcription uses every available CPU. Decoding is left to the
+    library (no preset, beam size None), and batching is off (0) because batched
+    inference changes how audio is chunked.
+    """
+    return {
+        'cpu_threads': available_cpus(),
+        'num_workers': 1,
+        'compute_type': 'int8',
+        'preset': None,
+        'beam_size': None,
+        'batch_size': 0,
+    }
+
+
+def get_config_path():
+    """The config file in use: the project's if present, else the global one"""
+    return PROJECT_CONFIG_FILE if PROJECT_CONFIG_FILE.exists() else CONFIG_FILE
+
+
+def parse_value(name, value):
+    """Convert a setting from text (e.g. a CLI 'key=value'); raises ValueError"""
+    if name not in SETTINGS:
+        raise ValueError(f"Unknown setting '{name}' (choose from: {', '.join(SETTINGS)})")
+    if SETTINGS[name] is int:
+        value = int(value)
+        if value < 0:
+            raise ValueError(f"{name} must not be negative")
+        return value
+    if name == 'compute_type' and value not in COMPUTE_TYPES:
+        raise ValueError(f"Unknown compute type '{value}' (choose from: {', '.join(COMPUTE_TYPES)})")
+    if name == 'preset' and value not in PRESETS:
+        raise ValueError(f"Unknown preset '{value}' (choose from: {', '.join(PRESETS)})")
+    return value
+
+
+def load_config():
+    """Settings from the config file ({} if there is none or it is invalid)"""
+    path = get_config_path()
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        return {name: parse_value(name, value) for name, value in data.items() if value is not None}
+    except (OSError, ValueError, TypeError) as e:
+        print(f"⚠️  Ignoring invalid config {path}: {e}")
+        return {}
+
+
+def save_config(settings):
+    """Write settings to the config file (project-level inside a project directory,
+    like whisper_manager.py use); returns the path
+    """
+    path = PROJECT_CONFIG_FILE if Path.cwd().name != Path.home().name else CONFIG_FILE
+    if not settings:
+        if path.exists():
+            path.unlink()
+        return path
+    path.write_text(json.dumps(settings, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    return path
+
+
+def configure(**overrides):
+    """Set command-line overrides for this process (None values are ignored)"""
+    global _overrides
+    _overrides = {name: parse_value(name, value) for name, value in overrides.items() if value is not None}
+
+
+def get_overrides():
+    return dict(_overrides)
+
+
+def _layers(model_name, backend):
+    """(source, settings) pairs, highest precedence first"""
+    import host_profile
+
+    calibrated = host_profile.get_defaults(model_name, backend) if model_name and backend else {}
+    return [
+        ('command line', _overrides),
+        ('config file', load_config()),
+        ('calibration', {name: value for name, value in calibrated.items() if value is not None}),
+        ('automatic', auto_settings()),
+    ]
+
+
+def resolve(model_name=None, backend=None):
+    """Effective settings for a model on a backend"""
+    return {name: value for name, (value, _) in explain(model_name, backend).items()}
+
+
+def explain(model_name=None, backend=None):
+    """Effective settings with their sources: {name: (value, source)}"""
+    layers = _layers(model_name, backend)
+    settings = {}
+    for name in SETTINGS:
+        for source, values in layers:
+            if name in values:
+                settings[name] = (values[name], source)
+                break
+    return settings
+
+
+def decoding_options(backend, settings=None):
+    """transcribe() keyword arguments from the preset and beam_size settings
+
+    An explicit beam_size overrides the preset's. Returns {} when neither is
+    set, leaving every decoding parameter at the library default.
+    """
+    if settings is None:
+        settings = resolve(backend=backend)
+    options = dict(PRESETS[settings['preset']][backend]) if settings.get('preset') else {}
+    if settings.get('beam_size'):
+        options['beam_size'] = settings['beam_size']
+    return options
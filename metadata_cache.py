@@ -0,0 +1,160 @@
+"""
+Metadata Cache
+On-disk cache of yt-dlp info dicts with a time-to-live, so repeated jobs on the
+same videos and playlists skip the metadata extraction round-trip
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Cache location (override with YTTOOL_METADATA_CACHE)
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "yttool" / "metadata"
+
+# Time-to-live in seconds (override with YTTOOL_METADATA_TTL; 0 disables the cache).
+# Kept well under the ~6 hour lifetime of YouTube stream URLs in the info dict.
+DEFAULT_TTL = 3600
+
+# Set on info dicts served from the cache, so callers can refresh stale stream URLs
+CACHED_AT_KEY = '_yttool_metadata_cached_at'
+
+
+def get_cache_dir():
+    """Get the metadata cache directory"""
+    return Path(os.environ.get('YTTOOL_METADATA_CACHE', DEFAULT_CACHE_DIR))
+
+
+def get_ttl():
+    """Get the time-to-live in seconds"""
+    try:
+        return max(0.0, float(os.environ.get('YTTOOL_METADATA_TTL', DEFAULT_TTL)))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def _entry_path(url, variant):
+    digest = hashlib.sha256(f"{variant}\n{url}".encode('utf-8')).hexdigest()[:32]
+    return get_cache_dir() / f"{digest}.json"
+
+
+def get(url, variant='default', ttl=None):
+    """Cached info dict for a URL, or None if missing or older than ttl seconds"""
+    ttl = get_ttl() if ttl is None else ttl
+    if not ttl:
+        return None
+    path = _entry_path(url, variant)
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - entry.get('fetched', 0) > ttl:
+        invalidate(url, variant)
+        return None
+    info = entry['info']
+    info[CACHED_AT_KEY] = entry['fetched']
+    return info
+
+
+def put(url, variant, info):
+    """Store an info dict (already passed through YoutubeDL.sanitize_info)"""
+    if not get_ttl():
+        return False
+    cache_dir = get_cache_dir()
+    entry = {'url': url, 'variant': variant, 'fetched': time.time(), 'info': info}
+
+    temp_path = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, _entry_path(url, variant))
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️  Could not write metadata cache: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
+        return False
+    return True
+
+
+def invalidate(url, variant='default'):
+    """Drop a cached entry; returns True if there was one"""
+    try:
+        _entry_path(url, variant).unlink()
+        return True
+    except OSError:
+        return False
+
+
+def extract_info(url, params=None, variant='default', refresh=False):
+    """Extract info for a URL once, serving it from the cache while it is fresh
+
+    params are the YoutubeDL options used for extraction; variant must name
+    anything in them that changes the result (e.g. the format selector), since it
+    is part of the cache key. The returned dict is JSON-safe and can be handed
+    back to YoutubeDL.process_ie_result() to download without extracting again.
+    """
+    import yt_dlp
+
+    if not refresh:
+        info = get(url, variant)
+        if info is not None:
+            return info
+
+    with yt_dlp.YoutubeDL(params or {}) as ydl:
+        info = ydl.sanitize_info(ydl.extract_info(url, download=False))
+    put(url, variant, info)
+    return info
+
+
+def list_entries():
+    """List cache entries, newest first"""
+    cache_dir = get_cache_dir()
+    if not cache_dir.exists():
+        return []
+
+    entries = []
+    for path in cache_dir.glob('*.json'):
+        try:
+            stat = path.stat()
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            continue
+        info = entry.get('info') or {}
+        entries.append({
+            'path': path,
+            'url': entry.get('url', '?'),
+            'variant': entry.get('variant', '?'),
+            'title': info.get('title', '?'),
+            'fetched': entry.get('fetched', stat.st_mtime),
+            'size': stat.st_size,
+        })
+    entries.sort(key=lambda e: e['fetched'], reverse=True)
+    return entries
+
+
+def prune(ttl=None):
+    """Remove entries older than ttl seconds (default: the configured TTL)
+
+    Returns (removed_count, freed_bytes).
+    """
+    ttl = get_ttl() if ttl is None else ttl
+    cutoff = time.time() - ttl
+    removed = 0
+    freed = 0
+    for entry in list_entries():
+        if entry['fetched'] > cutoff:
+            continue
+        try:
+            entry['path'].unlink()
+        except OSError:
+            continue
+        removed += 1
+        freed += entry['size']
+    return removed, freed
@@ -0,0 +1,181 @@
+"""
+Run Metrics
+Per-stage timing and resource counters for a transcription run, written as a
+JSON report and/or a Prometheus textfile (for node_exporter's textfile collector)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Stages in pipeline order (used to order reports)
+STAGES = ['sanitize_url', 'metadata', 'download', 'decode', 'model_load', 'inference', 'save']
+
+PROMETHEUS_PREFIX = 'yttool_transcribe'
+
+# Collector for the current run; None means metrics are disabled (all calls are no-ops)
+_current = None
+
+
+class RunMetrics:
+    """Accumulates stage durations and counters; safe to use from worker threads"""
+
+    def __init__(self, labels=None):
+        self.labels = dict(labels or {})
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._stages[name] = self._stages.get(name, 0.0) + elapsed
+
+    def add(self, name, value):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set(self, name, value):
+        with self._lock:
+            self._counters[name] = value
+
+    def report(self):
+        """Machine-readable summary of the run"""
+        with self._lock:
+            stages = dict(self._stages)
+            counters = dict(self._counters)
+
+        ordered = {name: round(stages[name], 3) for name in STAGES if name in stages}
+        ordered.update({name: round(value, 3) for name, value in stages.items() if name not in ordered})
+
+        audio_duration = counters.get('audio_duration', 0)
+        inference = stages.get('inference', 0.0)
+        report = {
+            'labels': self.labels,
+            'started_at': self.started_at,
+            'total_seconds': round(time.perf_counter() - self._started, 3),
+            'stages': ordered,
+            'bytes_downloaded': counters.pop('bytes_downloaded', 0),
+            'audio_duration': round(audio_duration, 3),
+            'realtime_factor': round(inference / audio_duration, 4) if audio_duration else None,
+            'peak_rss_bytes': peak_rss_bytes(),
+        }
+        counters.pop('audio_duration', None)
+        report.update(counters)
+        return report
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def start_run(labels=None):
+    """Enable metrics collection for this process and return the collector"""
+    global _current
+    _current = RunMetrics(labels)
+    return _current
+
+
+def stage(name):
+    """Context manager timing a pipeline stage (no-op when metrics are disabled)"""
+    return _current.stage(name) if _current else nullcontext()
+
+
+def add(name, value):
+    """Add to a counter (no-op when metrics are disabled)"""
+    if _current:
+        _current.add(name, value)
+
+
+def set_value(name, value):
+    """Set a value in the report (no-op when metrics are disabled)"""
+    if _current:
+        _current.set(name, value)
+
+
+def report():
+    """Report for the current run (None when metrics are disabled)"""
+    return _current.report() if _current else None
+
+
+def _atomic_write(path, text):
+    """Write via rename so readers (e.g. node_exporter) never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, path)
+
+
+def write_json(report, path):
+    """Write a report as a JSON sidecar file"""
+    _atomic_write(path, json.dumps(report, indent=2) + '\n')
+
+
+def _label_string(labels):
+    if not labels:
+        return ''
+    parts = []
+    for key, value in sorted(labels.items()):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{escaped}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def format_prometheus(report):
+    """Render a report in the Prometheus text exposition format"""
+    labels = report.get('labels', {})
+    lines = []
+
+    def metric(name, help_text, value, extra_labels=None, kind='gauge'):
+        if value is None:
+            return
+        full_name = f"{PROMETHEUS_PREFIX}_{name}"
+        if not any(line.startswith(f"# HELP {full_name} ") for line in lines):
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+        lines.append(f"{full_name}{_label_string(dict(labels, **(extra_labels or {})))} {value}")
+
+    for stage_name, seconds in report['stages'].items():
+        metric('stage_seconds', 'Wall-clock seconds spent in each pipeline stage.',
+               seconds, {'stage': stage_name})
+    metric('duration_seconds', 'Total wall-clock seconds of the last run.', report['total_seconds'])
+    metric('downloaded_bytes', 'Bytes downloaded by the last run.', report['bytes_downloaded'])
+    metric('audio_seconds', 'Seconds of audio transcribed by the last run.', report['audio_duration'])
+    metric('realtime_factor', 'Inference seconds per second of audio in the last run.',
+           report['realtime_factor'])
+    metric('speech_seconds', 'Seconds of audio the VAD pass kept as speech in the last run.',
+           report.get('speech_duration'))
+    metric('peak_rss_bytes', 'Peak resident memory of the last run.', report['peak_rss_bytes'])
+    for name in ('items', 'failures', 'cache_hits', 'caption_hits'):
+        if name in report:
+            metric(name, f"Number of {name} in the last run.", report[name])
+    metric('last_run_timestamp_seconds', 'Unix time the last run started.', round(report['started_at'], 3))
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(report, path):
+    """Write a report as a node_exporter textfile (*.prom)"""
+    _atomic_write(path, format_prometheus(report))
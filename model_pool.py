@@ -0,0 +1,220 @@
+"""
+Model Pool
+Keeps loaded Whisper models resident within a RAM budget, keyed by (model name,
+backend, device, compute type), evicting the least recently used idle model when
+a new one does not fit. Used by batch runs and by long-running services
+"""
+
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# RAM budget in MB (override with YTTOOL_MODEL_POOL_MB; default: half of physical RAM)
+FALLBACK_BUDGET_MB = 8192
+
+# A measured RSS increase below this fraction of the estimate is not trusted:
+# memory-mapped weights are only counted once their pages are touched
+MIN_MEASURED_FRACTION = 0.25
+
+
+def total_ram_mb():
+    """Physical RAM in MB (None if unknown)"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def get_budget_mb():
+    """Get the pool's RAM budget in MB"""
+    try:
+        return float(os.environ['YTTOOL_MODEL_POOL_MB'])
+    except (KeyError, ValueError):
+        total = total_ram_mb()
+        return total / 2 if total else FALLBACK_BUDGET_MB
+
+
+def current_rss_mb():
+    """Current resident set size of this process in MB (None where unsupported)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def estimate_mb(model_name):
+    """RAM estimate for a model from whisper_manager.MODEL_INFO (e.g. '~5GB' -> 5120)"""
+    from whisper_manager import MODEL_INFO
+
+    ram = MODEL_INFO.get(model_name, {}).get('ram', '')
+    digits = ''.join(c for c in ram if c.isdigit() or c == '.')
+    if not digits:
+        return 1024.0
+    value = float(digits)
+    return value * 1024 if 'GB' in ram.upper() else value
+
+
+def default_loader(model_name, device, compute_type):
+    """Load a model through whisper_transcribe.load_model()"""
+    import whisper_transcribe
+
+    return whisper_transcribe.load_model(model_name, compute_type=compute_type)
+
+
+class _Entry:
+    def __init__(self, key):
+        self.key = key
+        self.model = None
+        self.size_mb = 0.0
+        self.measured = False
+        self.last_used = 0.0
+        self.uses = 0
+        self.in_use = 0
+        self.lock = threading.Lock()
+
+
+class ModelPool:
+    """LRU pool of loaded models bounded by a RAM budget; thread-safe
+
+    Each model instance is used by one caller at a time (openai-whisper installs
+    per-call hooks on the model). Callers that want to run the same model in
+    parallel ask for separate replicas.
+    """
+
+    def __init__(self, budget_mb=None, loader=None):
+        self.budget_mb = get_budget_mb() if budget_mb is None else budget_mb
+        self.loader = loader or default_loader
+        self._entries = {}
+        self._measured_mb = {}
+        self._lock = threading.Lock()
+
+    def _resident_mb(self):
+        return sum(entry.size_mb for entry in self._entries.values() if entry.model is not None)
+
+    def _expected_mb(self, model_name):
+        return self._measured_mb.get(model_name) or estimate_mb(model_name)
+
+    def _evict_for(self, needed_mb):
+        """Evict idle models, least recently used first, until needed_mb fits (caller holds _lock)"""
+        idle = sorted(
+            (entry for entry in self._entries.values() if entry.model is not None and not entry.in_use),
+            key=lambda entry: entry.last_used,
+        )
+        evicted = []
+        for entry in idle:
+            if self._resident_mb() + needed_mb <= self.budget_mb:
+                break
+            entry.model = None
+            del self._entries[entry.key]
+            evicted.append(entry.key)
+        if evicted:
+            gc.collect()
+        return evicted
+
+    def _load(self, entry, model_name, device, compute_type):
+        """Load the model for an entry (caller holds the entry's lock)"""
+        with self._lock:
+            needed = self._expected_mb(model_name)
+            for key in self._evict_for(needed):
+                print(f"♻️  Evicted model {key[0]} ({key[1]}, {key[3]}) to stay within "
+                      f"{self.budget_mb:.0f} MB")
+            if self._resident_mb() + needed > self.budget_mb:
+                print(f"⚠️  Loading {model_name} exceeds the model pool budget "
+                      f"({self._resident_mb() + needed:.0f} of {self.budget_mb:.0f} MB); "
+                      f"no idle model left to evict")
+
+        rss_before = current_rss_mb()
+        started = time.time()
+        model = self.loader(model_name, device, compute_type)
+        rss_after = current_rss_mb()
+
+        estimate = estimate_mb(model_name)
+        measured = rss_after - rss_before if rss_before is not None and rss_after is not None else 0
+        with self._lock:
+            entry.model = model
+            if measured >= estimate * MIN_MEASURED_FRACTION:
+                entry.size_mb = measured
+                entry.measured = True
+                self._measured_mb[model_name] = measured
+            else:
+                entry.size_mb = self._expected_mb(model_name)
+        print(f"✓ Model {model_name} loaded in {time.time() - started:.1f}s "
+              f"(~{entry.size_mb:.0f} MB, pool {self._resident_mb():.0f}/{self.budget_mb:.0f} MB)")
+
+    @contextmanager
+    def use(self, model_name, backend, device='cpu', compute_type='default', replica=0):
+        """Borrow a loaded model, loading it (and evicting others) if needed
+
+        The model cannot be evicted while borrowed.
+        """
+        key = (model_name, backend, device, compute_type, replica)
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry(key))
+            entry.in_use += 1
+        try:
+            with entry.lock:
+                if entry.model is None:
+                    self._load(entry, model_name, device, compute_type)
+                entry.uses += 1
+                entry.last_used = time.time()
+                yield entry.model
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                if entry.model is None and not entry.in_use and self._entries.get(key) is entry:
+                    del self._entries[key]
+
+    def evict(self, model_name=None):
+        """Drop idle models (all, or every copy of model_name); returns how many"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if not entry.in_use and (model_name is None or key[0] == model_name)]
+            for key in keys:
+                self._entries.pop(key).model = None
+        if keys:
+            gc.collect()
+        return len(keys)
+
+    def stats(self):
+        """Resident models, most recently used first"""
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if entry.model is not None]
+            models = [{
+                'model': entry.key[0],
+                'backend': entry.key[1],
+                'device': entry.key[2],
+                'compute_type': entry.key[3],
+                'replica': entry.key[4],
+                'size_mb': round(entry.size_mb, 1),
+                'measured': entry.measured,
+                'uses': entry.uses,
+                'in_use': bool(entry.in_use),
+                'last_used': entry.last_used,
+            } for entry in sorted(entries, key=lambda e: e.last_used, reverse=True)]
+            return {
+                'budget_mb': round(self.budget_mb, 1),
+                'resident_mb': round(self._resident_mb(), 1),
+                'models': models,
+            }
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The process-wide model pool"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ModelPool()
+        return _default_pool
@@ -0,0 +1,173 @@
+"""
+Prepared Model Store
+Whisper weights converted once into a form the transcriber can load without
+copying: openai-whisper checkpoints are re-saved per compute type so they can be
+memory-mapped (workers on one host then share pages through the page cache), and
+faster-whisper models are kept as local snapshots so loading needs no hub lookup
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Store location (override with YTTOOL_MODEL_DIR)
+DEFAULT_STORE_DIR = Path.home() / ".cache" / "yttool" / "models"
+
+# openai-whisper compute types a checkpoint can be prepared in
+OPENAI_COMPUTE_TYPES = ('float32', 'float16')
+
+
+def get_store_dir():
+    """Get the prepared model directory"""
+    return Path(os.environ.get('YTTOOL_MODEL_DIR', DEFAULT_STORE_DIR))
+
+
+def prepared_path(model_name, backend, compute_type='float32'):
+    """Where the prepared copy of a model lives (whether or not it exists yet)
+
+    faster-whisper quantizes to its compute type at load time, so one snapshot
+    serves every compute type.
+    """
+    if backend == 'openai':
+        return get_store_dir() / 'openai' / f"{model_name}-{compute_type}.pt"
+    return get_store_dir() / 'faster' / model_name
+
+
+def prepare_openai(model_name, compute_type='float32'):
+    """Re-save an openai-whisper checkpoint in the given dtype for mmap loading
+
+    The original checkpoint stores float16 weights that are copied into float32
+    parameters on every load; the prepared file already holds the final dtype,
+    so load_openai() can assign the mapped tensors directly. Buffers that are not
+    part of the state dict (attention mask, alignment heads) are saved as well.
+    """
+    import torch
+    import whisper
+
+    if compute_type not in OPENAI_COMPUTE_TYPES:
+        raise ValueError(f"compute type must be one of: {', '.join(OPENAI_COMPUTE_TYPES)}")
+
+    model = whisper.load_model(model_name, device='cpu')
+    dtype = torch.float16 if compute_type == 'float16' else torch.float32
+    state_dict = {
+        name: tensor.to(dtype) if tensor.is_floating_point() else tensor
+        for name, tensor in model.state_dict().items()
+    }
+    buffers = {
+        name: (buffer.to_dense() if buffer.is_sparse else buffer, buffer.is_sparse)
+        for name, buffer in model.named_buffers()
+        if name not in state_dict
+    }
+    checkpoint = {
+        'dims': dict(vars(model.dims)),
+        'model_state_dict': state_dict,
+        'buffers': buffers,
+    }
+
+    path = prepared_path(model_name, 'openai', compute_type)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        torch.save(checkpoint, temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+    return path
+
+
+def prepare_faster(model_name):
+    """Snapshot a faster-whisper (CTranslate2) model into the store
+
+    CTranslate2 reads model.bin into its own memory, so its weights cannot be
+    memory-mapped; the local snapshot only removes the per-load hub lookup.
+    """
+    from faster_whisper.utils import download_model
+
+    path = prepared_path(model_name, 'faster')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    download_model(model_name, output_dir=str(path))
+    return path
+
+
+def load_openai(model_name, compute_type='float32', device='cpu'):
+    """Load a prepared openai-whisper model with memory-mapped weights
+
+    Returns None if the model has not been prepared, or if the installed torch
+    cannot memory-map checkpoints (torch < 2.1); callers then load normally.
+    """
+    path = prepared_path(model_name, 'openai', compute_type)
+    if not path.exists():
+        return None
+
+    import torch
+    from whisper.model import ModelDimensions, Whisper
+
+    try:
+        checkpoint = torch.load(path, map_location='cpu', mmap=True, weights_only=True)
+    except TypeError:
+        print("⚠️  This torch version cannot memory-map checkpoints (needs torch >= 2.1)")
+        return None
+
+    dims = ModelDimensions(**checkpoint['dims'])
+    # Build the module without allocating weights, then point it at the mapped tensors
+    with torch.device('meta'):
+        model = Whisper(dims)
+    model.load_state_dict(checkpoint['model_state_dict'], assign=True)
+    for name, (buffer, sparse) in checkpoint['buffers'].items():
+        module_name, _, attr = name.rpartition('.')
+        module = model.get_submodule(module_name)
+        module.register_buffer(attr, buffer.to_sparse() if sparse else buffer, persistent=False)
+    return model.to(device).eval()
+
+
+def faster_model_path(model_name):
+    """Local snapshot directory for a faster-whisper model, or None if not prepared"""
+    path = prepared_path(model_name, 'faster')
+    return str(path) if (path / 'model.bin').exists() else None
+
+
+def list_prepared():
+    """List prepared models as dicts (name, backend, compute_type, path, size_mb)"""
+    store_dir = get_store_dir()
+    prepared = []
+    openai_dir = store_dir / 'openai'
+    if openai_dir.exists():
+        for path in sorted(openai_dir.glob('*.pt')):
+            name, _, compute_type = path.stem.rpartition('-')
+            prepared.append({
+                'name': name,
+                'backend': 'openai',
+                'compute_type': compute_type,
+                'path': path,
+                'size_mb': path.stat().st_size / (1024 * 1024),
+            })
+    faster_dir = store_dir / 'faster'
+    if faster_dir.exists():
+        for path in sorted(faster_dir.iterdir()):
+            if (path / 'model.bin').exists():
+                size = sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+                prepared.append({
+                    'name': path.name,
+                    'backend': 'faster',
+                    'compute_type': 'any',
+                    'path': path,
+                    'size_mb': size / (1024 * 1024),
+                })
+    return prepared
+
+
+def remove(model_name):
+    """Delete every prepared copy of a model; returns the MB freed"""
+    freed = 0.0
+    for entry in list_prepared():
+        if entry['name'] != model_name:
+            continue
+        freed += entry['size_mb']
+        if entry['path'].is_dir():
+            shutil.rmtree(entry['path'])
+        else:
+            entry['path'].unlink()
+    return freed
@@ -0,0 +1,157 @@
+"""
+Parallel Long-Audio Transcription
+Splits decoded audio at silence boundaries and transcribes the chunks across a
+process pool (one model per worker), then stitches the segments back together
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+import vad
+
+# Model loaded once per worker process by _init_worker()
+_worker_model = None
+
+
+def _init_worker(model_name, cpu_threads, overrides=None):
+    """Load the model once in each worker process
+
+    overrides are the parent's command-line inference settings (preset, beam
+    size, ...), which spawned processes do not inherit.
+    """
+    global _worker_model
+    # Keep each worker's math libraries from oversubscribing the cores
+    os.environ['OMP_NUM_THREADS'] = str(cpu_threads)
+    import inference_config
+    import whisper_transcribe
+
+    inference_config.configure(**(overrides or {}))
+
+    _worker_model = whisper_transcribe.load_model(model_name, cpu_threads=cpu_threads)
+
+
+def _transcribe_chunk(chunk_audio, offset, language, vad_filter=False):
+    """Transcribe one chunk in a worker and shift its timestamps to the full timeline"""
+    import whisper_transcribe
+
+    result = whisper_transcribe.run_transcription(_worker_model, chunk_audio, language, vad_filter)
+    segments = []
+    for segment in result['segments']:
+        segment = dict(segment, start=segment['start'] + offset, end=segment['end'] + offset)
+        if segment.get('words'):
+            segment['words'] = [
+                dict(word, start=word['start'] + offset, end=word['end'] + offset)
+                for word in segment['words']
+            ]
+        segments.append(segment)
+    return segments, result.get('language'), result.get('vad')
+
+
+def plan_chunks(audio, sample_rate=16000, chunk_length=60.0, overlap=1.0):
+    """Split points -> list of (start, cut, end) in seconds
+
+    Each chunk owns [start, cut); it is decoded up to end = cut + overlap so
+    words straddling the cut are heard in full by at least one chunk.
+    """
+    total = len(audio) / sample_rate
+    cuts = vad.find_split_points(audio, sample_rate, chunk_length)
+    bounds = [0.0] + cuts + [total]
+    chunks = []
+    for start, cut in zip(bounds, bounds[1:]):
+        chunks.append((start, cut, min(total, cut + overlap)))
+    return chunks
+
+
+def stitch_segments(chunk_segments, chunks):
+    """Merge per-chunk segments, dropping duplicates from the overlap regions
+
+    A chunk's segments starting at or after its cut are left to the next chunk.
+    A segment that lies entirely inside time already covered by the previous
+    kept segment, or repeats its text while overlapping it, is dropped.
+    """
+    stitched = []
+    last_index = len(chunks) - 1
+    for index, ((_, cut, _), segments) in enumerate(zip(chunks, chunk_segments)):
+        for segment in segments:
+            if index < last_index and segment['start'] >= cut:
+                continue
+            if stitched:
+                previous = stitched[-1]
+                if segment['end'] <= previous['end']:
+                    continue
+                if (segment['text'].strip() == previous['text'].strip()
+                        and segment['start'] < previous['end']):
+                    continue
+            stitched.append(segment)
+
+    for index, segment in enumerate(stitched):
+        segment['id'] = index
+    return stitched
+
+
+def transcribe_parallel(audio_file, model_name="base", language=None, workers=None,
+                        chunk_length=60.0, overlap=1.0, vad_filter=False):
+    """Transcribe long audio in silence-aligned chunks across a process pool
+
+    Returns the same result dict as whisper_transcribe.run_transcription().
+    If no language is given it is detected on the first chunk and then used for
+    all the others, so every chunk is decoded in the same language. With
+    vad_filter each chunk transcribes only its speech.
+    """
+    import inference_config
+    import whisper_transcribe
+
+    audio = whisper_transcribe.decode_audio(audio_file)
+    sample_rate = whisper_transcribe.SAMPLE_RATE
+    chunks = plan_chunks(audio, sample_rate, chunk_length, overlap)
+
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"🧩 Split {len(audio) / sample_rate / 60:.1f} min of audio into {len(chunks)} chunks "
+          f"({workers} workers x {cpu_threads} threads)")
+
+    def chunk_audio(chunk):
+        start, _, end = chunk
+        return audio[int(start * sample_rate):int(end * sample_rate)]
+
+    # spawn: torch/ctranslate2 thread pools do not survive fork()
+    context = multiprocessing.get_context('spawn')
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=_init_worker,
+                               initargs=(model_name, cpu_threads, inference_config.get_overrides()))
+    with metrics.stage('inference'), pool:
+        results = [None] * len(chunks)
+        pending = range(len(chunks))
+
+        if language is None:
+            results[0] = pool.submit(_transcribe_chunk, chunk_audio(chunks[0]), chunks[0][0], None,
+                                     vad_filter).result()
+            language = results[0][1]
+            print(f"🌐 Detected language: {language}")
+            pending = range(1, len(chunks))
+
+        futures = {
+            index: pool.submit(_transcribe_chunk, chunk_audio(chunks[index]), chunks[index][0], language,
+                               vad_filter)
+            for index in pending
+        }
+        for index, future in futures.items():
+            results[index] = future.result()
+            print(f"   ✓ Chunk {index + 1}/{len(chunks)} done")
+
+    segments = stitch_segments([segments for segments, _, _ in results], chunks)
+    result = {
+        'text': ''.join(segment['text'] for segment in segments),
+        'segments': segments,
+        'language': language,
+    }
+    # Worker metrics stay in the workers, so count the VAD pass here
+    vad_entries = [entry for _, _, entry in results if entry]
+    if vad_entries:
+        result['vad'] = whisper_transcribe.record_vad(
+            sum(entry['duration'] for entry in vad_entries),
+            sum(entry['speech'] for entry in vad_entries),
+        )
+    return result
@@ -0,0 +1,137 @@
+"""
+Playlist Manifest
+Per-playlist record of converted entries (video ID -> output file, size, hash,
+status), kept in the playlist folder so sync runs only process new videos and a
+crashed run resumes where it stopped
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+MANIFEST_NAME = '.yttool-manifest.json'
+MANIFEST_VERSION = 1
+
+# Entry statuses
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Manifest of one playlist folder; every update is written to disk immediately
+
+    Safe to update from worker threads.
+    """
+
+    def __init__(self, playlist_dir):
+        self.playlist_dir = playlist_dir
+        self.path = os.path.join(playlist_dir, MANIFEST_NAME)
+        self.playlist = {}
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable manifest {self.path}: {e}")
+            return
+        self.playlist = data.get('playlist', {})
+        self.entries = data.get('entries', {})
+
+    def _save(self):
+        data = {
+            'version': MANIFEST_VERSION,
+            'playlist': self.playlist,
+            'updated': time.time(),
+            'entries': self.entries,
+        }
+        os.makedirs(self.playlist_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.playlist_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def set_playlist(self, url, title):
+        with self._lock:
+            self.playlist = {'url': url, 'title': title}
+            self._save()
+
+    def is_complete(self, video_id):
+        """True if the entry finished and its output file is still there, unchanged in size
+
+        Sizes are compared instead of hashes so a sync over a large playlist does
+        not re-read every file; use verify() for a full check.
+        """
+        entry = self.entries.get(video_id)
+        if not entry or entry.get('status') != DONE:
+            return False
+        output = os.path.join(self.playlist_dir, entry.get('file', ''))
+        try:
+            return os.path.getsize(output) == entry.get('size')
+        except OSError:
+            return False
+
+    def verify(self, video_id):
+        """True if the entry is complete and its output still matches the recorded hash"""
+        if not self.is_complete(video_id):
+            return False
+        entry = self.entries[video_id]
+        return file_sha256(os.path.join(self.playlist_dir, entry['file'])) == entry.get('sha256')
+
+    def mark_pending(self, video_id, title):
+        with self._lock:
+            entry = self.entries.setdefault(video_id, {})
+            entry.update(title=title, status=PENDING, started=time.time())
+            entry.pop('error', None)
+            self._save()
+
+    def mark_done(self, video_id, output_file):
+        size = os.path.getsize(output_file)
+        sha256 = file_sha256(output_file)
+        with self._lock:
+            entry = self.entries.setdefault(video_id, {})
+            entry.update(
+                file=os.path.relpath(output_file, self.playlist_dir),
+                size=size,
+                sha256=sha256,
+                status=DONE,
+                finished=time.time(),
+            )
+            entry.pop('error', None)
+            self._save()
+
+    def mark_failed(self, video_id, error):
+        with self._lock:
+            entry = self.entries.setdefault(video_id, {})
+            entry.update(status=FAILED, error=str(error), finished=time.time())
+            self._save()
+
+    def counts(self):
+        """Number of entries per status"""
+        counts = {}
+        for entry in self.entries.values():
+            counts[entry.get('status')] = counts.get(entry.get('status'), 0) + 1
+        return counts
@@ -0,0 +1,158 @@
+"""
+Backfill queue leasing, retries and statistics against a temporary SQLite queue
+"""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import backfill  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = backfill.connect(tmp_path / 'queue.db')
+    yield db
+    db.close()
+
+
+def get_row(db, job_id):
+    return db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+
+def expire(db, job):
+    db.execute("UPDATE jobs SET lease_until = ? WHERE id = ?", (time.time() - 1, job['id']))
+
+
+def test_add_items_ignores_duplicates(db):
+    assert backfill.add_items(db, ['a', 'b']) == 2
+    assert backfill.add_items(db, ['b', 'c']) == 1
+
+
+def test_expired_lease_is_released_to_another_worker(db):
+    backfill.add_items(db, ['video'])
+    first = backfill.lease_next(db, 'host-a')
+    assert first['attempts'] == 1
+    assert backfill.lease_next(db, 'host-b') is None  # Lease still valid
+
+    expire(db, first)
+    second = backfill.lease_next(db, 'host-b')
+    assert second['id'] == first['id']
+    assert second['attempts'] == 2
+    assert second['lease_token'] != first['lease_token']
+    assert get_row(db, second['id'])['worker'] == 'host-b'
+
+
+def test_superseded_worker_cannot_record_results(db):
+    backfill.add_items(db, ['video'])
+    stale = backfill.lease_next(db, 'host-a')
+    expire(db, stale)
+    current = backfill.lease_next(db, 'host-b')
+
+    assert not backfill.renew_lease(db, stale)
+    assert not backfill.complete_job(db, stale, {'text': 'stale'}, 10.0, 1.0)
+    assert backfill.fail_job(db, stale, 'stale failure') is None
+    backfill.release_job(db, stale)
+    row = get_row(db, current['id'])
+    assert row['status'] == backfill.LEASED
+    assert row['lease_token'] == current['lease_token']
+    assert row['error'] is None
+
+    assert backfill.complete_job(db, current, {'text': 'current'}, 10.0, 1.0)
+    assert get_row(db, current['id'])['status'] == backfill.DONE
+
+
+def test_failures_back_off_then_fail_at_the_attempt_limit(db):
+    backfill.add_items(db, ['video'])
+    job = backfill.lease_next(db, 'host-a', max_attempts=2)
+    assert backfill.fail_job(db, job, 'boom', max_attempts=2, retry_delay=60) == backfill.QUEUED
+
+    # Waiting out the retry delay: pending, but not leasable
+    row = get_row(db, job['id'])
+    assert row['retry_after'] == pytest.approx(time.time() + 60, abs=5)
+    assert backfill.lease_next(db, 'host-b', max_attempts=2) is None
+    assert backfill.has_pending(db)
+    assert backfill.queue_stats(db)['waiting_to_retry'] == 1
+
+    db.execute("UPDATE jobs SET retry_after = ? WHERE id = ?", (time.time() - 1, job['id']))
+    job = backfill.lease_next(db, 'host-b', max_attempts=2)
+    assert job['attempts'] == 2
+    assert backfill.fail_job(db, job, 'boom again', max_attempts=2, retry_delay=60) == backfill.FAILED
+    row = get_row(db, job['id'])
+    assert row['status'] == backfill.FAILED
+    assert row['error'] == 'boom again'
+    assert not backfill.has_pending(db)
+
+    assert backfill.retry_failed(db) == 1
+    job = backfill.lease_next(db, 'host-a', max_attempts=2)
+    assert job['attempts'] == 1
+
+
+def test_stalled_lease_fails_at_the_attempt_limit(db):
+    backfill.add_items(db, ['video'])
+    job = backfill.lease_next(db, 'host-a', max_attempts=1)
+    expire(db, job)
+    assert backfill.lease_next(db, 'host-b', max_attempts=1) is None
+    row = get_row(db, job['id'])
+    assert row['status'] == backfill.FAILED
+    assert 'lease expired on host-a' in row['error']
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert backfill.retry_delay_for(1, 60) == 60
+    assert backfill.retry_delay_for(2, 60) == 120
+    assert backfill.retry_delay_for(3, 60) == 240
+    assert backfill.retry_delay_for(50, 60) == backfill.MAX_RETRY_DELAY
+
+
+def test_release_does_not_use_an_attempt(db):
+    backfill.add_items(db, ['video'])
+    job = backfill.lease_next(db, 'host-a')
+    backfill.release_job(db, job)
+    row = get_row(db, job['id'])
+    assert row['status'] == backfill.QUEUED
+    assert row['attempts'] == 0
+    assert backfill.lease_next(db, 'host-b')['attempts'] == 1
+
+
+def test_queue_stats_throughput(db):
+    now = time.time()
+    backfill.add_items(db, ['done-1', 'done-2', 'old', 'queued-1', 'queued-2'])
+    for item, finished_ago in (('done-1', 1800), ('done-2', 600), ('old', 3 * 3600)):
+        job = backfill.lease_next(db, 'host-a')
+        assert job['item'] == item
+        assert backfill.complete_job(db, job, {}, audio_seconds=1800.0, processing_seconds=900.0)
+        db.execute("UPDATE jobs SET finished = ? WHERE id = ?", (now - finished_ago, job['id']))
+    db.execute("INSERT INTO workers (id, host, pid, started, last_seen) VALUES (?, ?, ?, ?, ?)",
+               ('host-a:1', 'host-a', 1, now - 7200, now))
+    db.execute("INSERT INTO workers (id, host, pid, started, last_seen) VALUES (?, ?, ?, ?, ?)",
+               ('host-b:1', 'host-b', 1, now - 7200, now - 3600))
+
+    stats = backfill.queue_stats(db, window=3600, lease=300)
+    assert stats['counts'] == {backfill.QUEUED: 2, backfill.LEASED: 0, backfill.DONE: 3, backfill.FAILED: 0}
+    assert stats['audio_hours_done'] == pytest.approx(1.5)
+    assert stats['processing_hours'] == pytest.approx(0.75)
+    # Two jobs (one hour of audio) finished in the 30 minutes since the first one in the window
+    assert stats['jobs_per_hour'] == pytest.approx(4.0, rel=0.01)
+    assert stats['audio_hours_per_hour'] == pytest.approx(2.0, rel=0.01)
+    assert stats['eta_hours'] == pytest.approx(0.5, rel=0.01)
+    assert stats['active_workers'] == 1
+    assert [worker['stale'] for worker in stats['workers']] == [False, True]
+
+
+def test_old_queue_gains_the_retry_column(tmp_path):
+    path = tmp_path / 'old.db'
+    old = sqlite3.connect(str(path))
+    old.executescript(backfill.SCHEMA.replace('retry_after REAL,', ''))
+    old.close()
+    db = backfill.connect(path)
+    backfill.add_items(db, ['video'])
+    job = backfill.lease_next(db, 'host-a')
+    assert backfill.fail_job(db, job, 'boom') == backfill.QUEUED
+    db.close()
@@ -0,0 +1,58 @@
+"""
+Runs bench/check_startup.py's commands under pytest: each must stay within the
+import-time budget and must not import a heavy module. The heavy packages are
+replaced by empty stand-ins on PYTHONPATH, so backend detection finds them and
+an eager import shows up even on hosts where they are not installed
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR / 'bench'))
+
+import check_startup  # noqa: E402
+
+# Shared CI runners are noisy; a real regression (e.g. importing torch) costs
+# far more than this margin
+BUDGET_MS = 2 * check_startup.DEFAULT_BUDGET_MS
+
+
+@pytest.fixture
+def heavy_stubs(tmp_path, monkeypatch):
+    """Empty top-level packages named after every heavy module, first on PYTHONPATH"""
+    for module in check_startup.HEAVY_MODULES:
+        package = tmp_path / module
+        package.mkdir()
+        (package / '__init__.py').write_text('')
+    monkeypatch.setenv('PYTHONPATH', str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize('command', check_startup.COMMANDS, ids=' '.join)
+def test_light_commands_start_fast(command, heavy_stubs):
+    import_ms, _, heavy = check_startup.check_command(command)
+    assert not heavy, f"{' '.join(command)} imported {', '.join(heavy)}"
+    assert import_ms <= BUDGET_MS, f"{' '.join(command)} imports took {import_ms:.0f} ms"
+
+
+def test_stubs_are_detected(heavy_stubs, tmp_path):
+    # A command that imports a heavy module eagerly must be caught
+    script = tmp_path / 'eager.py'
+    script.write_text('import yt_dlp\nimport numpy\n')
+    _, _, heavy = check_startup.check_command([str(script)])
+    assert heavy == ['numpy', 'yt_dlp']
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   encodings.utf_8\n"
+        "import time:       200 |        300 | encodings\n"
+        "import time:        50 |         50 | yt_dlp\n"
+    )
+    total_us, modules = check_startup.parse_importtime(stderr)
+    assert total_us == 350
+    assert modules == {'encodings', 'yt_dlp'}
@@ -0,0 +1,121 @@
+"""
+Download/transcribe pipeline driven by transcribe_pipeline.fixture_downloader()
+(the offline stand-in for yt-dlp) and a fake transcriber
+"""
+
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import transcribe_pipeline  # noqa: E402
+
+
+@pytest.fixture
+def work_root(tmp_path, monkeypatch):
+    """Per-item work directories are created here, so they can be counted"""
+    root = tmp_path / 'work'
+    root.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(root))
+    return root
+
+
+@pytest.fixture
+def fixture_file(tmp_path):
+    path = tmp_path / 'fixture.wav'
+    path.write_bytes(b'RIFF fake audio')
+    return path
+
+
+def in_flight(work_root):
+    return sum(1 for path in work_root.iterdir() if path.name.startswith('whisper_transcribe_'))
+
+
+def run(items, fixture_file, work_root, monkeypatch, max_pending=2, download_workers=3, transcribe_workers=2):
+    """Run the pipeline; returns (outcomes, peak audio files in flight, cleaned-up files)"""
+    lock = threading.Lock()
+    peak = 0
+    cleaned = []
+    download = transcribe_pipeline.fixture_downloader(str(fixture_file))
+    real_cleanup = transcribe_pipeline.cleanup_audio
+
+    def observe():
+        nonlocal peak
+        with lock:
+            peak = max(peak, in_flight(work_root))
+
+    def download_fn(item):
+        time.sleep(random.uniform(0, 0.02))  # Finish out of order
+        if item == 'bad-download':
+            raise ConnectionError('network down')
+        audio_file = download(item)
+        observe()
+        return audio_file
+
+    def make_transcriber():
+        def transcribe(item, audio_file):
+            observe()
+            assert Path(audio_file).read_bytes() == fixture_file.read_bytes()
+            time.sleep(0.01)
+            if item == 'bad-transcribe':
+                raise RuntimeError('model crashed')
+            return {'text': f"transcript of {item}"}
+        return transcribe
+
+    def cleanup(audio_file):
+        with lock:
+            cleaned.append(audio_file)
+        real_cleanup(audio_file)
+
+    monkeypatch.setattr(transcribe_pipeline, 'cleanup_audio', cleanup)
+    outcomes = transcribe_pipeline.run_pipeline(
+        items, download_fn, make_transcriber,
+        download_workers=download_workers, transcribe_workers=transcribe_workers, max_pending=max_pending,
+    )
+    return outcomes, peak, cleaned
+
+
+def test_results_in_input_order(fixture_file, work_root, monkeypatch):
+    items = [f"video-{index}" for index in range(12)]
+    outcomes, _, _ = run(items, fixture_file, work_root, monkeypatch)
+    assert [item for item, _, _ in outcomes] == items
+    assert [result['text'] for _, result, _ in outcomes] == [f"transcript of {item}" for item in items]
+    assert all(error is None for _, _, error in outcomes)
+
+
+@pytest.mark.parametrize('max_pending', [1, 2, 3])
+def test_backpressure_limits_audio_in_flight(fixture_file, work_root, monkeypatch, max_pending):
+    items = [f"video-{index}" for index in range(10)]
+    _, peak, _ = run(items, fixture_file, work_root, monkeypatch, max_pending=max_pending,
+                     download_workers=4, transcribe_workers=1)
+    assert 1 <= peak <= max_pending
+
+
+def test_failures_are_reported_per_item(fixture_file, work_root, monkeypatch):
+    items = ['video-0', 'bad-download', 'video-2', 'bad-transcribe', 'video-4']
+    outcomes, _, _ = run(items, fixture_file, work_root, monkeypatch)
+    errors = {item: error for item, _, error in outcomes}
+    assert errors['bad-download'].startswith('download failed: network down')
+    assert errors['bad-transcribe'].startswith('transcription failed: model crashed')
+    for item in ('video-0', 'video-2', 'video-4'):
+        assert errors[item] is None
+
+
+def test_every_downloaded_item_is_cleaned_up(fixture_file, work_root, monkeypatch):
+    items = ['video-0', 'bad-download', 'bad-transcribe', 'video-3', 'video-4']
+    _, _, cleaned = run(items, fixture_file, work_root, monkeypatch)
+    # Everything that was downloaded, including the failed transcription
+    assert len(cleaned) == len(items) - 1
+    assert in_flight(work_root) == 0
+
+
+def test_max_pending_must_be_positive():
+    with pytest.raises(ValueError):
+        transcribe_pipeline.run_pipeline([], lambda item: item, lambda: None, max_pending=0)
@@ -0,0 +1,139 @@
+"""
+Speech region detection and timestamp remapping in vad.py, on synthetic 16 kHz
+audio: tone bursts ("speech") separated by silence
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import vad  # noqa: E402
+
+RATE = 16000
+
+
+def synth(layout):
+    """Audio from (seconds, loud) pairs: a 300 Hz tone when loud, faint noise otherwise"""
+    rng = np.random.default_rng(0)
+    pieces = []
+    for seconds, loud in layout:
+        n = int(seconds * RATE)
+        if loud:
+            pieces.append(0.5 * np.sin(2 * np.pi * 300 * np.arange(n) / RATE))
+        else:
+            pieces.append(1e-4 * rng.standard_normal(n))
+    return np.concatenate(pieces).astype(np.float32)
+
+
+def energy_regions(audio, **options):
+    return vad.detect_speech_regions(audio, RATE, method='energy', **options)
+
+
+def test_regions_are_padded_around_the_bursts():
+    audio = synth([(2.0, False), (3.0, True), (4.0, False), (2.0, True), (1.0, False)])
+    regions = energy_regions(audio, pad=0.2)
+    assert len(regions) == 2
+    (start1, end1), (start2, end2) = regions
+    assert start1 == pytest.approx(1.8, abs=0.05)
+    assert end1 == pytest.approx(5.2, abs=0.05)
+    assert start2 == pytest.approx(8.8, abs=0.05)
+    assert end2 == pytest.approx(11.2, abs=0.05)
+
+
+def test_short_gaps_are_bridged_and_blips_dropped():
+    audio = synth([(1.0, False), (1.0, True), (0.3, False), (1.0, True),
+                   (2.0, False), (0.1, True), (2.0, False)])
+    regions = energy_regions(audio, min_silence=0.5, min_speech=0.25, pad=0.0)
+    assert len(regions) == 1
+    start, end = regions[0]
+    assert start == pytest.approx(1.0, abs=0.05)
+    assert end == pytest.approx(3.3, abs=0.05)
+
+
+def test_padding_is_clipped_to_the_audio():
+    audio = synth([(1.0, True), (1.0, False), (1.0, True)])
+    regions = energy_regions(audio, pad=0.5)
+    assert regions[0][0] == 0.0
+    assert regions[-1][1] == pytest.approx(3.0)
+
+
+def test_silence_has_no_regions():
+    assert energy_regions(synth([(3.0, False)])) == []
+    assert energy_regions(np.zeros(3 * RATE, dtype=np.float32)) == []
+    speech, offsets = vad.collect_speech(synth([(1.0, False)]), [], RATE)
+    assert len(speech) == 0
+    assert offsets == []
+
+
+def test_collect_speech_offsets():
+    audio = synth([(2.0, False), (1.0, True), (3.0, False), (1.5, True)])
+    regions = [(2.0, 3.0), (6.0, 7.5)]
+    speech, offsets = vad.collect_speech(audio, regions, RATE)
+    assert len(speech) == int(2.5 * RATE)
+    assert offsets == [(0.0, 2.0), (1.0, 6.0)]
+    assert np.array_equal(speech[:RATE], audio[2 * RATE:3 * RATE])
+
+
+def test_remap_segments_and_words():
+    offsets = [(0.0, 2.0), (1.0, 6.0)]
+    segments = [
+        {'start': 0.1, 'end': 1.0, 'text': 'one', 'words': [
+            {'word': 'one', 'start': 0.1, 'end': 0.5},
+            {'word': 'two', 'start': 0.6, 'end': 1.0},
+        ]},
+        {'start': 1.0, 'end': 2.0, 'text': 'three'},
+    ]
+    remapped = vad.remap_segments(segments, offsets)
+    # An end exactly on the boundary stays in the region it closes; a start moves on
+    assert (remapped[0]['start'], remapped[0]['end']) == pytest.approx((2.1, 3.0))
+    assert [(w['start'], w['end']) for w in remapped[0]['words']] == [
+        pytest.approx((2.1, 2.5)), pytest.approx((2.6, 3.0)),
+    ]
+    assert (remapped[1]['start'], remapped[1]['end']) == pytest.approx((6.0, 7.0))
+    assert remapped[1]['text'] == 'three'
+    assert segments[0]['start'] == 0.1  # Input left untouched
+
+
+def test_detect_collect_remap_round_trip():
+    audio = synth([(3.0, False), (2.0, True), (5.0, False), (2.0, True), (1.0, False)])
+    regions = energy_regions(audio, pad=0.0)
+    speech, offsets = vad.collect_speech(audio, regions, RATE)
+    assert len(speech) / RATE == pytest.approx(4.0, abs=0.1)
+
+    # A "transcriber" that emits one segment per region of the speech timeline
+    segments = []
+    for index, (speech_start, _) in enumerate(offsets):
+        speech_end = offsets[index + 1][0] if index + 1 < len(offsets) else len(speech) / RATE
+        segments.append({'start': speech_start, 'end': speech_end})
+    remapped = vad.remap_segments(segments, offsets)
+    assert [(s['start'], s['end']) for s in remapped] == [
+        pytest.approx(region, abs=1e-3) for region in regions
+    ]
+    assert remapped[0]['start'] == pytest.approx(3.0, abs=0.05)
+    assert remapped[1]['start'] == pytest.approx(10.0, abs=0.05)
+
+
+def test_split_points_fall_in_silence():
+    layout = []
+    for _ in range(4):
+        layout += [(55.0, True), (2.0, False)]
+    audio = synth(layout)
+    cuts = vad.find_split_points(audio, RATE, chunk_length=60.0, search_window=10.0)
+    assert cuts
+    for cut in cuts:
+        # Every cut lands inside one of the 2-second gaps
+        assert (cut % 57.0) >= 55.0 - 0.05
+
+
+def test_silero_ignores_a_tone():
+    pytest.importorskip('faster_whisper')
+    audio = synth([(1.0, False), (4.0, True), (1.0, False)])
+    assert vad.detect_speech_regions(audio, RATE, method='silero') == []
+    # The energy gate, by contrast, takes any loud sound for speech
+    assert energy_regions(audio)
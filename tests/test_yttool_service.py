@@ -0,0 +1,155 @@
+"""
+Offline end-to-end test of the job service: runs `yttool_service.py serve
+--offline` (serve() with offline_handlers()) in a temporary HOME and checks
+coalescing, cancellation, status and re-queueing after a restart
+"""
+
+import math
+import socket
+import struct
+import subprocess
+import sys
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import yttool_service  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='needs Unix sockets')
+
+# Simulated download time per job; long enough to act while a job is running
+DELAY = 1.5
+
+
+def write_fixture(path, seconds=1.0, rate=16000):
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b''.join(
+            struct.pack('<h', int(8000 * math.sin(2 * math.pi * 220 * n / rate)))
+            for n in range(int(seconds * rate))
+        ))
+
+
+@pytest.fixture
+def service_env(tmp_path, monkeypatch):
+    """Temporary HOME, socket and job database, shared by the service and this process"""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('YTTOOL_SERVICE_SOCKET', str(tmp_path / 'service.sock'))
+    monkeypatch.setenv('YTTOOL_SERVICE_DB', str(tmp_path / 'jobs.sqlite3'))
+    fixture = tmp_path / 'fixture.wav'
+    write_fixture(fixture)
+    return tmp_path, fixture
+
+
+def start_service(tmp_path, fixture):
+    log = open(tmp_path / 'service.log', 'a')
+    proc = subprocess.Popen(
+        [sys.executable, str(REPO_DIR / 'yttool_service.py'), 'serve', '--workers', '1',
+         '--offline', str(fixture), '--delay', str(DELAY)],
+        cwd=tmp_path, stdout=log, stderr=subprocess.STDOUT,
+    )
+    log.close()
+    deadline = time.time() + 30
+    while not yttool_service.is_running():
+        if proc.poll() is not None or time.time() > deadline:
+            proc.kill()
+            pytest.fail(f"service did not start:\n{(tmp_path / 'service.log').read_text()}")
+        time.sleep(0.1)
+    return proc
+
+
+def stop_service(proc):
+    request({'op': 'shutdown'})
+    assert proc.wait(timeout=30) == 0
+
+
+def request(message, timeout=30):
+    response = yttool_service.send_request(message, timeout)
+    assert response and response['ok'], response
+    return response
+
+
+def submit(url, output_dir):
+    return request({'op': 'submit', 'kind': 'mp3', 'url': url,
+                    'options': {'output_dir': str(output_dir)}, 'priority': 'normal'})
+
+
+def wait_for_status(job_id, status, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = request({'op': 'status', 'id': job_id})['job']
+        if job['status'] == status:
+            return job
+        time.sleep(0.05)
+    pytest.fail(f"job {job_id} never reached {status} (last: {job['status']})")
+
+
+def test_submit_dedup_cancel_status_and_restart(service_env):
+    tmp_path, fixture = service_env
+    output_dir = tmp_path / 'out'
+    proc = start_service(tmp_path, fixture)
+    try:
+        first = submit('https://www.youtube.com/watch?v=aaaaaaaaaaa', output_dir)
+        assert not first['coalesced']
+        job_id = first['job']['id']
+
+        # Another spelling of the same video joins the existing job
+        again = submit('https://youtu.be/aaaaaaaaaaa', output_dir)
+        assert again['coalesced']
+        assert again['job']['id'] == job_id
+        assert again['job']['requests'] == 2
+
+        # One worker: these wait behind the first job
+        wait_for_status(job_id, yttool_service.RUNNING)
+        queued = submit('https://youtu.be/bbbbbbbbbbb', output_dir)['job']
+        cancelled = submit('https://youtu.be/ccccccccccc', output_dir)['job']
+        assert queued['status'] == yttool_service.QUEUED
+        job = request({'op': 'cancel', 'id': cancelled['id']})['job']
+        assert job['status'] == yttool_service.CANCELLED
+
+        done = request({'op': 'result', 'id': job_id, 'wait': True}, timeout=60)['job']
+        assert done['status'] == yttool_service.DONE
+        assert Path(done['result']['output_file']).exists()
+
+        status = request({'op': 'status'})
+        assert status['counts'].get(yttool_service.DONE) == 1
+        assert status['counts'].get(yttool_service.CANCELLED) == 1
+
+        # Stop while the next job runs; it is re-queued and finished after a restart
+        wait_for_status(queued['id'], yttool_service.RUNNING)
+        stop_service(proc)
+        proc = start_service(tmp_path, fixture)
+        done = request({'op': 'result', 'id': queued['id'], 'wait': True}, timeout=60)['job']
+        assert done['status'] == yttool_service.DONE
+        assert request({'op': 'status', 'id': cancelled['id']})['job']['status'] == yttool_service.CANCELLED
+        assert 'Re-queued 1 job(s)' in (tmp_path / 'service.log').read_text()
+        stop_service(proc)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+def test_crash_exits_non_zero(service_env, monkeypatch):
+    tmp_path, fixture = service_env
+    # Longer than a Unix socket path may be, so binding fails
+    monkeypatch.setenv('YTTOOL_SERVICE_SOCKET', str(tmp_path / ('s' * 120)))
+    proc = subprocess.run(
+        [sys.executable, str(REPO_DIR / 'yttool_service.py'), 'serve', '--offline', str(fixture)],
+        cwd=tmp_path, capture_output=True, text=True, timeout=60,
+    )
+    assert proc.returncode == 1
+    assert 'Traceback' in proc.stderr
+    assert 'service crashed' in proc.stdout
+
+
+def test_client_reports_missing_service(service_env):
+    assert yttool_service.send_request({'op': 'ping'}) is None
+    assert not yttool_service.is_running()
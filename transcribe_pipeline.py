@@ -0,0 +1,130 @@
+"""
+Download/Transcribe Pipeline
+Overlaps audio downloads with transcription: a pool of download workers feeds a
+queue consumed by transcription workers, with a cap on audio files waiting on disk
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+import audio_store
+
+# Sentinel telling a transcription worker that no more audio is coming
+_DONE = object()
+
+
+def run_pipeline(items, download_fn, make_transcriber, handle_result=None,
+                 download_workers=2, transcribe_workers=1, max_pending=2):
+    """Run items through download -> transcribe with bounded overlap
+
+    download_fn(item) returns the path of a downloaded audio file. It is called
+    from download worker threads.
+
+    make_transcriber() is called once per transcription worker and returns a
+    transcribe(item, audio_file) callable, so each worker can own its model.
+
+    handle_result(item, result), if given, is called from the transcription
+    worker after each successful transcription (e.g. to save the transcript).
+
+    At most max_pending audio files exist at once (downloading or waiting to be
+    transcribed); downloaders block until a transcription frees a slot. Each
+    item's work directory is removed with cleanup_audio() once transcribed.
+
+    Returns a list of (item, result, error) in input order.
+    """
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+
+    items = list(items)
+    outcomes = [None] * len(items)
+    work = queue.Queue()
+    ready = queue.Queue()
+    slots = threading.Semaphore(max_pending)
+
+    for index, item in enumerate(items):
+        work.put((index, item))
+
+    def download_worker():
+        while True:
+            try:
+                index, item = work.get_nowait()
+            except queue.Empty:
+                return
+            slots.acquire()  # Backpressure: wait for a free pending-audio slot
+            try:
+                audio_file = download_fn(item)
+            except Exception as e:
+                slots.release()
+                outcomes[index] = (item, None, f"download failed: {e}")
+                continue
+            ready.put((index, item, audio_file))
+
+    def transcribe_worker():
+        transcribe = None
+        while True:
+            entry = ready.get()
+            if entry is _DONE:
+                return
+            index, item, audio_file = entry
+            try:
+                if transcribe is None:
+                    transcribe = make_transcriber()
+                result = transcribe(item, audio_file)
+                if handle_result:
+                    handle_result(item, result)
+                outcomes[index] = (item, result, None)
+            except Exception as e:
+                outcomes[index] = (item, None, f"transcription failed: {e}")
+            finally:
+                cleanup_audio(audio_file)
+                slots.release()
+
+    downloaders = [threading.Thread(target=download_worker, daemon=True)
+                   for _ in range(max(1, download_workers))]
+    transcribers = [threading.Thread(target=transcribe_worker, daemon=True)
+                    for _ in range(max(1, transcribe_workers))]
+
+    for thread in downloaders + transcribers:
+        thread.start()
+    for thread in downloaders:
+        thread.join()
+    for _ in transcribers:
+        ready.put(_DONE)
+    for thread in transcribers:
+        thread.join()
+
+    return outcomes
+
+
+def cleanup_audio(audio_file):
+    """Remove a per-item work directory once its audio has been transcribed
+
+    Files outside a whisper_transcribe_* work directory are left in place;
+    streams in the shared audio store are unpinned (see audio_store.release()).
+    """
+    audio_store.release(audio_file)
+    work_dir = os.path.dirname(str(audio_file))
+    if os.path.basename(work_dir).startswith('whisper_transcribe_'):
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def fixture_downloader(fixture_file, delay=0.0):
+    """Stand-in for the yt-dlp download step that serves a local fixture file
+
+    Returns a download_fn for run_pipeline() that copies fixture_file into a
+    fresh work directory (after an optional simulated network delay), so the
+    pipeline can be exercised offline.
+    """
+    def download(item):
+        if delay:
+            time.sleep(delay)
+        work_dir = tempfile.mkdtemp(prefix='whisper_transcribe_')
+        audio_file = os.path.join(work_dir, 'audio' + os.path.splitext(fixture_file)[1])
+        shutil.copyfile(fixture_file, audio_file)
+        return audio_file
+
+    return download
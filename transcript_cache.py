@@ -0,0 +1,202 @@
+"""
+Transcript Cache
+On-disk cache of Whisper result dicts keyed by video ID (or audio content hash),
+model, backend, language and task, with size-bounded LRU eviction
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+# Cache location (override with YTTOOL_TRANSCRIPT_CACHE)
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "yttool" / "transcripts"
+
+# Size budget in MB (override with YTTOOL_TRANSCRIPT_CACHE_MAX_MB)
+DEFAULT_MAX_MB = 500
+
+VIDEO_ID_PATTERN = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|live/|v/)|youtu\.be/)([A-Za-z0-9_-]{11})'
+)
+BARE_VIDEO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+
+def get_cache_dir():
+    """Get the transcript cache directory"""
+    return Path(os.environ.get('YTTOOL_TRANSCRIPT_CACHE', DEFAULT_CACHE_DIR))
+
+
+def get_max_bytes():
+    """Get the cache size budget in bytes"""
+    try:
+        max_mb = float(os.environ.get('YTTOOL_TRANSCRIPT_CACHE_MAX_MB', DEFAULT_MAX_MB))
+    except ValueError:
+        max_mb = DEFAULT_MAX_MB
+    return int(max_mb * 1024 * 1024)
+
+
+def extract_video_id(url):
+    """Extract a YouTube video ID from a URL or bare ID (None if not recognised)"""
+    if not url:
+        return None
+    match = VIDEO_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
+    if BARE_VIDEO_ID_PATTERN.match(url):
+        return url
+    return None
+
+
+def file_source(path):
+    """Cache source identifier for a local audio file (hash of its contents)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def make_key(source, model_name, backend, language=None, task='transcribe', vad=False, decoding=None):
+    """Build a cache key from the source and every option that affects the result
+
+    decoding holds non-default decoding options (preset, beam size); it is left
+    out of the key when None so default runs keep their existing keys.
+    """
+    parts = {
+        'source': source,
+        'model': model_name,
+        'backend': backend,
+        'language': language or 'auto',
+        'task': task,
+        'vad': vad,
+    }
+    if decoding:
+        parts['decoding'] = decoding
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest(), parts
+
+
+def _entry_path(key):
+    return get_cache_dir() / f"{key}.json"
+
+
+def get(key):
+    """Return the cached result dict for a key, or None (marks the entry as recently used)"""
+    path = _entry_path(key)
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)  # mtime is the LRU clock
+    except OSError:
+        pass
+    return entry.get('result')
+
+
+def put(key, parts, result):
+    """Store a result dict, then evict least-recently-used entries over the budget"""
+    cache_dir = get_cache_dir()
+    entry = dict(parts, key=key, created=time.time(), result=result)
+
+    temp_path = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, default=json_default)
+        os.replace(temp_path, _entry_path(key))
+    except (OSError, TypeError) as e:
+        # A cache write failure must never lose the transcript itself
+        print(f"⚠️  Could not write transcript cache: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
+        return False
+
+    prune(get_max_bytes())
+    return True
+
+
+def json_default(value):
+    """JSON fallback for numpy values that openai-whisper leaves in results"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def list_entries():
+    """List cache entries, most recently used first"""
+    cache_dir = get_cache_dir()
+    if not cache_dir.exists():
+        return []
+
+    entries = []
+    for path in cache_dir.glob('*.json'):
+        try:
+            stat = path.stat()
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            continue
+        entries.append({
+            'key': path.stem,
+            'path': path,
+            'source': entry.get('source', '?'),
+            'model': entry.get('model', '?'),
+            'backend': entry.get('backend', '?'),
+            'language': entry.get('language', '?'),
+            'task': entry.get('task', '?'),
+            'size': stat.st_size,
+            'last_used': stat.st_mtime,
+        })
+    entries.sort(key=lambda e: e['last_used'], reverse=True)
+    return entries
+
+
+def prune(max_bytes=None, older_than_days=None):
+    """Evict entries unused for older_than_days, then LRU entries until under max_bytes
+
+    Returns (removed_count, freed_bytes).
+    """
+    cache_dir = get_cache_dir()
+    if not cache_dir.exists():
+        return 0, 0
+
+    files = []
+    for path in cache_dir.glob('*.json'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()  # Oldest (least recently used) first
+
+    total = sum(size for _, size, _ in files)
+    cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+    removed = 0
+    freed = 0
+
+    for mtime, size, path in files:
+        too_old = cutoff is not None and mtime < cutoff
+        over_budget = max_bytes is not None and total > max_bytes
+        if not (too_old or over_budget):
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+        freed += size
+
+    return removed, freed
+
+
+def clear():
+    """Remove every cache entry. Returns (removed_count, freed_bytes)"""
+    return prune(max_bytes=0)
@@ -0,0 +1,189 @@
+"""
+Voice Activity Detection
+Speech/silence detection on decoded 16 kHz audio arrays, used to split long
+audio at silence boundaries and to transcribe only the speech. Speech regions
+come from the Silero model bundled with faster-whisper when it is installed
+(which also rejects music), else from a lightweight energy gate (which only
+rejects quiet audio)
+"""
+
+import bisect
+
+# Analysis frame length
+FRAME_SECONDS = 0.03
+
+# Frames quieter than this (dB below the loudest frames) count as silence
+DEFAULT_SILENCE_DB = 35.0
+
+# Frames quieter than this (dBFS) are always silence, even in audio with no speech
+SILENCE_FLOOR_DB = -70.0
+
+
+def frame_levels(audio, sample_rate=16000, frame_seconds=FRAME_SECONDS):
+    """RMS level in dBFS for consecutive non-overlapping frames"""
+    import numpy as np
+
+    frame = max(1, int(sample_rate * frame_seconds))
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    return (20 * np.log10(np.maximum(rms, 1e-10))).astype(np.float32)
+
+
+def silence_threshold(levels, silence_db=DEFAULT_SILENCE_DB):
+    """Level below which a frame is silence, relative to the loud end of the audio"""
+    import numpy as np
+
+    if len(levels) == 0:
+        return -100.0
+    reference = float(np.percentile(levels, 95))
+    return max(reference - silence_db, SILENCE_FLOOR_DB)
+
+
+def detect_speech_regions(audio, sample_rate=16000, silence_db=DEFAULT_SILENCE_DB,
+                          min_silence=0.5, min_speech=0.25, pad=0.2, method='auto'):
+    """Find speech regions as a list of (start_seconds, end_seconds)
+
+    Gaps shorter than min_silence are bridged, regions shorter than min_speech
+    are dropped, and each region is padded by pad seconds on both sides.
+    method is 'silero', 'energy' or 'auto' (Silero when faster-whisper is
+    installed and the audio is 16 kHz, else energy). silence_db only applies to
+    the energy gate.
+    """
+    if method == 'silero' or (method == 'auto' and sample_rate == 16000):
+        try:
+            return detect_speech_regions_silero(audio, sample_rate, min_silence, min_speech, pad)
+        except ImportError:
+            if method == 'silero':
+                raise
+    return detect_speech_regions_energy(audio, sample_rate, silence_db, min_silence, min_speech, pad)
+
+
+def detect_speech_regions_silero(audio, sample_rate=16000, min_silence=0.5, min_speech=0.25, pad=0.2):
+    """Speech regions from the Silero VAD model that ships with faster-whisper
+
+    Unlike the energy gate, music and other loud non-speech are not speech.
+    """
+    import numpy as np
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    if sample_rate != 16000:
+        raise ValueError("Silero VAD needs 16 kHz audio")
+    options = VadOptions(
+        min_silence_duration_ms=int(min_silence * 1000),
+        min_speech_duration_ms=int(min_speech * 1000),
+        speech_pad_ms=int(pad * 1000),
+    )
+    chunks = get_speech_timestamps(np.asarray(audio, dtype=np.float32), options)
+    return [(chunk['start'] / sample_rate, chunk['end'] / sample_rate) for chunk in chunks]
+
+
+def detect_speech_regions_energy(audio, sample_rate=16000, silence_db=DEFAULT_SILENCE_DB,
+                                 min_silence=0.5, min_speech=0.25, pad=0.2):
+    """Speech regions from frame levels relative to the loud end of the audio
+
+    Cheap and dependency-free, but anything as loud as speech (e.g. intro
+    music) counts as speech.
+    """
+    levels = frame_levels(audio, sample_rate)
+    threshold = silence_threshold(levels, silence_db)
+    total = len(audio) / sample_rate
+
+    regions = []
+    start = None
+    for index, level in enumerate(levels):
+        t = index * FRAME_SECONDS
+        if level >= threshold:
+            if start is None:
+                start = t
+            end = t + FRAME_SECONDS
+        elif start is not None and t - end >= min_silence:
+            regions.append((start, end))
+            start = None
+    if start is not None:
+        regions.append((start, end))
+
+    padded = []
+    for start, end in regions:
+        if end - start < min_speech:
+            continue
+        start = max(0.0, start - pad)
+        end = min(total, end + pad)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+
+def collect_speech(audio, regions, sample_rate=16000):
+    """Concatenate the speech regions of audio
+
+    Returns (speech_audio, offsets) where offsets lists (speech_start,
+    original_start) in seconds for each region, for remap_segments().
+    """
+    import numpy as np
+
+    pieces = []
+    offsets = []
+    position = 0.0
+    for start, end in regions:
+        piece = audio[int(start * sample_rate):int(end * sample_rate)]
+        offsets.append((position, start))
+        pieces.append(piece)
+        position += len(piece) / sample_rate
+    if not pieces:
+        return audio[:0], []
+    return np.concatenate(pieces), offsets
+
+
+def remap_segments(segments, offsets):
+    """Shift segment (and word) timestamps from the collect_speech() timeline back
+    to the original audio; an end falling exactly on a region boundary stays in
+    the region it closes
+    """
+    starts = [speech_start for speech_start, _ in offsets]
+
+    def remap(t, is_end=False):
+        find = bisect.bisect_left if is_end else bisect.bisect_right
+        index = max(0, find(starts, t) - 1)
+        speech_start, original_start = offsets[index]
+        return original_start + (t - speech_start)
+
+    remapped = []
+    for segment in segments:
+        segment = dict(segment, start=remap(segment['start']), end=remap(segment['end'], True))
+        if segment.get('words'):
+            segment['words'] = [
+                dict(word, start=remap(word['start']), end=remap(word['end'], True))
+                for word in segment['words']
+            ]
+        remapped.append(segment)
+    return remapped
+
+
+def find_split_points(audio, sample_rate=16000, chunk_length=60.0, search_window=10.0):
+    """Choose cut points (seconds) about every chunk_length seconds, each at the
+    quietest frame within search_window seconds before the target, so cuts fall
+    between words rather than in the middle of them
+    """
+    levels = frame_levels(audio, sample_rate)
+    total = len(audio) / sample_rate
+    frames_per_second = 1 / FRAME_SECONDS
+
+    cuts = []
+    position = 0.0
+    while total - position > chunk_length * 1.25:
+        target = position + chunk_length
+        lo = int(max(position + chunk_length / 2, target - search_window) * frames_per_second)
+        hi = int(target * frames_per_second)
+        window = levels[lo:hi]
+        if len(window) == 0:
+            cut = target
+        else:
+            cut = (lo + int(window.argmin())) * FRAME_SECONDS
+        cuts.append(cut)
+        position = cut
+    return cuts
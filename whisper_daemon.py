@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Whisper Model Daemon
+Keeps Whisper models loaded in memory and serves transcription requests over a
+local Unix socket, so repeated runs of whisper_transcribe.py skip model loading
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import transcript_cache
+
+# Socket path (override with WHISPER_DAEMON_SOCKET)
+DEFAULT_SOCKET_PATH = Path.home() / ".cache" / "yttool" / "whisper.sock"
+
+# Clients wait this long for a transcription before giving up (seconds)
+DEFAULT_TIMEOUT = 6 * 60 * 60
+
+
+def get_socket_path():
+    """Get the daemon socket path"""
+    return Path(os.environ.get('WHISPER_DAEMON_SOCKET', DEFAULT_SOCKET_PATH))
+
+
+def _send_message(sock, message, payload=None):
+    """Send a JSON header line, optionally followed by raw bytes"""
+    data = json.dumps(message, default=transcript_cache.json_default, ensure_ascii=False).encode('utf-8') + b'\n'
+    sock.sendall(data)
+    if payload:
+        sock.sendall(payload)
+
+
+def _read_message(rfile):
+    """Read one JSON header line from a socket file"""
+    line = rfile.readline()
+    if not line:
+        raise ConnectionError("Connection closed before a message was received")
+    return json.loads(line.decode('utf-8'))
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+def send_request(message, payload=None, timeout=DEFAULT_TIMEOUT):
+    """Send a request to the daemon and return its response dict
+
+    Returns None if no daemon is listening on the socket.
+    """
+    socket_path = get_socket_path()
+    if not hasattr(socket, 'AF_UNIX') or not socket_path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(str(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Stale socket file left behind by a daemon that is no longer running
+            return None
+        _send_message(sock, message, payload)
+        with sock.makefile('rb') as rfile:
+            return _read_message(rfile)
+    finally:
+        sock.close()
+
+
+def is_running():
+    """Check whether a daemon is accepting connections"""
+    try:
+        response = send_request({'op': 'ping'}, timeout=2)
+    except (OSError, ValueError):
+        return False
+    return bool(response and response.get('ok'))
+
+
+def request_transcription(audio_file, model_name="base", language=None, send_bytes=False, vad_filter=False):
+    """Ask the running daemon to transcribe an audio file
+
+    Returns the same result dict as whisper_transcribe.transcribe_audio(), or None
+    if no daemon is running. Raises RuntimeError if the daemon reports an error.
+    With send_bytes=True the file contents are streamed over the socket instead of
+    passing the path (for daemons that cannot read the caller's files).
+    vad_filter asks the daemon to transcribe only the detected speech.
+    """
+    message = {
+        'op': 'transcribe',
+        'model': model_name,
+        'language': language,
+        'vad': vad_filter,
+    }
+    payload = None
+
+    if send_bytes:
+        payload = Path(audio_file).read_bytes()
+        message['audio_bytes'] = len(payload)
+        message['suffix'] = Path(audio_file).suffix
+    else:
+        message['audio_file'] = os.path.abspath(audio_file)
+
+    try:
+        response = send_request(message, payload)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Could not talk to whisper daemon: {e}")
+
+    if response is None:
+        return None
+    if not response.get('ok'):
+        raise RuntimeError(response.get('error', 'unknown daemon error'))
+    return response['result']
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class ModelRegistry:
+    """Loaded models, kept in the process-wide model pool
+
+    Each model transcribes one file at a time; when loading another model would
+    exceed the pool's RAM budget, the least recently used idle model is evicted.
+    """
+
+    def preload(self, model_name):
+        import whisper_transcribe
+
+        print(f"🎙️  Loading Whisper model: {model_name}")
+        with whisper_transcribe.use_model(model_name):
+            pass
+
+    def transcribe(self, model_name, audio_file, language=None, vad_filter=False):
+        import whisper_transcribe
+
+        with whisper_transcribe.use_model(model_name) as model:
+            return whisper_transcribe.run_transcription(model, audio_file, language, vad_filter)
+
+    def loaded(self):
+        import model_pool
+
+        return sorted({entry['model'] for entry in model_pool.get_pool().stats()['models']})
+
+    def pool_stats(self):
+        import model_pool
+
+        return model_pool.get_pool().stats()
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request per connection"""
+
+    def handle(self):
+        try:
+            message = _read_message(self.rfile)
+        except (ConnectionError, ValueError) as e:
+            self._reply({'ok': False, 'error': f"Bad request: {e}"})
+            return
+
+        op = message.get('op')
+        try:
+            if op == 'ping':
+                self._reply({'ok': True})
+            elif op == 'status':
+                self._reply({
+                    'ok': True,
+                    'pid': os.getpid(),
+                    'backend': self.server.backend,
+                    'models': self.server.registry.loaded(),
+                    'pool': self.server.registry.pool_stats(),
+                    'uptime': time.time() - self.server.started_at,
+                    'requests': self.server.request_count,
+                })
+            elif op == 'transcribe':
+                self._reply({'ok': True, 'result': self._transcribe(message)})
+            elif op == 'shutdown':
+                self._reply({'ok': True})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                self._reply({'ok': False, 'error': f"Unknown op: {op}"})
+        except Exception as e:
+            self._reply({'ok': False, 'error': str(e)})
+
+    def _transcribe(self, message):
+        model_name = message.get('model') or 'base'
+        language = message.get('language')
+        vad_filter = bool(message.get('vad'))
+        self.server.request_count += 1
+
+        if 'audio_bytes' not in message:
+            audio_file = message.get('audio_file')
+            if not audio_file or not os.path.exists(audio_file):
+                raise FileNotFoundError(f"Audio file not found: {audio_file}")
+            print(f"🔄 Transcribing {audio_file} ({model_name})")
+            return self.server.registry.transcribe(model_name, audio_file, language, vad_filter)
+
+        # Byte stream: spool to a temp file, since both backends decode via ffmpeg
+        size = int(message['audio_bytes'])
+        fd, temp_path = tempfile.mkstemp(prefix='whisper_daemon_', suffix=message.get('suffix') or '')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                remaining = size
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        raise ConnectionError("Connection closed while receiving audio")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            print(f"🔄 Transcribing {size / (1024 * 1024):.1f} MB audio stream ({model_name})")
+            return self.server.registry.transcribe(model_name, temp_path, language, vad_filter)
+        finally:
+            os.unlink(temp_path)
+
+    def _reply(self, message):
+        try:
+            _send_message(self.connection, message)
+        except OSError:
+            pass  # Client went away
+
+
+class WhisperDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, backend):
+        self.registry = ModelRegistry()
+        self.backend = backend
+        self.started_at = time.time()
+        self.request_count = 0
+        super().__init__(str(socket_path), DaemonRequestHandler)
+
+
+def serve(preload=None, budget_mb=None):
+    """Run the daemon in the foreground until stopped
+
+    budget_mb overrides the model pool's RAM budget (YTTOOL_MODEL_POOL_MB).
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        print("❌ Error: Unix sockets are not supported on this platform")
+        sys.exit(1)
+
+    socket_path = get_socket_path()
+    if is_running():
+        print(f"⚠️  Whisper daemon already running on {socket_path}")
+        sys.exit(1)
+
+    import model_pool
+    import whisper_transcribe
+
+    if whisper_transcribe.WHISPER_TYPE is None:
+        print("❌ Error: Whisper not installed (pip install -U openai-whisper or faster-whisper)")
+        sys.exit(1)
+    if budget_mb is not None:
+        model_pool.get_pool().budget_mb = budget_mb
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        socket_path.unlink()  # Stale socket from a crashed daemon
+
+    server = WhisperDaemon(socket_path, whisper_transcribe.WHISPER_TYPE)
+    os.chmod(socket_path, 0o600)
+
+    try:
+        for model_name in preload or []:
+            server.registry.preload(model_name)
+
+        print(f"🚀 Whisper daemon listening on {socket_path} ({whisper_transcribe.WHISPER_TYPE}-whisper, "
+              f"model pool budget {model_pool.get_pool().budget_mb:.0f} MB)")
+        print("   Stop with: python3 whisper_daemon.py stop")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+    finally:
+        server.server_close()
+        if socket_path.exists():
+            socket_path.unlink()
+        print("🛑 Whisper daemon stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep Whisper models loaded in a background daemon for fast repeated transcription",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s serve                   # Start daemon (models load on first request)
+  %(prog)s serve --preload base    # Start daemon with base model already loaded
+  %(prog)s serve --budget-mb 6000  # Keep models resident up to ~6 GB (LRU eviction)
+  %(prog)s status                  # Show loaded models
+  %(prog)s stop                    # Stop the daemon
+
+whisper_transcribe.py and yttool.py use the daemon automatically when it is running.
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+
+    serve_parser = subparsers.add_parser('serve', help='Run the daemon in the foreground')
+    serve_parser.add_argument(
+        '--preload',
+        action='append',
+        choices=['tiny', 'base', 'small', 'medium', 'large'],
+        help='Model to load at startup (can be repeated)'
+    )
+    serve_parser.add_argument(
+        '--budget-mb',
+        type=float,
+        help='RAM budget for resident models (default: YTTOOL_MODEL_POOL_MB or half of RAM)'
+    )
+    subparsers.add_parser('status', help='Show daemon status')
+    subparsers.add_parser('stop', help='Stop the running daemon')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.preload, args.budget_mb)
+
+    elif args.command == 'status':
+        response = send_request({'op': 'status'}, timeout=5)
+        if not response:
+            print(f"📭 Whisper daemon not running ({get_socket_path()})")
+            sys.exit(1)
+        models = ', '.join(response['models']) or 'none yet'
+        print(f"✓ Whisper daemon running (pid {response['pid']}, {response['backend']}-whisper)")
+        print(f"   Socket: {get_socket_path()}")
+        print(f"   Loaded models: {models}")
+        pool = response.get('pool')
+        if pool:
+            print(f"   Model pool: {pool['resident_mb']:.0f} of {pool['budget_mb']:.0f} MB")
+            for entry in pool['models']:
+                source = 'measured' if entry['measured'] else 'estimated'
+                print(f"     {entry['model']:8} {entry['compute_type']:8} ~{entry['size_mb']:.0f} MB "
+                      f"({source}), {entry['uses']} uses")
+        print(f"   Requests served: {response['requests']}")
+        print(f"   Uptime: {response['uptime'] / 60:.1f} min")
+
+    elif args.command == 'stop':
+        response = send_request({'op': 'shutdown'}, timeout=5)
+        if not response:
+            print("📭 Whisper daemon not running")
+            sys.exit(1)
+        print("✓ Whisper daemon stopping")
+
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
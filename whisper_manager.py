@@ -59,16 +59,20 @@ MODEL_INFO = {
 }
 
 def get_whisper_type():
-    """Detect which Whisper implementation is installed"""
-    try:
-        import whisper
-        return "openai"
-    except ImportError:
-        try:
-            from faster_whisper import WhisperModel
-            return "faster"
-        except ImportError:
-            return None
+    """Detect which Whisper implementation is installed, without importing it
+
+    openai-whisper is preferred; WHISPER_BACKEND=faster picks faster-whisper
+    when both are installed.
+    """
+    from importlib.util import find_spec
+    
+    backends = [("openai", "whisper"), ("faster", "faster_whisper")]
+    if os.environ.get('WHISPER_BACKEND') == 'faster':
+        backends.reverse()
+    for whisper_type, module in backends:
+        if find_spec(module) is not None:
+            return whisper_type
+    return None
 
 def get_model_cache_dir(whisper_type):
     """Get the cache directory for Whisper models"""
@@ -165,15 +169,129 @@ def download_model(model_name, whisper_type):
                 return True  # Still return True since model loaded successfully
                 
         elif whisper_type == "faster":
+            import inference_config
             from faster_whisper import WhisperModel
+            settings = inference_config.resolve(model_name, whisper_type)
             print(f"\n🔄 Loading model (will download if not cached)...")
-            model = WhisperModel(model_name, device="cpu", compute_type="int8")
+            model = WhisperModel(model_name, device="cpu", compute_type=settings['compute_type'],
+                                 cpu_threads=settings['cpu_threads'])
             print(f"✓ Model '{model_name}' downloaded and ready!")
             return True
     except Exception as e:
         print(f"❌ Error downloading model: {e}")
         return False
 
+def prepare_model(model_name, whisper_type, compute_type='float32'):
+    """Convert a model into the prepared store for fast, shared loading"""
+    import model_store
+    
+    if model_name not in MODEL_INFO:
+        print(f"❌ Error: Invalid model name '{model_name}'")
+        print(f"   Available models: {', '.join(MODEL_INFO.keys())}")
+        return False
+    
+    print(f"🛠️  Preparing model: {model_name}")
+    try:
+        if whisper_type == "openai":
+            print(f"   Re-saving {compute_type} weights for memory-mapped loading (downloads if needed)...")
+            path = model_store.prepare_openai(model_name, compute_type)
+        else:
+            print("   Saving a local snapshot (downloads if needed)...")
+            path = model_store.prepare_faster(model_name)
+    except Exception as e:
+        print(f"❌ Error preparing model: {e}")
+        return False
+    
+    print(f"✓ Prepared '{model_name}' at {path}")
+    if whisper_type == "faster":
+        print("   Note: CTranslate2 cannot memory-map weights, so each worker still holds its own copy")
+    return True
+
+def default_thread_counts():
+    """Thread counts to calibrate: 1, half the cores, and all cores"""
+    cpus = os.cpu_count() or 1
+    return sorted({1, max(1, cpus // 2), cpus})
+
+def calibrate_models(whisper_type, models=None, threads=None, compute_types=None, audio=None, timeout=3600):
+    """Benchmark installed models on this host and store the results in the host profile
+    
+    Each configuration runs through bench/run_bench.py in a fresh process, so
+    load time and peak RSS are measured from a cold start.
+    """
+    import json
+    import subprocess
+    import tempfile
+    import host_profile
+    
+    for model_name in models or []:
+        if model_name not in MODEL_INFO:
+            print(f"❌ Error: Invalid model name '{model_name}'")
+            print(f"   Available models: {', '.join(MODEL_INFO.keys())}")
+            return False
+    
+    models = models or [m['name'] for m in list_installed_models(whisper_type)]
+    if not models:
+        print("📭 No models installed to calibrate")
+        print("   Download one with: python3 whisper_manager.py download base")
+        return False
+    
+    threads = threads or default_thread_counts()
+    compute_types = compute_types or (['int8', 'float32'] if whisper_type == "faster" else ['default'])
+    runs = len(models) * len(threads) * (len(compute_types) if whisper_type == "faster" else 1)
+    print(f"⏱️  Calibrating {', '.join(models)} ({whisper_type}-whisper, {runs} runs)")
+    print(f"   Threads: {' '.join(str(t) for t in threads)}")
+    if whisper_type == "faster":
+        print(f"   Compute types: {' '.join(compute_types)}")
+    print()
+    
+    bench_script = Path(__file__).resolve().parent / "bench" / "run_bench.py"
+    fd, report_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    cmd = [sys.executable, str(bench_script),
+           '--models', *models,
+           '--backends', whisper_type,
+           '--threads', *(str(t) for t in threads),
+           '--compute-types', *compute_types,
+           '--timeout', str(timeout),
+           '-o', report_path]
+    if audio:
+        cmd += ['--audio', audio, '--fixtures']
+    try:
+        subprocess.run(cmd, check=True)
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"❌ Error running calibration: {e}")
+        return False
+    finally:
+        os.unlink(report_path)
+    
+    profile = host_profile.load()
+    calibrated = 0
+    print()
+    for model_name in models:
+        results = [r for r in report['results'] if r['model'] == model_name]
+        entry = host_profile.record_calibration(profile, model_name, whisper_type, results)
+        if not entry:
+            print(f"❌ {model_name}: every run failed")
+            continue
+        best = entry['best']
+        threads_str = best['cpu_threads'] or 'default'
+        print(f"✓ {model_name:8} RTF {entry['rtf']:.3f}  load {entry['load_time']:.1f}s  "
+              f"peak {entry['peak_rss_mb']:.0f} MB  best: threads={threads_str} "
+              f"compute={best['compute_type']}")
+        calibrated += 1
+    
+    if not calibrated:
+        return False
+    try:
+        host_profile.save(profile)
+    except OSError as e:
+        print(f"❌ Error saving host profile: {e}")
+        return False
+    print(f"\n✓ Host profile saved to: {host_profile.get_profile_path()}")
+    return True
+
 def delete_model(model_name, whisper_type):
     """Delete a Whisper model"""
     if model_name not in MODEL_INFO:
@@ -215,6 +333,12 @@ def delete_model(model_name, whisper_type):
             if not deleted:
                 print(f"⚠️  Model '{model_name}' not found")
     
+    # Prepared copies are useless without the model, so remove them too
+    import model_store
+    freed = model_store.remove(model_name)
+    if freed:
+        print(f"✓ Deleted prepared copies of '{model_name}' ({freed:.1f} MB freed)")
+    
     return deleted
 
 def get_active_model():
@@ -248,6 +372,53 @@ def set_active_model(model_name):
         print(f"❌ Error saving config: {e}")
         return False
 
+def show_config(whisper_type=None, model_name=None):
+    """Show the effective inference settings and where each comes from"""
+    import inference_config
+    
+    model_name = model_name or get_active_model() or 'base'
+    limit = inference_config.cgroup_cpu_limit()
+    quota = f", cgroup quota {limit:g}" if limit is not None else ""
+    print(f"⚙️  Inference settings for {model_name} ({whisper_type or 'no'}-whisper)")
+    print(f"   CPUs available: {inference_config.available_cpus()} (of {os.cpu_count()}{quota})")
+    print(f"   Config file: {inference_config.get_config_path()}")
+    print()
+    for name, (value, source) in inference_config.explain(model_name, whisper_type).items():
+        shown = 'library default' if value is None or (name == 'cpu_threads' and value == 0) else value
+        print(f"   {name:13} {str(shown):16} ({source})")
+    print()
+    print("💡 Change with: python3 whisper_manager.py config set cpu_threads=8 preset=balanced")
+    print("   Per run: whisper_transcribe.py --cpu-threads/--num-workers/--compute-type/--preset/--beam-size/--batch-size")
+
+def update_config(assignments=(), unset=()):
+    """Set (name=value) and remove settings in the config file"""
+    import inference_config
+    
+    settings = inference_config.load_config()
+    try:
+        for assignment in assignments:
+            name, sep, value = assignment.partition('=')
+            if not sep:
+                raise ValueError(f"Expected name=value, got '{assignment}'")
+            settings[name.strip()] = inference_config.parse_value(name.strip(), value.strip())
+        for name in unset:
+            if name not in inference_config.SETTINGS:
+                raise ValueError(f"Unknown setting '{name}' (choose from: {', '.join(inference_config.SETTINGS)})")
+            settings.pop(name, None)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+    
+    try:
+        path = inference_config.save_config(settings)
+    except OSError as e:
+        print(f"❌ Error saving config: {e}")
+        return False
+    print(f"✓ Inference settings saved to: {path}")
+    for name, value in sorted(settings.items()):
+        print(f"   {name} = {value}")
+    return True
+
 def list_remote_models():
     """List all available remote models"""
     print("=" * 70)
@@ -271,8 +442,11 @@ def list_remote_models():
     print("💡 Set as active model with:")
     print("   python3 whisper_manager.py use <model_name>")
 
-def show_model_info(model_name=None):
-    """Show information about Whisper models"""
+def show_model_info(model_name=None, whisper_type=None):
+    """Show information about Whisper models (with measurements from this host, if any)"""
+    import host_profile
+    
+    profile = host_profile.load()
     print("=" * 70)
     print("WHISPER MODEL INFORMATION")
     print("=" * 70)
@@ -293,8 +467,137 @@ def show_model_info(model_name=None):
         print(f"   Disk Space: {info['disk']}")
         print(f"   Speed: {info['speed']}")
         print(f"   Accuracy: {info['accuracy']}")
+        measured = host_profile.get_model(profile, name, whisper_type) if whisper_type else {}
+        if measured.get('rtf'):
+            print(f"   On this host ({measured.get('source', 'observed')}): "
+                  f"RTF {measured['rtf']:.3f}, load {measured.get('load_time', 0):.1f}s"
+                  + (f", peak {measured['peak_rss_mb']:.0f} MB" if measured.get('peak_rss_mb') else ""))
+        if measured.get('best'):
+            best = measured['best']
+            print(f"   Calibrated defaults: threads={best['cpu_threads'] or 'default'}, "
+                  f"compute={best['compute_type']}")
+            for run in measured.get('runs', []):
+                print(f"     threads={run['threads'] or 'default':<7} {run['compute_type']:8} "
+                      f"RTF {run['rtf']:.3f}  load {run['load_time']:.1f}s  peak {run['peak_rss_mb']:.0f} MB")
         print()
 
+def show_transcript_cache():
+    """Show transcript cache entries and total size"""
+    import time
+    import transcript_cache
+    
+    entries = transcript_cache.list_entries()
+    cache_dir = transcript_cache.get_cache_dir()
+    max_mb = transcript_cache.get_max_bytes() / (1024 * 1024)
+    
+    if not entries:
+        print(f"📭 Transcript cache is empty ({cache_dir})")
+        return
+    
+    print("=" * 70)
+    print("TRANSCRIPT CACHE")
+    print("=" * 70)
+    print()
+    total_size = 0
+    for entry in entries:
+        last_used = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_used']))
+        source = entry['source']
+        if source.startswith('sha256:'):
+            source = f"file {source[7:19]}"
+        print(f"✓ {source:18} {entry['model']:7} {entry['backend']:7} {entry['language']:5} "
+              f"{entry['size'] / 1024:8.1f} KB  {last_used}")
+        total_size += entry['size']
+    print()
+    print(f"Entries: {len(entries)}")
+    print(f"Total: {total_size / (1024 * 1024):.1f} MB of {max_mb:.0f} MB budget")
+    print(f"Location: {cache_dir}")
+
+
+def show_audio_store():
+    """Show downloaded audio streams kept in the shared audio store"""
+    import time
+    import audio_store
+    
+    entries = audio_store.list_entries()
+    store_dir = audio_store.get_store_dir()
+    max_mb = audio_store.get_max_bytes() / (1024 * 1024)
+    
+    if not entries:
+        print(f"📭 Audio store is empty ({store_dir})")
+        return
+    
+    print("=" * 70)
+    print("AUDIO STORE")
+    print("=" * 70)
+    print()
+    total_size = 0
+    for entry in entries:
+        last_used = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_used']))
+        print(f"✓ {entry['video_id']:14} format {entry['format_id']:8} "
+              f"{entry['size'] / (1024 * 1024):8.1f} MB  {last_used}")
+        total_size += entry['size']
+    print()
+    print(f"Streams: {len(entries)}")
+    print(f"Total: {total_size / (1024 * 1024):.1f} MB of {max_mb:.0f} MB budget "
+          f"(eviction: {audio_store.get_policy()})")
+    print(f"Location: {store_dir}")
+
+
+def prune_audio_store(max_mb=None):
+    """Evict downloaded audio streams down to a byte budget"""
+    import audio_store
+    
+    max_bytes = audio_store.get_max_bytes() if max_mb is None else int(max_mb * 1024 * 1024)
+    removed, freed = audio_store.prune(max_bytes, audio_store.get_policy())
+    print(f"✓ Removed {removed} stored audio streams ({freed / (1024 * 1024):.1f} MB freed)")
+
+
+def show_metadata_cache():
+    """Show cached video/playlist metadata and when it expires"""
+    import time
+    import metadata_cache
+    
+    entries = metadata_cache.list_entries()
+    cache_dir = metadata_cache.get_cache_dir()
+    ttl = metadata_cache.get_ttl()
+    
+    if not entries:
+        print(f"📭 Metadata cache is empty ({cache_dir})")
+        return
+    
+    print("=" * 70)
+    print("METADATA CACHE")
+    print("=" * 70)
+    print()
+    now = time.time()
+    for entry in entries:
+        age = (now - entry['fetched']) / 60
+        status = "✓" if now - entry['fetched'] <= ttl else "⌛"
+        title = str(entry['title'])[:40]
+        print(f"{status} {title:40} {entry['variant'][:14]:14} {age:6.0f} min old")
+    print()
+    print(f"Entries: {len(entries)}")
+    print(f"TTL: {ttl / 60:.0f} min (YTTOOL_METADATA_TTL)")
+    print(f"Location: {cache_dir}")
+
+
+def prune_metadata_cache(ttl=None):
+    """Remove expired metadata (or everything with ttl=0)"""
+    import metadata_cache
+    
+    removed, freed = metadata_cache.prune(ttl)
+    print(f"✓ Removed {removed} cached metadata entries ({freed / 1024:.1f} KB freed)")
+
+
+def prune_transcript_cache(max_mb=None, older_than_days=None):
+    """Evict transcript cache entries by age and/or size budget"""
+    import transcript_cache
+    
+    max_bytes = transcript_cache.get_max_bytes() if max_mb is None else int(max_mb * 1024 * 1024)
+    removed, freed = transcript_cache.prune(max_bytes, older_than_days)
+    print(f"✓ Removed {removed} cached transcripts ({freed / (1024 * 1024):.1f} MB freed)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Manage Whisper AI models: list, download, delete, and get info",
@@ -305,9 +608,18 @@ Examples:
   %(prog)s list-remote             # List all available remote models
   %(prog)s use base                # Set base as active model
   %(prog)s download base           # Download base model
+  %(prog)s prepare base            # Prepare base for memory-mapped warm starts
   %(prog)s delete tiny             # Delete tiny model
   %(prog)s info                    # Show info for all models
   %(prog)s info large              # Show info for large model
+  %(prog)s calibrate               # Measure installed models on this host
+  %(prog)s config                  # Show thread/compute/preset/batch settings and their sources
+  %(prog)s config set batch_size=16 cpu_threads=16
+  %(prog)s config set preset=balanced  # Default decoding preset
+  %(prog)s cache                   # Show cached transcripts
+  %(prog)s cache prune --max-mb 100  # Shrink transcript cache to 100 MB
+  %(prog)s cache --audio           # Show downloaded audio kept for reuse
+  %(prog)s cache --metadata        # Show cached video/playlist metadata
         """
     )
     
@@ -335,6 +647,23 @@ Examples:
         help='Model name to download'
     )
     
+    # Prepare command
+    prepare_parser = subparsers.add_parser(
+        'prepare', help='Convert a model for memory-mapped loading shared across workers'
+    )
+    prepare_parser.add_argument(
+        'model',
+        nargs='?',
+        choices=list(MODEL_INFO.keys()),
+        help='Model name to prepare (default: active model, or base)'
+    )
+    prepare_parser.add_argument(
+        '--compute-type',
+        choices=['float32', 'float16'],
+        default='float32',
+        help='openai-whisper: weight dtype to store (float32 for CPU, float16 for GPU; default: float32)'
+    )
+    
     # Delete command
     delete_parser = subparsers.add_parser('delete', help='Delete a model')
     delete_parser.add_argument(
@@ -357,21 +686,160 @@ Examples:
         help='Model name (optional, shows all if not specified)'
     )
     
+    # Calibrate command
+    calibrate_parser = subparsers.add_parser(
+        'calibrate', help='Measure installed models on this host and store the best settings'
+    )
+    calibrate_parser.add_argument(
+        'models',
+        nargs='*',
+        metavar='model',
+        help=f"Models to calibrate: {', '.join(MODEL_INFO.keys())} (default: all installed)"
+    )
+    calibrate_parser.add_argument(
+        '--threads',
+        nargs='+',
+        type=int,
+        help='CPU thread counts to try (default: 1, half and all cores)'
+    )
+    calibrate_parser.add_argument(
+        '--compute-types',
+        nargs='+',
+        help='faster-whisper compute types to try (default: int8 float32)'
+    )
+    calibrate_parser.add_argument(
+        '--audio',
+        metavar='FILE',
+        help='Calibrate on a local recording instead of the synthetic fixture'
+    )
+    calibrate_parser.add_argument(
+        '--timeout',
+        type=int,
+        default=3600,
+        help='Per-run timeout in seconds (default: 3600)'
+    )
+    
+    # Config command
+    config_parser = subparsers.add_parser(
+        'config', help='Show or change inference settings (threads, compute type, decoding preset, beam/batch size)'
+    )
+    config_parser.add_argument(
+        'action',
+        nargs='?',
+        choices=['show', 'set', 'unset'],
+        default='show',
+        help='show effective settings (default), set name=value..., or unset name...'
+    )
+    config_parser.add_argument(
+        'settings',
+        nargs='*',
+        metavar='setting',
+        help='set: name=value pairs; unset: names (cpu_threads, num_workers, compute_type, preset, beam_size, batch_size)'
+    )
+    
+    # Cache command
+    cache_parser = subparsers.add_parser('cache', help='Inspect and prune the transcript cache')
+    cache_parser.add_argument(
+        'action',
+        nargs='?',
+        choices=['list', 'prune', 'clear'],
+        default='list',
+        help='list entries (default), prune by size/age, or clear everything'
+    )
+    cache_parser.add_argument(
+        '--max-mb',
+        type=float,
+        help='prune: shrink cache to this size (default: YTTOOL_TRANSCRIPT_CACHE_MAX_MB or 500; '
+             'not with --metadata)'
+    )
+    cache_parser.add_argument(
+        '--older-than',
+        type=float,
+        metavar='DAYS',
+        help='prune: also remove transcripts not used for this many days (not with --audio/--metadata)'
+    )
+    cache_parser.add_argument(
+        '-y', '--yes',
+        action='store_true',
+        help='clear: skip confirmation prompt'
+    )
+    cache_parser.add_argument(
+        '--audio',
+        action='store_true',
+        help='Operate on the downloaded audio store (~/.cache/yttool/audio) instead'
+    )
+    cache_parser.add_argument(
+        '--metadata',
+        action='store_true',
+        help='Operate on the video/playlist metadata cache (~/.cache/yttool/metadata) instead; '
+             'prune removes expired entries'
+    )
+    
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         sys.exit(1)
     
-    # Check if Whisper is installed
+    # The cache command does not need Whisper installed
+    if args.command == 'cache':
+        if args.audio and args.metadata:
+            parser.error("--audio and --metadata cannot be combined")
+        pruning = [option for option, value in (('--max-mb', args.max_mb), ('--older-than', args.older_than))
+                   if value is not None]
+        if pruning and args.action != 'prune':
+            parser.error(f"{pruning[0]} only applies to cache prune")
+        if args.metadata and pruning:
+            parser.error(f"{pruning[0]} cannot be used with --metadata (prune removes expired entries)")
+        if args.audio and args.older_than is not None:
+            parser.error("--older-than cannot be used with --audio (the audio store is pruned by size)")
+        if args.metadata:
+            if args.action == 'list':
+                show_metadata_cache()
+            elif args.action == 'prune':
+                prune_metadata_cache()
+            elif args.yes or input("⚠️  Delete all cached metadata? (y/n): ").lower() == 'y':
+                prune_metadata_cache(ttl=0)
+            else:
+                print("   Cancelled")
+            return
+        if args.action == 'list':
+            show_audio_store() if args.audio else show_transcript_cache()
+        elif args.action == 'prune':
+            if args.audio:
+                prune_audio_store(args.max_mb)
+            else:
+                prune_transcript_cache(args.max_mb, args.older_than)
+        elif args.action == 'clear':
+            what = 'stored audio streams' if args.audio else 'cached transcripts'
+            if not args.yes:
+                response = input(f"⚠️  Delete all {what}? (y/n): ")
+                if response.lower() != 'y':
+                    print("   Cancelled")
+                    return
+            prune_audio_store(max_mb=0) if args.audio else prune_transcript_cache(max_mb=0)
+        return
+    
+    # Inference settings can be edited without Whisper installed
+    if args.command == 'config':
+        if args.action == 'show':
+            show_config(get_whisper_type())
+        elif not args.settings:
+            parser.error(f"config {args.action} needs at least one setting")
+        elif not (update_config(args.settings) if args.action == 'set' else update_config(unset=args.settings)):
+            sys.exit(1)
+        return
+    
+    # Check if Whisper is installed (list-remote and info only describe models)
     whisper_type = get_whisper_type()
-    if not whisper_type:
+    if not whisper_type and args.command not in ('list-remote', 'info'):
         print("❌ Error: Whisper not installed")
         print("   Install with: ./setup.sh")
         print("   Or manually: pip install openai-whisper")
         sys.exit(1)
     
-    print(f"🔍 Detected Whisper: {whisper_type}-whisper\n")
+    if whisper_type:
+        print(f"🔍 Detected Whisper: {whisper_type}-whisper\n")
     
     # Execute command
     if args.command == 'list':
@@ -389,12 +857,20 @@ Examples:
             print("INSTALLED MODELS")
             print("=" * 70)
             print()
+            import model_store
+            import host_profile
+            prepared = {m['name'] for m in model_store.list_prepared() if m['backend'] == whisper_type}
+            profile = host_profile.load()
             total_size = 0
             for model in installed:
                 size_str = f"{model['size_mb']:.1f} MB"
-                # Mark active model
-                marker = " ← active" if active_model and model['name'] == active_model else ""
-                print(f"✓ {model['name']:8} - {size_str:>10}{marker}")
+                # Measured speed on this host, if known
+                measured = host_profile.get_model(profile, model['name'], whisper_type)
+                speed_str = f"RTF {measured['rtf']:.2f}" if measured.get('rtf') else "not measured"
+                # Mark active and prepared models
+                marker = " (prepared)" if model['name'] in prepared else ""
+                marker += " ← active" if active_model and model['name'] == active_model else ""
+                print(f"✓ {model['name']:8} - {size_str:>10}  {speed_str:<12}{marker}")
                 total_size += model['size_mb']
             print()
             print(f"Total: {total_size:.1f} MB")
@@ -410,6 +886,10 @@ Examples:
             print()
             print("💡 To download more models:")
             print("   python3 whisper_manager.py download <model_name>")
+            print("💡 For fast, shared loading across workers:")
+            print("   python3 whisper_manager.py prepare <model_name>")
+            print("💡 To measure models on this host:")
+            print("   python3 whisper_manager.py calibrate")
             print("💡 To delete a model:")
             print("   python3 whisper_manager.py delete <model_name>")
     
@@ -435,6 +915,9 @@ Examples:
     elif args.command == 'download':
         download_model(args.model, whisper_type)
     
+    elif args.command == 'prepare':
+        prepare_model(args.model or get_active_model() or 'base', whisper_type, args.compute_type)
+    
     elif args.command == 'delete':
         if not args.yes:
             print(f"⚠️  This will delete the '{args.model}' model")
@@ -446,7 +929,12 @@ Examples:
         delete_model(args.model, whisper_type)
     
     elif args.command == 'info':
-        show_model_info(args.model)
+        show_model_info(args.model, whisper_type)
+    
+    elif args.command == 'calibrate':
+        if not calibrate_models(whisper_type, args.models, args.threads, args.compute_types,
+                                args.audio, args.timeout):
+            sys.exit(1)
 
 
 if __name__ == "__main__":
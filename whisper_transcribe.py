@@ -6,30 +6,41 @@ For videos WITHOUT captions - uses local AI transcription
 
 import argparse
 import os
+import shutil
+import subprocess
 import sys
 import tempfile
 from pathlib import Path
 
-try:
-    import whisper
-    WHISPER_TYPE = "openai"
-except ImportError:
-    try:
-        from faster_whisper import WhisperModel
-        WHISPER_TYPE = "faster"
-    except ImportError:
+import audio_store
+import inference_config
+import metrics
+import model_pool
+import model_store
+import transcript_cache
+import whisper_daemon
+from whisper_manager import get_whisper_type
+
+# openai-whisper is preferred; WHISPER_BACKEND=faster picks faster-whisper when both are installed.
+# Only looked up here: the backend (and torch) is imported when a model is loaded
+WHISPER_TYPE = get_whisper_type()
+
+
+def check_dependencies():
+    """Exit with install instructions if Whisper or yt-dlp is missing"""
+    from importlib.util import find_spec
+    
+    if WHISPER_TYPE is None:
         print("❌ Error: Whisper not installed. Install with:")
         print("   pip install -U openai-whisper")
         print("   OR")
         print("   pip install -U faster-whisper")
         sys.exit(1)
-
-try:
-    import yt_dlp
-except ImportError:
-    print("❌ Error: yt-dlp not installed. Install with:")
-    print("   pip install yt-dlp")
-    sys.exit(1)
+    
+    if find_spec('yt_dlp') is None:
+        print("❌ Error: yt-dlp not installed. Install with:")
+        print("   pip install yt-dlp")
+        sys.exit(1)
 
 
 def sanitize_url(url):
@@ -40,91 +51,366 @@ def sanitize_url(url):
     return url.replace('\\', '')
 
 
-def download_audio(url, output_dir):
+# Local files accepted in batch mode (--input-dir)
+AUDIO_EXTENSIONS = {'.wav', '.mp3', '.m4a', '.flac', '.ogg', '.opus', '.webm', '.mp4', '.aac', '.mkv'}
+
+
+# Whisper models expect 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+
+def fetch_audio(url, output_dir=None, wav=False, info=None, pin=False):
+    """Download audio from YouTube video using yt-dlp, returning (audio_file, info)
+
+    audio_file is the original stream in the shared audio store, so a video that
+    was already converted or transcribed is not downloaded again. With wav=True
+    a full-rate WAV copy is also written to output_dir and returned instead
+    (debugging only: it costs an extra decode and a lot of disk I/O).
+    info may be the video's already extracted info dict, saving a metadata fetch.
+    pin=True keeps the stored stream from being evicted by other downloads in
+    this process until it is passed to audio_store.release().
+    Raises on failure so callers can decide whether an error is fatal.
+    """
+    stored, info = audio_store.ensure_audio(url, info, pin=pin and not wav)
+    if not wav:
+        return str(stored), info
+    
+    audio_file = os.path.join(output_dir, 'audio.wav')
+    with metrics.stage('decode'):
+        subprocess.run(
+            ['ffmpeg', '-nostdin', '-y', '-loglevel', 'error', '-i', str(stored), '-vn', audio_file],
+            check=True,
+        )
+    
+    if not os.path.exists(audio_file):
+        raise FileNotFoundError(f"Audio file not found: {audio_file}")
+    
+    return audio_file, info
+
+
+def decode_audio(audio_file, sample_rate=SAMPLE_RATE):
+    """Decode any audio/video container to a mono float32 array in one ffmpeg pass
+
+    ffmpeg resamples straight to the model's rate and pipes raw samples to
+    stdout, so no intermediate file is written.
+    """
+    import numpy as np
+    
+    cmd = [
+        'ffmpeg', '-nostdin', '-loglevel', 'error',
+        '-i', str(audio_file),
+        '-vn', '-ac', '1', '-ar', str(sample_rate),
+        '-f', 'f32le', '-acodec', 'pcm_f32le', '-',
+    ]
+    try:
+        with metrics.stage('decode'):
+            output = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='replace').strip()}") from e
+    
+    audio = np.frombuffer(output, dtype=np.float32)
+    metrics.add('audio_duration', len(audio) / sample_rate)
+    return audio
+
+
+def download_audio(url, output_dir, wav=False):
     """Download audio from YouTube video using yt-dlp"""
     print(f"📥 Downloading audio from: {url}")
     
-    output_template = os.path.join(output_dir, 'audio')
-    
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'outtmpl': output_template + '.%(ext)s',
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'wav',
-            'preferredquality': '192',
-        }],
-        'quiet': False,
-        'no_warnings': False,
-    }
-    
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            audio_file = output_template + '.wav'
-            
-            if not os.path.exists(audio_file):
-                raise FileNotFoundError(f"Audio file not found: {audio_file}")
-            
-            return audio_file, info.get('title', 'Unknown')
+        audio_file, info = fetch_audio(url, output_dir, wav)
+        return audio_file, info.get('title', 'Unknown')
     except Exception as e:
         print(f"❌ Error downloading audio: {e}")
         sys.exit(1)
 
 
-def transcribe_audio(audio_file, model_name="base", language=None):
-    """Transcribe audio using Whisper"""
+def load_model(model_name, cpu_threads=None, compute_type=None, num_workers=None):
+    """Load a Whisper model using the installed backend
+
+    cpu_threads > 0 limits the threads used for inference (0 = library default).
+    compute_type and num_workers only apply to faster-whisper. Settings left as
+    None come from inference_config: --cpu-threads/--compute-type/--num-workers,
+    the config file, `whisper_manager.py calibrate` results for this host, or
+    the automatic defaults (all available CPUs, int8, one worker).
+    Models prepared with `whisper_manager.py prepare` are loaded from the prepared
+    store: memory-mapped for openai-whisper (so concurrent workers share the
+    weights), from a local snapshot for faster-whisper.
+    """
+    if WHISPER_TYPE is None:
+        raise RuntimeError("Whisper not installed (pip install -U openai-whisper or faster-whisper)")
+    settings = inference_config.resolve(model_name, WHISPER_TYPE)
+    if cpu_threads is None:
+        cpu_threads = settings['cpu_threads']
+    if compute_type is None:
+        compute_type = settings['compute_type']
+    if num_workers is None:
+        num_workers = settings['num_workers']
+
+    with metrics.stage('model_load'):
+        if WHISPER_TYPE == "openai":
+            import torch
+            import whisper
+            if cpu_threads:
+                torch.set_num_threads(cpu_threads)
+            if torch.cuda.is_available():
+                model = model_store.load_openai(model_name, 'float16', device='cuda')
+            else:
+                model = model_store.load_openai(model_name, 'float32')
+            return model if model is not None else whisper.load_model(model_name)
+        from faster_whisper import WhisperModel
+        model_path = model_store.faster_model_path(model_name) or model_name
+        return WhisperModel(model_path, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads,
+                            num_workers=max(1, num_workers))
+
+
+def use_model(model_name, compute_type=None, replica=0):
+    """Borrow a model from the process-wide model pool, loading it on first use
+
+    Models stay resident across calls (within the pool's RAM budget), so a batch
+    or a long-running service loads each model once. replica > 0 asks for an extra
+    copy, for callers that transcribe with the same model in parallel.
+    """
+    if WHISPER_TYPE == "openai":
+        import torch
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        compute_type = 'float16' if device == 'cuda' else 'float32'
+    else:
+        device = 'cpu'
+        if compute_type is None:
+            compute_type = inference_config.resolve(model_name, WHISPER_TYPE)['compute_type']
+    return model_pool.get_pool().use(model_name, WHISPER_TYPE, device, compute_type, replica)
+
+
+def record_vad(duration, speech):
+    """Count audio seen and speech kept by the VAD pass; returns the result's 'vad' entry"""
+    metrics.add('vad_input_duration', duration)
+    metrics.add('speech_duration', speech)
+    return {'duration': round(duration, 3), 'speech': round(speech, 3)}
+
+
+def transcribe_segments(model, audio_file, language=None, vad_filter=False):
+    """Start transcribing and return (language, segments) with segments as an iterator
+
+    With faster-whisper the iterator is lazy: each segment is decoded only when
+    it is requested, so callers can write it out immediately. openai-whisper has
+    no incremental API, so its segments become available all at once.
+    audio_file may be a path (decoded with decode_audio()) or a 16 kHz array.
+    vad_filter transcribes only the detected speech; timestamps still refer to
+    the original audio.
+    """
+    if isinstance(audio_file, (str, Path)):
+        audio_file = decode_audio(audio_file)
+    
+    if WHISPER_TYPE == "openai":
+        result = run_transcription(model, audio_file, language, vad_filter)
+        return result.get('language', language), iter(result['segments'])
+    
+    detected, segments, _ = _start_faster(model, audio_file, language, vad_filter)
+    return detected, segments
+
+
+def _start_faster(model, audio, language, vad_filter):
+    """Start a faster-whisper transcription: (language, segment iterator, vad entry or None)
+
+    faster-whisper runs its own (Silero) VAD and remaps the timestamps itself.
+    With a batch_size setting, the audio is cut into chunks (at speech regions
+    with VAD, else every 30 s) that are decoded batch_size at a time by
+    BatchedInferencePipeline, so one long file keeps every core busy.
+    """
+    settings = inference_config.resolve(backend=WHISPER_TYPE)
+    options = {'language': language, 'task': "transcribe", 'vad_filter': vad_filter}
+    options.update(inference_config.decoding_options(WHISPER_TYPE, settings))
+    
+    with metrics.stage('inference'):
+        if settings['batch_size']:
+            try:
+                from faster_whisper import BatchedInferencePipeline
+            except ImportError:
+                raise RuntimeError("batched inference needs faster-whisper >= 1.1 (pip install -U faster-whisper)")
+            if not vad_filter:
+                # Without VAD the pipeline needs the chunks spelled out (in samples)
+                window = 30 * SAMPLE_RATE
+                options['clip_timestamps'] = [
+                    {'start': start, 'end': min(start + window, len(audio))}
+                    for start in range(0, len(audio), window)
+                ]
+            segments, info = BatchedInferencePipeline(model=model).transcribe(
+                audio, batch_size=settings['batch_size'], **options
+            )
+        else:
+            segments, info = model.transcribe(audio, **options)
+    detected = info.language if hasattr(info, 'language') else language or 'en'
+    vad_entry = None
+    if vad_filter and getattr(info, 'duration_after_vad', None) is not None:
+        vad_entry = record_vad(info.duration, info.duration_after_vad)
+    return detected, _timed_segments(segments), vad_entry
+
+
+def _timed_segments(segments):
+    """Yield faster-whisper segments as dicts, counting decode time as inference"""
+    segments = iter(segments)
+    while True:
+        with metrics.stage('inference'):
+            segment = next(segments, None)
+        if segment is None:
+            return
+        yield {
+            'start': segment.start,
+            'end': segment.end,
+            'text': segment.text
+        }
+
+
+def run_transcription(model, audio_file, language=None, vad_filter=False):
+    """Transcribe audio with an already-loaded model (openai-whisper result format)
+
+    audio_file may be a path (decoded here with decode_audio()) or an already
+    decoded 16 kHz float32 array. With vad_filter only the speech is transcribed
+    (vad.py for openai-whisper, the built-in filter for faster-whisper), and the
+    result gets a 'vad' entry with the seconds of audio and of speech.
+    """
+    if isinstance(audio_file, (str, Path)):
+        audio_file = decode_audio(audio_file)
+    
+    if WHISPER_TYPE == "openai":
+        transcribe_options = {
+            'verbose': False,
+            'task': 'transcribe',
+        }
+        
+        if language:
+            transcribe_options['language'] = language
+        transcribe_options.update(inference_config.decoding_options(WHISPER_TYPE))
+        
+        if not vad_filter:
+            with metrics.stage('inference'):
+                return model.transcribe(audio_file, **transcribe_options)
+        
+        import vad
+        regions = vad.detect_speech_regions(audio_file, SAMPLE_RATE)
+        speech, offsets = vad.collect_speech(audio_file, regions, SAMPLE_RATE)
+        vad_entry = record_vad(len(audio_file) / SAMPLE_RATE, len(speech) / SAMPLE_RATE)
+        if not offsets:
+            return {'text': '', 'segments': [], 'language': language, 'vad': vad_entry}
+        
+        with metrics.stage('inference'):
+            result = model.transcribe(speech, **transcribe_options)
+        result['segments'] = vad.remap_segments(result['segments'], offsets)
+        result['vad'] = vad_entry
+        return result
+    
+    # Convert faster-whisper format to openai-whisper format
+    detected, segments, vad_entry = _start_faster(model, audio_file, language, vad_filter)
+    segments = list(segments)
+    result = {
+        'text': ''.join(segment['text'] for segment in segments),
+        'segments': segments,
+        'language': detected
+    }
+    if vad_entry:
+        result['vad'] = vad_entry
+    return result
+
+
+def stream_transcript(audio_file, model_name, output_file, format_type="timestamped", language=None,
+                      vad_filter=True):
+    """Transcribe in-process, writing each segment to output_file and stdout as it is decoded
+
+    Returns a summary dict (language, segments, words, duration) instead of the
+    full result, so memory stays flat on multi-hour audio.
+    """
+    print(f"\n🎙️  Loading Whisper model: {model_name}")
+    with use_model(model_name) as model, TranscriptWriter(output_file, format_type) as writer:
+        print(f"✓ Model loaded successfully ({WHISPER_TYPE}-whisper)")
+        print(f"\n🔄 Streaming transcript to: {output_file}\n")
+        detected, segments = transcribe_segments(model, audio_file, language, vad_filter)
+        for segment in segments:
+            writer.write(segment)
+            start = format_timestamp(segment['start'])
+            end = format_timestamp(segment['end'])
+            print(f"[{start} - {end}] {segment['text'].strip()}", flush=True)
+    
+    return {
+        'language': detected,
+        'segments': writer.count,
+        'words': writer.words,
+        'duration': writer.duration,
+    }
+
+
+def request_daemon_transcription(audio_file, model_name, language=None, vad_filter=False):
+    """Transcribe via the running whisper daemon (None if it is not running)
+
+    Decoding happens in the daemon, so the audio duration for metrics is taken
+    from the VAD pass, or else from the end of the last segment.
+    """
+    with metrics.stage('inference'):
+        result = whisper_daemon.request_transcription(audio_file, model_name, language, vad_filter=vad_filter)
+    if result and result.get('vad'):
+        record_vad(result['vad']['duration'], result['vad']['speech'])
+        metrics.add('audio_duration', result['vad']['duration'])
+    elif result and result.get('segments'):
+        metrics.add('audio_duration', result['segments'][-1]['end'])
+    return result
+
+
+def transcribe_audio(audio_file, model_name="base", language=None, use_daemon=True, vad_filter=True):
+    """Transcribe audio using Whisper (via the model daemon when it is running)
+
+    vad_filter skips silence (and, with faster-whisper, most music) before
+    transcribing; timestamps still refer to the original audio. The daemon is
+    skipped when inference settings were overridden for this process.
+    """
+    if use_daemon and not inference_config.get_overrides():
+        try:
+            result = request_daemon_transcription(audio_file, model_name, language, vad_filter)
+        except RuntimeError as e:
+            print(f"⚠️  Whisper daemon failed, transcribing in-process: {e}")
+            result = None
+        if result is not None:
+            print(f"\n⚡ Transcribed by running whisper daemon (model: {model_name})")
+            return result
+    
     print(f"\n🎙️  Loading Whisper model: {model_name}")
     print("   (First run will download the model)")
     
     try:
-        if WHISPER_TYPE == "openai":
-            # Using openai-whisper
-            model = whisper.load_model(model_name)
-            print(f"✓ Model loaded successfully (openai-whisper)")
+        with use_model(model_name) as model:
+            print(f"✓ Model loaded successfully ({WHISPER_TYPE}-whisper)")
             
             print(f"\n🔄 Transcribing audio... (this may take a few minutes)")
-            
-            transcribe_options = {
-                'verbose': False,
-                'task': 'transcribe',
-            }
-            
-            if language:
-                transcribe_options['language'] = language
-            
-            result = model.transcribe(audio_file, **transcribe_options)
-            
-        else:
-            # Using faster-whisper
-            model = WhisperModel(model_name, device="cpu", compute_type="int8")
-            print(f"✓ Model loaded successfully (faster-whisper)")
-            
-            print(f"\n🔄 Transcribing audio... (this may take a few minutes)")
-            
-            segments, info = model.transcribe(audio_file, language=language, task="transcribe")
-            
-            # Convert faster-whisper format to openai-whisper format
-            result = {
-                'text': '',
-                'segments': [],
-                'language': info.language if hasattr(info, 'language') else language or 'en'
-            }
-            
-            for segment in segments:
-                result['segments'].append({
-                    'start': segment.start,
-                    'end': segment.end,
-                    'text': segment.text
-                })
-                result['text'] += segment.text
-        
-        return result
+            return run_transcription(model, audio_file, language, vad_filter)
     except Exception as e:
         print(f"❌ Error during transcription: {e}")
         sys.exit(1)
 
 
+def make_transcriber(model_name="base", language=None, use_daemon=True, replica=0, vad_filter=True):
+    """Return a transcribe(audio_file) callable that loads the model at most once
+
+    The running whisper daemon is preferred; the model is only loaded in-process
+    the first time the daemon is unavailable, and then stays in the model pool.
+    Callers transcribing in parallel pass a distinct replica each, so every
+    worker gets its own copy. Errors are raised, not fatal. As in
+    transcribe_audio(), overridden inference settings bypass the daemon.
+    """
+    def transcribe(audio_file):
+        if use_daemon and not inference_config.get_overrides():
+            try:
+                result = request_daemon_transcription(audio_file, model_name, language, vad_filter)
+                if result is not None:
+                    return result
+            except RuntimeError as e:
+                print(f"⚠️  Whisper daemon failed, transcribing in-process: {e}")
+        
+        with use_model(model_name, replica=replica) as model:
+            print(f"🔄 Transcribing audio...")
+            return run_transcription(model, audio_file, language, vad_filter)
+    
+    return transcribe
+
+
 def format_timestamp(seconds):
     """Convert seconds to HH:MM:SS format"""
     hours = int(seconds // 3600)
@@ -139,38 +425,23 @@ def format_timestamp(seconds):
 def save_transcript(result, output_file, format_type="text"):
     """Save transcript to file in various formats"""
     
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with metrics.stage('save'):
         if format_type == "text":
             # Plain text without timestamps
-            f.write(result['text'].strip())
-        
-        elif format_type == "timestamped":
-            # Text with timestamps
-            f.write("=" * 60 + "\n")
-            f.write("TIMESTAMPED TRANSCRIPT\n")
-            f.write("=" * 60 + "\n\n")
-            
-            for segment in result['segments']:
-                start = format_timestamp(segment['start'])
-                end = format_timestamp(segment['end'])
-                text = segment['text'].strip()
-                f.write(f"[{start} - {end}] {text}\n")
-        
-        elif format_type == "srt":
-            # SRT subtitle format
-            for i, segment in enumerate(result['segments'], 1):
-                start_time = format_srt_timestamp(segment['start'])
-                end_time = format_srt_timestamp(segment['end'])
-                text = segment['text'].strip()
-                
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{text}\n\n")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(result['text'].strip())
         
         elif format_type == "json":
             # JSON format with full metadata
             import json
-            f.write(json.dumps(result, indent=2, ensure_ascii=False))
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(result, indent=2, ensure_ascii=False))
+        
+        else:
+            # Segment-based formats (timestamped, srt, jsonl)
+            with TranscriptWriter(output_file, format_type) as writer:
+                for segment in result['segments']:
+                    writer.write(segment)
 
 
 def format_srt_timestamp(seconds):
@@ -183,6 +454,69 @@ def format_srt_timestamp(seconds):
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
+class TranscriptWriter:
+    """Write transcript segments to a file one at a time, as they are decoded
+
+    Supports every save_transcript() format except json (use jsonl to stream
+    segments as JSON Lines). Only running counters are kept, so memory use does
+    not grow with the length of the audio.
+    """
+    
+    STREAMING_FORMATS = ('text', 'timestamped', 'srt', 'jsonl')
+    
+    def __init__(self, output_file, format_type="timestamped"):
+        if format_type not in self.STREAMING_FORMATS:
+            raise ValueError(f"Format '{format_type}' cannot be written segment by segment")
+        self.format_type = format_type
+        self.count = 0
+        self.words = 0
+        self.duration = 0
+        self._file = open(output_file, 'w', encoding='utf-8')
+        
+        if format_type == "timestamped":
+            self._file.write("=" * 60 + "\n")
+            self._file.write("TIMESTAMPED TRANSCRIPT\n")
+            self._file.write("=" * 60 + "\n\n")
+    
+    def write(self, segment):
+        """Append one segment ({'start', 'end', 'text', ...}) and flush it to disk"""
+        self.count += 1
+        self.words += len(segment['text'].split())
+        self.duration = segment['end']
+        text = segment['text'].strip()
+        f = self._file
+        
+        if self.format_type == "text":
+            f.write(segment['text'] if self.count > 1 else segment['text'].lstrip())
+        
+        elif self.format_type == "timestamped":
+            start = format_timestamp(segment['start'])
+            end = format_timestamp(segment['end'])
+            f.write(f"[{start} - {end}] {text}\n")
+        
+        elif self.format_type == "srt":
+            start_time = format_srt_timestamp(segment['start'])
+            end_time = format_srt_timestamp(segment['end'])
+            f.write(f"{self.count}\n")
+            f.write(f"{start_time} --> {end_time}\n")
+            f.write(f"{text}\n\n")
+        
+        elif self.format_type == "jsonl":
+            import json
+            f.write(json.dumps(segment, ensure_ascii=False, default=transcript_cache.json_default) + "\n")
+        
+        f.flush()
+    
+    def close(self):
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 def print_transcript_preview(result, max_chars=500):
     """Print a preview of the transcript"""
     text = result['text'].strip()
@@ -192,6 +526,301 @@ def print_transcript_preview(result, max_chars=500):
         print(text)
 
 
+def get_default_model():
+    """Active model from whisper_manager.py config (.whisper-version), or base"""
+    config_file = Path.cwd() / ".whisper-version"
+    if not config_file.exists():
+        config_file = Path.home() / ".whisper-version"
+    
+    if config_file.exists():
+        try:
+            active_model = config_file.read_text().strip()
+            if active_model in ['tiny', 'base', 'small', 'medium', 'large']:
+                print(f"📌 Using active model: {active_model} (set via whisper_manager.py use)")
+                return active_model
+        except Exception:
+            pass
+    
+    # Fallback to default
+    return 'base'
+
+
+def choose_model_for_budget(url, budget, use_daemon=True):
+    """Pick the most accurate installed model expected to finish within budget
+
+    Uses the video duration from its (cached) metadata, the real-time factors
+    measured on this host (host_profile.py), the current load average, and
+    skips load time for models the daemon already has loaded.
+    """
+    import host_profile
+    from whisper_manager import list_installed_models
+    
+    info = audio_store.extract_info(url)
+    duration = info.get('duration')
+    if not duration:
+        raise ValueError("video duration is unknown")
+    
+    candidates = [model['name'] for model in list_installed_models(WHISPER_TYPE)] or None
+    resident = ()
+    if use_daemon:
+        try:
+            status = whisper_daemon.send_request({'op': 'status'}, timeout=2)
+            resident = status.get('models', ()) if status else ()
+        except (OSError, ValueError):
+            pass
+    
+    profile = host_profile.load()
+    model_name, expected, deadline, fits = host_profile.select_model(
+        duration, budget, WHISPER_TYPE, candidates, profile, resident
+    )
+    _, measured = host_profile.get_rtf(profile, model_name, WHISPER_TYPE)
+    source = "measured" if measured else "estimated, run whisper_manager.py calibrate"
+    if fits:
+        print(f"🎯 Auto model: {model_name} (~{expected:.0f}s expected for {format_timestamp(duration)} "
+              f"of audio, budget {deadline:.0f}s; RTF {source})")
+    else:
+        print(f"⚠️  No model fits the {deadline:.0f}s budget; using fastest: {model_name} "
+              f"(~{expected:.0f}s expected; RTF {source})")
+    return model_name
+
+
+def record_host_performance(model_name, parallel=False):
+    """Feed this run's measured real-time factor into the host profile
+
+    Only in-process runs count: daemon runs include queueing and decoding in
+    their timing, and parallel runs spread inference across processes.
+    """
+    import host_profile
+    
+    report = metrics.report()
+    if not report or parallel or 'model_load' not in report['stages']:
+        return
+    if report.get('realtime_factor'):
+        host_profile.record_observation(model_name, WHISPER_TYPE, report['realtime_factor'],
+                                        report['stages']['model_load'])
+
+
+def try_captions(url, policy="manual", languages=None, info=None):
+    """Transcript from the video's existing captions if the policy accepts a track
+
+    Returns None when Whisper is needed. Unless info is given, the metadata comes
+    from the metadata cache, so the audio download that may follow does not
+    extract it again.
+    """
+    import captions
+    
+    if policy == 'off':
+        return None
+    try:
+        info = info or audio_store.extract_info(url)
+    except Exception as e:
+        print(f"⚠️  Could not check captions: {e}")
+        return None
+    result = captions.get_transcript(info, policy, languages)
+    if result is not None:
+        metrics.add('caption_hits', 1)
+        print(f"📝 Using {result['source']}; skipping Whisper")
+    return result
+
+
+def get_cache_key(source, model_name, language=None, vad_filter=True):
+    """Transcript cache key (and its parts) for a source transcribed by this backend
+    
+    Non-default decoding options (--preset, --beam-size) are part of the key.
+    """
+    decoding = inference_config.decoding_options(WHISPER_TYPE) if WHISPER_TYPE else {}
+    return transcript_cache.make_key(source, model_name, WHISPER_TYPE, language, vad=vad_filter,
+                                     decoding=decoding or None)
+
+
+def find_existing_transcript(url, model_name, language=None, vad_filter=True, use_cache=True,
+                             caption_policy="manual", caption_languages=None, info=None):
+    """A transcript that needs no inference, from the transcript cache or the video's captions
+
+    Returns (result or None, cache_key or None); the key is where a new
+    transcript of this video should be cached.
+    """
+    result = None
+    cache_key = None
+    video_id = transcript_cache.extract_video_id(url) or (info or {}).get('id')
+    if video_id and use_cache:
+        cache_key = get_cache_key(video_id, model_name, language, vad_filter)
+        result = transcript_cache.get(cache_key[0])
+        if result is not None:
+            metrics.add('cache_hits', 1)
+            print(f"⚡ Using cached transcript (video {video_id}, model {model_name})")
+    if result is None:
+        result = try_captions(url, caption_policy, caption_languages, info)
+    return result, cache_key
+
+
+def transcribe_url(url, model_name=None, language=None, output_file=None, format_type="timestamped",
+                   use_daemon=True, use_cache=True, vad_filter=True, caption_policy="manual",
+                   caption_languages=None, parallel=None, chunk_length=60.0, info=None, wav_dir=None):
+    """Transcribe one video in-process and return the result dict (library API)
+
+    The transcript cache and the video's own captions are tried first; Whisper
+    only runs when neither has a transcript. info is the video's info dict if
+    the caller already extracted it, so metadata is not fetched again. With
+    output_file the transcript is also saved in format_type. parallel=N splits
+    the audio across N worker processes (0 = one per core). wav_dir writes and
+    transcribes an intermediate WAV there (debugging). Raises on failure.
+    """
+    model_name = model_name or get_default_model()
+    result, cache_key = find_existing_transcript(
+        url, model_name, language, vad_filter, use_cache, caption_policy, caption_languages, info
+    )
+    
+    if result is None:
+        print(f"📥 Downloading audio from: {url}")
+        audio_file, info = fetch_audio(url, wav_dir, bool(wav_dir), info, pin=True)
+        print(f"✓ Audio downloaded: {info.get('title', 'Unknown')}")
+        
+        try:
+            if parallel is not None:
+                import parallel_transcribe
+                result = parallel_transcribe.transcribe_parallel(
+                    audio_file, model_name, language,
+                    workers=parallel or None,
+                    chunk_length=chunk_length,
+                    vad_filter=vad_filter,
+                )
+            else:
+                result = make_transcriber(model_name, language, use_daemon, vad_filter=vad_filter)(audio_file)
+        finally:
+            audio_store.release(audio_file)
+        print(f"✓ Transcription complete!")
+        
+        if cache_key:
+            transcript_cache.put(*cache_key, result)
+    
+    if output_file:
+        save_transcript(result, output_file, format_type)
+        print(f"\n✓ Transcript saved to: {output_file}")
+    return result
+
+
+def get_output_extension(format_type):
+    """File extension for a save_transcript() format"""
+    return {'srt': 'srt', 'json': 'json', 'jsonl': 'jsonl'}.get(format_type, 'txt')
+
+
+def read_batch_inputs(batch_file=None, input_dir=None):
+    """Collect batch inputs: URLs from a list file (or '-' for stdin) and local audio files"""
+    inputs = []
+    
+    if batch_file:
+        if batch_file == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            lines = Path(batch_file).read_text(encoding='utf-8').splitlines()
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                inputs.append(line)
+    
+    if input_dir:
+        for path in sorted(Path(input_dir).iterdir()):
+            if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS:
+                inputs.append(str(path))
+    
+    return inputs
+
+
+def transcribe_batch(inputs, model_name="base", language=None, format_type="timestamped",
+                     output_dir=None, use_daemon=True, keep_audio=False, use_cache=True, wav=False,
+                     vad_filter=True, caption_policy="manual", caption_languages=None):
+    """Transcribe many URLs/local files, loading the model only once
+
+    Each input gets its own output file in output_dir, named after the video ID
+    (URLs) or the file name (local audio). Inputs already in the transcript cache
+    are neither downloaded nor transcribed, and videos with captions accepted by
+    caption_policy (see try_captions()) are not transcribed. Returns a list of (input, error) for
+    inputs that failed; the remaining inputs are still processed.
+    """
+    if output_dir is None:
+        output_dir = os.getcwd()
+    os.makedirs(output_dir, exist_ok=True)
+    ext = get_output_extension(format_type)
+    
+    transcribe = make_transcriber(model_name, language, use_daemon, vad_filter=vad_filter)
+    failures = []
+    
+    for index, item in enumerate(inputs, 1):
+        print(f"\n{'=' * 60}")
+        print(f"[{index}/{len(inputs)}] {item}")
+        print("=" * 60)
+        
+        temp_dir = None
+        try:
+            result = None
+            cache_key = None
+            
+            if os.path.isfile(item):
+                audio_file = item
+                output_name = Path(item).stem
+                if use_cache:
+                    cache_key = get_cache_key(transcript_cache.file_source(item), model_name, language, vad_filter)
+            else:
+                url = sanitize_url(item)
+                video_id = transcript_cache.extract_video_id(url)
+                output_name = video_id or f"transcript_{index}"
+                if use_cache and video_id:
+                    cache_key = get_cache_key(video_id, model_name, language, vad_filter)
+            
+            if cache_key:
+                result = transcript_cache.get(cache_key[0])
+                if result is not None:
+                    metrics.add('cache_hits', 1)
+                    print("⚡ Using cached transcript")
+            
+            if result is None and not os.path.isfile(item):
+                result = try_captions(url, caption_policy, caption_languages)
+            
+            if result is None:
+                if not os.path.isfile(item):
+                    if wav:
+                        temp_dir = tempfile.mkdtemp(prefix='whisper_transcribe_')
+                    print(f"📥 Downloading audio from: {url}")
+                    audio_file, info = fetch_audio(url, temp_dir, wav)
+                    print(f"✓ Audio downloaded: {info.get('title', 'Unknown')}")
+                    output_name = info.get('id') or output_name
+                    if use_cache and not cache_key and info.get('id'):
+                        cache_key = get_cache_key(info['id'], model_name, language, vad_filter)
+                
+                result = transcribe(audio_file)
+                if cache_key:
+                    transcript_cache.put(*cache_key, result)
+            
+            output_file = os.path.join(output_dir, f"{output_name}.{ext}")
+            save_transcript(result, output_file, format_type)
+            print(f"✓ Transcript saved to: {output_file}")
+        except Exception as e:
+            print(f"❌ Failed: {e}")
+            failures.append((item, str(e)))
+        finally:
+            if temp_dir and not keep_audio:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    return failures
+
+
+def write_metrics(metrics_file=None, prometheus_file=None):
+    """Write the run's per-stage metrics as a JSON sidecar and/or Prometheus textfile"""
+    report = metrics.report()
+    if report is None or not (metrics_file or prometheus_file):
+        return
+    try:
+        if metrics_file:
+            metrics.write_json(report, metrics_file)
+            print(f"📈 Metrics saved to: {metrics_file}")
+        if prometheus_file:
+            metrics.write_prometheus(report, prometheus_file)
+            print(f"📈 Prometheus metrics saved to: {prometheus_file}")
+    except OSError as e:
+        print(f"⚠️  Could not write metrics: {e}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Transcribe YouTube videos using Whisper AI (for videos without captions)",
@@ -201,6 +830,16 @@ Examples:
   %(prog)s "https://www.youtube.com/watch?v=VIDEO_ID"
   %(prog)s "https://youtu.be/VIDEO_ID" -m medium -o transcript.txt
   %(prog)s "VIDEO_URL" -f srt -l en
+  %(prog)s "VIDEO_URL" --stream -f jsonl
+  %(prog)s "VIDEO_URL" --captions any --caption-langs en
+  %(prog)s "LECTURE_URL" --parallel 8 -m small
+  %(prog)s "VIDEO_URL" -m auto --budget 5m
+  %(prog)s --batch urls.txt --output-dir transcripts/
+  cat urls.txt | %(prog)s --batch - -f srt
+  %(prog)s --input-dir recordings/ -m small -f text
+  %(prog)s "VIDEO_URL" --metrics run.json --prometheus /var/lib/node_exporter/yttool.prom
+  %(prog)s "LECTURE_URL" --batch-size 16 --cpu-threads 16 --compute-type int8
+  %(prog)s --batch urls.txt --preset fast
   
 Model sizes (speed vs accuracy):
   tiny   - Fastest, least accurate (~1GB RAM)
@@ -213,7 +852,7 @@ Supported languages: en, es, fr, de, it, pt, nl, pl, ru, zh, ja, ko, and 90+ mor
         """
     )
     
-    parser.add_argument('url', help='YouTube video URL or video ID')
+    parser.add_argument('url', nargs='?', help='YouTube video URL or video ID')
     parser.add_argument(
         '-o', '--output',
         default=None,
@@ -221,15 +860,22 @@ Supported languages: en, es, fr, de, it, pt, nl, pl, ru, zh, ja, ko, and 90+ mor
     )
     parser.add_argument(
         '-m', '--model',
-        choices=['tiny', 'base', 'small', 'medium', 'large'],
+        choices=['tiny', 'base', 'small', 'medium', 'large', 'auto'],
         default=None,
-        help='Whisper model size (default: base, or active model from whisper_manager.py use)'
+        help='Whisper model size (default: base, or active model from whisper_manager.py use); '
+             'auto picks the most accurate model that fits --budget'
+    )
+    parser.add_argument(
+        '--budget',
+        metavar='SECONDS|Nx',
+        help='Latency budget for --model auto: seconds (300, 5m, 1h) or a multiple of the '
+             'video duration (0.5x). Default: 1x'
     )
     parser.add_argument(
         '-f', '--format',
-        choices=['text', 'timestamped', 'srt', 'json'],
+        choices=['text', 'timestamped', 'srt', 'json', 'jsonl'],
         default='timestamped',
-        help='Output format (default: timestamped)'
+        help='Output format (default: timestamped; jsonl = one JSON segment per line)'
     )
     parser.add_argument(
         '-l', '--language',
@@ -238,88 +884,335 @@ Supported languages: en, es, fr, de, it, pt, nl, pl, ru, zh, ja, ko, and 90+ mor
     parser.add_argument(
         '--no-cleanup',
         action='store_true',
-        help='Keep downloaded audio file (for debugging)'
+        help='Keep the temporary WAV file written by --wav (for debugging)'
+    )
+    parser.add_argument(
+        '--wav',
+        action='store_true',
+        help='Write an intermediate WAV file and transcribe from it (debugging; '
+             'by default audio is decoded straight to 16 kHz in memory)'
+    )
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Always load the model in-process, even if whisper_daemon.py is running'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Write each segment to the output file and terminal as soon as it is decoded '
+             '(text, timestamped, srt or jsonl formats)'
+    )
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        metavar='N',
+        help='Split long audio at silences and transcribe chunks in N worker processes '
+             '(0 = one per CPU core; each worker loads its own model)'
+    )
+    parser.add_argument(
+        '--chunk-length',
+        type=float,
+        default=60.0,
+        metavar='SECONDS',
+        help='Target chunk length for --parallel (default: 60)'
+    )
+    parser.add_argument(
+        '--captions',
+        choices=['off', 'manual', 'any'],
+        default='manual',
+        help="Use the video's own captions instead of Whisper when acceptable: manual "
+             "(uploaded tracks only, default), any (automatic captions too) or off"
+    )
+    parser.add_argument(
+        '--caption-langs',
+        nargs='+',
+        metavar='LANG',
+        help="Acceptable caption languages in order of preference (default: -l, "
+             "else the video's own language)"
+    )
+    parser.add_argument(
+        '--no-vad',
+        action='store_true',
+        help='Transcribe the whole audio instead of only the detected speech, as earlier '
+             'versions did (VAD skips dead air and breaks; intro music is only skipped '
+             'with faster-whisper installed)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the transcript cache (~/.cache/yttool/transcripts)'
+    )
+    parser.add_argument(
+        '--metrics',
+        metavar='FILE',
+        help='Write per-stage timings, bytes downloaded, real-time factor and peak RSS as JSON'
+    )
+    parser.add_argument(
+        '--prometheus',
+        metavar='FILE',
+        help='Write the same metrics as a Prometheus textfile (for node_exporter)'
+    )
+    
+    batch_group = parser.add_argument_group('batch mode (model is loaded once for all inputs)')
+    batch_group.add_argument(
+        '--batch',
+        metavar='FILE',
+        help="File with one URL or audio file path per line ('-' reads from stdin)"
+    )
+    batch_group.add_argument(
+        '--input-dir',
+        metavar='DIR',
+        help='Transcribe every audio file in a local directory'
+    )
+    batch_group.add_argument(
+        '--output-dir',
+        metavar='DIR',
+        help='Directory for batch transcripts (default: current directory)'
+    )
+    
+    tuning_group = parser.add_argument_group(
+        'performance tuning (defaults: .whisper-config.json, calibration, then automatic)'
+    )
+    tuning_group.add_argument(
+        '--cpu-threads',
+        type=int,
+        metavar='N',
+        help='Inference threads (default: CPUs available to this process, honouring the cgroup quota; '
+             '0 = library default)'
+    )
+    tuning_group.add_argument(
+        '--num-workers',
+        type=int,
+        metavar='N',
+        help='faster-whisper: concurrent transcriptions one loaded model can run (default: 1)'
+    )
+    tuning_group.add_argument(
+        '--compute-type',
+        choices=inference_config.COMPUTE_TYPES,
+        help='faster-whisper: weight/compute precision (default: int8)'
+    )
+    tuning_group.add_argument(
+        '--preset',
+        choices=list(inference_config.PRESETS),
+        help='Decoding preset: fast (greedy, no fallback), balanced (greedy with temperature fallback) '
+             'or accurate (beam search); default: library defaults'
+    )
+    tuning_group.add_argument(
+        '--beam-size',
+        type=int,
+        metavar='N',
+        help='Beam search width, overriding the preset (default: library default; 1 = greedy)'
+    )
+    tuning_group.add_argument(
+        '--batch-size',
+        type=int,
+        metavar='N',
+        help="faster-whisper: decode N chunks of one file at once with the batched pipeline "
+             "(saturates many-core hosts; default: 0 = off)"
     )
     
     args = parser.parse_args()
+    check_dependencies()
+    
+    tuning = {
+        'cpu_threads': args.cpu_threads,
+        'num_workers': args.num_workers,
+        'compute_type': args.compute_type,
+        'preset': args.preset,
+        'beam_size': args.beam_size,
+        'batch_size': args.batch_size,
+    }
+    try:
+        inference_config.configure(**tuning)
+    except ValueError as e:
+        parser.error(str(e))
+    if WHISPER_TYPE == "openai" and (args.num_workers or args.compute_type or args.batch_size):
+        print("⚠️  --num-workers, --compute-type and --batch-size only apply to faster-whisper; ignored")
+    if inference_config.get_overrides() and not args.no_daemon:
+        # The daemon's models were loaded with its own settings
+        print("⚙️  Tuning options given: transcribing in-process instead of via the whisper daemon")
+        args.no_daemon = True
+    
+    batch_mode = bool(args.batch or args.input_dir)
+    if batch_mode and args.url:
+        parser.error("url cannot be combined with --batch/--input-dir")
+    if not batch_mode and not args.url:
+        parser.error("a url is required (or use --batch/--input-dir)")
+    if batch_mode and args.output:
+        parser.error("use --output-dir instead of --output in batch mode")
+    if args.stream and batch_mode:
+        parser.error("--stream is not supported in batch mode")
+    if args.stream and args.format == 'json':
+        parser.error("--stream cannot write -f json; use -f jsonl instead")
+    if args.parallel is not None and (args.stream or batch_mode):
+        parser.error("--parallel cannot be combined with --stream or batch mode")
+    if args.model == 'auto' and batch_mode:
+        parser.error("--model auto is only supported for a single URL")
+    if args.budget and args.model != 'auto':
+        parser.error("--budget requires --model auto")
+    if args.model == 'auto':
+        import host_profile
+        try:
+            budget = host_profile.parse_budget(args.budget or '1x')
+        except ValueError as e:
+            parser.error(str(e))
+    
+    caption_languages = args.caption_langs or ([args.language] if args.language else None)
+    
+    # Determine which model to use (auto is resolved once the URL is known)
+    model_to_use = args.model or get_default_model()
     
-    # Determine which model to use
-    model_to_use = args.model
-    if model_to_use is None:
-        # Try to get active model from whisper_manager config
-        config_file = Path.cwd() / ".whisper-version"
-        if not config_file.exists():
-            config_file = Path.home() / ".whisper-version"
+    # Always collected (cheap): the measured real-time factor feeds the host profile
+    run_metrics = metrics.start_run({
+        'model': model_to_use,
+        'backend': WHISPER_TYPE,
+        'mode': 'batch' if batch_mode else 'single',
+    })
+    
+    if batch_mode:
+        inputs = read_batch_inputs(args.batch, args.input_dir)
+        if not inputs:
+            print("📭 No inputs found for batch transcription")
+            sys.exit(1)
         
-        if config_file.exists():
-            try:
-                active_model = config_file.read_text().strip()
-                if active_model in ['tiny', 'base', 'small', 'medium', 'large']:
-                    model_to_use = active_model
-                    print(f"📌 Using active model: {active_model} (set via whisper_manager.py use)")
-            except Exception:
-                pass
+        print(f"🚀 Batch transcription of {len(inputs)} inputs with Whisper AI")
+        failures = transcribe_batch(
+            inputs,
+            model_name=model_to_use,
+            language=args.language,
+            format_type=args.format,
+            output_dir=args.output_dir,
+            use_daemon=not args.no_daemon,
+            keep_audio=args.no_cleanup,
+            use_cache=not args.no_cache,
+            wav=args.wav,
+            vad_filter=not args.no_vad,
+            caption_policy=args.captions,
+            caption_languages=caption_languages,
+        )
         
-        # Fallback to default
-        if model_to_use is None:
-            model_to_use = 'base'
+        print(f"\n📊 Batch complete: {len(inputs) - len(failures)}/{len(inputs)} succeeded")
+        for item, error in failures:
+            print(f"   ❌ {item}: {error}")
+        metrics.set_value('items', len(inputs))
+        metrics.set_value('failures', len(failures))
+        write_metrics(args.metrics, args.prometheus)
+        sys.exit(1 if failures else 0)
     
     # Sanitize URL (remove backslash escapes from terminal pasting)
-    sanitized_url = sanitize_url(args.url)
+    with metrics.stage('sanitize_url'):
+        sanitized_url = sanitize_url(args.url)
     if sanitized_url != args.url:
         print(f"🔧 Sanitized URL (removed escape characters)")
     
+    if model_to_use == 'auto':
+        try:
+            model_to_use = choose_model_for_budget(sanitized_url, budget, use_daemon=not args.no_daemon)
+        except Exception as e:
+            model_to_use = get_default_model()
+            print(f"⚠️  Could not choose a model automatically ({e}); using {model_to_use}")
+        run_metrics.labels['model'] = model_to_use
+    
     # Create temp directory for audio download
     temp_dir = tempfile.mkdtemp(prefix='whisper_transcribe_')
+    succeeded = False
     
     try:
         print("🚀 Starting YouTube transcription with Whisper AI\n")
         print("=" * 60)
         
-        # Download audio
-        audio_file, video_title = download_audio(sanitized_url, temp_dir)
-        print(f"✓ Audio downloaded: {video_title}")
-        
-        # Transcribe
-        result = transcribe_audio(audio_file, model_to_use, args.language)
-        print(f"✓ Transcription complete!")
-        
         # Determine output filename
         if args.output:
             output_file = args.output
         else:
             import time
             timestamp = int(time.time())
-            ext = 'srt' if args.format == 'srt' else 'json' if args.format == 'json' else 'txt'
+            ext = get_output_extension(args.format)
             output_file = f"transcript_{timestamp}.{ext}"
         
-        # Save transcript
-        save_transcript(result, output_file, args.format)
-        print(f"\n✓ Transcript saved to: {output_file}")
+        summary = None
+        if args.stream:
+            result, _ = find_existing_transcript(
+                sanitized_url, model_to_use, args.language, not args.no_vad, not args.no_cache,
+                args.captions, caption_languages,
+            )
+            if result is None:
+                audio_file, video_title = download_audio(sanitized_url, temp_dir, args.wav)
+                print(f"✓ Audio downloaded: {video_title}")
+                
+                # Segments are written as they are decoded; nothing is buffered or cached
+                try:
+                    summary = stream_transcript(audio_file, model_to_use, output_file, args.format, args.language,
+                                                vad_filter=not args.no_vad)
+                except Exception as e:
+                    print(f"❌ Error during transcription: {e}")
+                    sys.exit(1)
+                print(f"\n✓ Transcription complete!")
+                print(f"✓ Transcript saved to: {output_file}")
+            else:
+                save_transcript(result, output_file, args.format)
+                print(f"\n✓ Transcript saved to: {output_file}")
+        else:
+            try:
+                result = transcribe_url(
+                    sanitized_url,
+                    model_to_use,
+                    args.language,
+                    output_file,
+                    args.format,
+                    use_daemon=not args.no_daemon,
+                    use_cache=not args.no_cache,
+                    vad_filter=not args.no_vad,
+                    caption_policy=args.captions,
+                    caption_languages=caption_languages,
+                    parallel=args.parallel,
+                    chunk_length=args.chunk_length,
+                    wav_dir=temp_dir if args.wav else None,
+                )
+            except Exception as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
         
-        # Print preview
-        print("\n" + "=" * 60)
-        print("TRANSCRIPT PREVIEW:")
-        print("=" * 60 + "\n")
-        print_transcript_preview(result)
+        if summary is None:
+            # Print preview
+            print("\n" + "=" * 60)
+            print("TRANSCRIPT PREVIEW:")
+            print("=" * 60 + "\n")
+            print_transcript_preview(result)
+            
+            summary = {
+                'words': len(result['text'].split()),
+                'duration': result['segments'][-1]['end'] if result['segments'] else 0,
+                'language': result.get('language'),
+            }
+        
+        record_host_performance(model_to_use, parallel=args.parallel is not None)
         
         # Stats
-        word_count = len(result['text'].split())
-        duration = result['segments'][-1]['end'] if result['segments'] else 0
         print(f"\n\n📊 Stats:")
-        print(f"   Words: {word_count}")
-        print(f"   Duration: {format_timestamp(duration)}")
-        print(f"   Language: {result.get('language', 'auto-detected')}")
+        print(f"   Words: {summary['words']}")
+        print(f"   Duration: {format_timestamp(summary['duration'])}")
+        print(f"   Language: {summary['language'] or 'auto-detected'}")
+        report = metrics.report()
+        if report and report.get('vad_input_duration'):
+            skipped = 1 - report.get('speech_duration', 0) / report['vad_input_duration']
+            print(f"   Skipped (no speech): {skipped:.0%} of {format_timestamp(report['vad_input_duration'])}")
+        succeeded = True
         
     finally:
         # Cleanup
         if not args.no_cleanup:
-            import shutil
             try:
                 shutil.rmtree(temp_dir)
                 print(f"\n🧹 Cleaned up temporary files")
             except Exception as e:
                 print(f"\n⚠️  Could not cleanup temp files: {e}")
+        
+        # Written on failure too, so a failed run still shows where the time went
+        metrics.set_value('items', 1)
+        metrics.set_value('failures', 0 if succeeded else 1)
+        write_metrics(args.metrics, args.prometheus)
 
 
 if __name__ == "__main__":
@@ -8,15 +8,11 @@ import argparse
 import os
 import sys
 import hashlib
-import subprocess
+import itertools
 from pathlib import Path
 
-try:
-    import yt_dlp
-except ImportError:
-    print("❌ Error: yt-dlp not installed. Install with:")
-    print("   pip install yt-dlp")
-    sys.exit(1)
+import audio_store
+import inference_config
 
 
 def sanitize_url(url):
@@ -32,31 +28,44 @@ def generate_short_hash(text):
 
 
 def get_video_info(url):
-    """Get video information using yt-dlp"""
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-    }
-    
+    """Get video information using yt-dlp
+
+    The full info dict is returned as 'info' so the download can reuse it
+    instead of extracting the same metadata again.
+    """
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            return {
-                'title': info.get('title', 'Unknown'),
-                'id': info.get('id', ''),
-                'duration': info.get('duration', 0),
-            }
+        info = audio_store.extract_info(url)
+        return {
+            'title': info.get('title', 'Unknown'),
+            'id': info.get('id', ''),
+            'duration': info.get('duration', 0),
+            'info': info,
+        }
     except Exception as e:
         print(f"⚠️  Could not fetch video info: {e}")
         return {
             'title': 'Unknown',
             'id': '',
             'duration': 0,
+            'info': None,
         }
 
 
-def get_playlist_info(url):
-    """Get playlist information including number of entries"""
+def make_output_filename(url, title, ext):
+    """File name from the sanitized title plus a short hash of URL and title"""
+    safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
+    safe_title = safe_title.replace(' ', '_')[:50]  # Limit length
+    return f"{safe_title}_{generate_short_hash(url + title)}.{ext}"
+
+
+def get_playlist_info(url, refresh=False):
+    """Get playlist information including number of entries
+
+    The flat listing is served from the metadata cache while fresh;
+    refresh=True always fetches the current listing.
+    """
+    import metadata_cache
+
     ydl_opts = {
         'quiet': True,
         'no_warnings': True,
@@ -64,21 +73,53 @@ def get_playlist_info(url):
     }
     
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            if 'entries' in info:
-                entries = list(info['entries'])
-                return {
-                    'title': info.get('title', 'Unknown Playlist'),
-                    'count': len(entries),
-                    'entries': entries,
-                }
-            return None
+        info = metadata_cache.extract_info(url, ydl_opts, variant='flat', refresh=refresh)
+        if 'entries' in info:
+            entries = list(info['entries'])
+            return {
+                'title': info.get('title', 'Unknown Playlist'),
+                'count': len(entries),
+                'entries': entries,
+            }
+        return None
     except Exception as e:
         print(f"⚠️  Could not fetch playlist info: {e}")
         return None
 
 
+def download_with_store(url, ydl_opts, info=None, stored=None):
+    """Run a yt-dlp download whose source stream comes from the shared audio store
+
+    The bestaudio stream is fetched into the store only if it is not there yet,
+    then linked to the path yt-dlp expects, so yt-dlp skips the download and only
+    runs the configured postprocessors (e.g. MP3 extraction). Returns the info dict.
+    Metadata is extracted once (or taken from info / the metadata cache) and the
+    same info dict drives both the store download and the postprocessing.
+    stored (with info) is a stream the caller already fetched and pinned with
+    audio_store.ensure_audio(); it is used as-is and never downloaded again.
+    """
+    import yt_dlp
+
+    quiet = ydl_opts.get('quiet', False)
+    if stored is not None:
+        if not os.path.isfile(stored):
+            raise FileNotFoundError(f"Stored audio is missing: {stored}")
+        pinned = None
+    else:
+        if info is None:
+            info = audio_store.extract_info(url, quiet=quiet)
+        stored, info = audio_store.ensure_audio(url, info, quiet=quiet, pin=True)
+        pinned = stored
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            audio_store.link(stored, ydl.prepare_filename(info))
+            ydl.process_ie_result(info, download=True)
+    finally:
+        if pinned is not None:
+            audio_store.release(pinned)
+    return info
+
+
 def convert_to_mp3(url, output_dir=None):
     """Download audio and convert to MP3"""
     if output_dir is None:
@@ -89,14 +130,8 @@ def convert_to_mp3(url, output_dir=None):
     video_info = get_video_info(url)
     title = video_info['title']
     
-    # Sanitize title for filename (remove invalid characters)
-    safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-    safe_title = safe_title.replace(' ', '_')[:50]  # Limit length
-    
-    # Generate short hash
-    short_hash = generate_short_hash(url + title)
-    filename = f"{safe_title}_{short_hash}.mp3"
-    output_path = os.path.join(output_dir, filename)
+    # Sanitized title plus a short hash
+    output_path = os.path.join(output_dir, make_output_filename(url, title, 'mp3'))
     
     print(f"🎵 Converting to MP3: {title}")
     print(f"📁 Output: {output_path}")
@@ -116,8 +151,7 @@ def convert_to_mp3(url, output_dir=None):
     }
     
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
+        download_with_store(url, ydl_opts, video_info['info'])
         
         # Check if file was created (yt-dlp might add extension)
         if os.path.exists(output_path):
@@ -141,38 +175,69 @@ def convert_to_mp3(url, output_dir=None):
         sys.exit(1)
 
 
-def convert_playlist_to_mp3(url, output_dir=None, count=None):
-    """Download entire playlist and convert all videos to MP3 using yt-dlp native playlist support"""
+def get_mp3_path(info, ydl_opts):
+    """Final MP3 path for an entry converted with ydl_opts"""
+    import yt_dlp
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        return os.path.splitext(ydl.prepare_filename(info))[0] + '.mp3'
+
+
+def convert_playlist_to_mp3(url, output_dir=None, count=None, jobs=1, per_host=2, retries=3,
+                            sync=False, verify=False):
+    """Download entire playlist and convert all videos to MP3
+
+    Each entry's audio comes from the shared audio store, so videos already
+    downloaded by another command (or an earlier run) are not fetched again.
+    With jobs > 1, up to jobs entries download at once (at most per_host per
+    host, failed downloads retried with backoff) while finished downloads are
+    encoded to MP3 on every core.
+
+    With sync=True, a manifest in the playlist folder records every converted
+    entry; entries it lists as done (and whose MP3 is still there) are skipped
+    without being probed, so later runs only process new videos. verify=True
+    also re-hashes those MP3s and redoes any that changed.
+
+    Returns a summary dict (playlist_dir, converted, failures).
+    """
+    import yt_dlp
+
     if output_dir is None:
         output_dir = os.getcwd()
     
-    # Get playlist info for display (optional)
     print("📋 Fetching playlist information...")
-    playlist_info = get_playlist_info(url)
+    # A sync always needs the current listing to see new videos
+    playlist_info = get_playlist_info(url, refresh=sync)
     
-    if playlist_info:
-        playlist_title = playlist_info['title']
-        total_count = playlist_info['count']
-        print(f"📚 Playlist: {playlist_title}")
-        print(f"📊 Found {total_count} videos")
-    else:
-        playlist_title = 'Playlist'
-        print("📚 Processing playlist...")
+    if not playlist_info or not playlist_info['entries']:
+        print("❌ Error: Could not read playlist entries")
+        sys.exit(1)
+    
+    playlist_title = playlist_info['title']
+    entries = playlist_info['entries'][:count] if count else playlist_info['entries']
+    print(f"📚 Playlist: {playlist_title}")
+    print(f"📊 Found {playlist_info['count']} videos")
     
-    # Create playlist directory using yt-dlp's output template
-    # yt-dlp will automatically create the directory based on %(playlist)s
-    # We'll use: %(playlist)s/%(title)s.%(ext)s
-    # This ensures each file is named by its title and organized in playlist folder
+    # Same layout as yt-dlp's %(playlist)s/%(title)s.%(ext)s template:
+    # a folder named after the playlist and files named by title
+    playlist_dir = os.path.join(output_dir, yt_dlp.utils.sanitize_filename(playlist_title))
+    output_template = os.path.join(playlist_dir, '%(title)s.%(ext)s')
+    
+    manifest = None
+    if sync:
+        import playlist_manifest
+
+        manifest = playlist_manifest.Manifest(playlist_dir)
+        manifest.set_playlist(url, playlist_title)
+        check = manifest.verify if verify else manifest.is_complete
+        pending = [entry for entry in entries if not (entry.get('id') and check(entry['id']))]
+        print(f"🔁 Sync: {len(entries) - len(pending)} videos already converted, {len(pending)} to process")
+        entries = pending
     
     print(f"\n🔄 Downloading entire playlist...")
-    print(f"📁 Files will be saved to: {output_dir}")
+    print(f"📁 Files will be saved to: {playlist_dir}")
     print(f"📝 Each file will be named: [Video Title].mp3\n")
     
-    # Use yt-dlp's native playlist support - it handles everything automatically
-    # Output template: %(playlist)s/%(title)s.%(ext)s
-    # This creates a folder named after the playlist and files named by title
-    output_template = os.path.join(output_dir, '%(playlist)s', '%(title)s.%(ext)s')
-    
     ydl_opts = {
         'format': 'bestaudio/best',
         'outtmpl': output_template,
@@ -183,51 +248,282 @@ def convert_playlist_to_mp3(url, output_dir=None, count=None):
         }],
         'embed_metadata': True,
         'embed_thumbnail': True,
-        'yes_playlist': True,  # Ensure playlist is downloaded even if URL points to single video in playlist
         'quiet': False,
         'no_warnings': False,
-        'ignoreerrors': True,  # Continue on errors for individual videos
     }
     
-    try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-        print(f"\n{'='*60}")
-        print(f"✅ Playlist download completed!")
-        print(f"📁 Files saved to: {os.path.join(output_dir, playlist_title if playlist_info else 'Playlist')}")
-        print(f"{'='*60}")
-    except Exception as e:
-        print(f"\n❌ Error downloading playlist: {e}")
-        print("💡 Some videos may have been downloaded successfully. Check the output directory.")
-        sys.exit(1)
+    failures = []
+    if jobs > 1:
+        failures = convert_entries_concurrently(entries, ydl_opts, jobs, per_host, retries, manifest)
+    else:
+        for index, entry in enumerate(entries, 1):
+            entry_title = entry.get('title') or entry.get('id')
+            print(f"\n[{index}/{len(entries)}] {entry_title}")
+            try:
+                if manifest and entry.get('id'):
+                    manifest.mark_pending(entry['id'], entry_title)
+                info = download_with_store(get_entry_url(entry), ydl_opts)
+                if manifest and entry.get('id'):
+                    manifest.mark_done(entry['id'], get_mp3_path(info, ydl_opts))
+            except Exception as e:
+                # Continue on errors for individual videos
+                print(f"⚠️  Skipping {entry_title}: {e}")
+                failures.append((entry_title, str(e)))
+                if manifest and entry.get('id'):
+                    manifest.mark_failed(entry['id'], e)
+    
+    print(f"\n{'='*60}")
+    print(f"✅ Playlist download completed! ({len(entries) - len(failures)}/{len(entries)} videos)")
+    for entry_title, error in failures:
+        print(f"   ❌ {entry_title}: {error}")
+    print(f"📁 Files saved to: {playlist_dir}")
+    print(f"{'='*60}")
+    return {
+        'playlist_dir': playlist_dir,
+        'converted': len(entries) - len(failures),
+        'failures': [{'title': entry_title, 'error': str(error)} for entry_title, error in failures],
+    }
+
 
+def convert_entries_concurrently(entries, ydl_opts, jobs, per_host=2, retries=3, manifest=None):
+    """Convert playlist entries to MP3 with a download pool feeding encode slots
 
-def convert_to_txt(url):
-    """Convert video to text transcript using whisper_transcribe.py"""
-    print("📝 Converting to text transcript using Whisper AI...")
+    Progress is recorded in manifest (a playlist_manifest.Manifest), if given.
+    Returns a list of (title, error) for the entries that failed.
+    """
+    import threading
+
+    import download_pool
+
+    # Interleaved yt-dlp progress output from many workers is unreadable
+    ydl_opts = dict(ydl_opts, quiet=True, no_warnings=True, noprogress=True)
+    encode_workers = os.cpu_count() or 1
+    print(f"⚙️  {jobs} concurrent downloads (max {per_host} per host, {retries} attempts), "
+          f"{encode_workers} MP3 encode slots\n")
+    
+    def download(entry):
+        entry_url = get_entry_url(entry)
+        if manifest and entry.get('id'):
+            manifest.mark_pending(entry['id'], entry.get('title') or entry['id'])
+        # Pinned until encoded, so other downloads cannot evict it in between
+        return audio_store.ensure_audio(entry_url, audio_store.extract_info(entry_url), quiet=True, pin=True)
+    
+    def encode(entry, downloaded):
+        stored, info = downloaded
+        try:
+            # Encode slots never download: the stream came through the host limiter
+            info = download_with_store(get_entry_url(entry), ydl_opts, info, stored=stored)
+        finally:
+            audio_store.release(stored)
+        if manifest and entry.get('id'):
+            manifest.mark_done(entry['id'], get_mp3_path(info, ydl_opts))
+        return info
+    
+    done = 0
+    lock = threading.Lock()
+    
+    def report(entry, error):
+        nonlocal done
+        with lock:
+            done += 1
+            entry_title = entry.get('title') or entry.get('id')
+            if error:
+                print(f"[{done}/{len(entries)}] ⚠️  Skipping {entry_title}: {error}")
+                if manifest and entry.get('id'):
+                    manifest.mark_failed(entry['id'], error)
+            else:
+                print(f"[{done}/{len(entries)}] ✓ {entry_title}")
     
-    # Get path to whisper_transcribe.py (same directory as this script)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    whisper_script = os.path.join(script_dir, 'whisper_transcribe.py')
+    outcomes = download_pool.run_jobs(
+        entries,
+        download,
+        encode,
+        get_entry_url,
+        jobs=jobs,
+        encode_workers=encode_workers,
+        per_host=per_host,
+        attempts=retries,
+        on_complete=report,
+    )
+    return [(entry.get('title') or entry.get('id'), error) for entry, _, error in outcomes if error]
+
+
+def get_entry_url(entry):
+    """Get a downloadable URL for a flat playlist entry"""
+    url = entry.get('url') or ''
+    if url.startswith('http'):
+        return url
+    return f"https://www.youtube.com/watch?v={entry.get('id') or url}"
+
+
+def convert_playlist_to_txt(url, output_dir=None, model_name=None, format_type='timestamped',
+                            download_workers=2, transcribe_workers=1, max_pending=2,
+                            download_fn=None, use_cache=True, caption_policy='manual', caption_languages=None,
+                            language=None):
+    """Transcribe every video in a playlist, overlapping downloads with transcription
+
+    Videos already in the transcript cache are saved straight from the cache, and
+    videos with captions accepted by caption_policy are saved from their captions.
+
+    download_fn(entry) can replace the yt-dlp download (e.g. with
+    transcribe_pipeline.fixture_downloader() for offline runs).
+    """
+    import transcribe_pipeline
+    import transcript_cache
+    import whisper_transcribe
+
+    if output_dir is None:
+        output_dir = os.getcwd()
+    model_name = model_name or whisper_transcribe.get_default_model()
     
-    if not os.path.exists(whisper_script):
-        print(f"❌ Error: whisper_transcribe.py not found at {whisper_script}")
+    print("📋 Fetching playlist information...")
+    playlist_info = get_playlist_info(url)
+    if not playlist_info or not playlist_info['entries']:
+        print("❌ Error: Could not read playlist entries")
         sys.exit(1)
     
-    # Call whisper_transcribe.py
+    playlist_title = playlist_info['title']
+    safe_title = "".join(c for c in playlist_title if c.isalnum() or c in (' ', '-', '_')).strip() or 'Playlist'
+    playlist_dir = os.path.join(output_dir, safe_title)
+    os.makedirs(playlist_dir, exist_ok=True)
+    ext = whisper_transcribe.get_output_extension(format_type)
+    
+    print(f"📚 Playlist: {playlist_title}")
+    print(f"📊 Found {playlist_info['count']} videos")
+    print(f"⚙️  {download_workers} download workers, {transcribe_workers} transcription workers, "
+          f"max {max_pending} audio files pending")
+    print(f"📁 Transcripts will be saved to: {playlist_dir}\n")
+    
+    if download_fn is None:
+        def download_fn(entry):
+            # Pinned until transcribed, so later downloads cannot evict it
+            # while it waits in the queue (released by cleanup_audio())
+            audio_file, _ = whisper_transcribe.fetch_audio(get_entry_url(entry), pin=True)
+            return audio_file
+    
+    replicas = itertools.count()
+    
+    def make_transcriber():
+        # One model copy per transcription worker, so they can run in parallel
+        transcribe = whisper_transcribe.make_transcriber(model_name, language, replica=next(replicas))
+        return lambda entry, audio_file: transcribe(audio_file)
+    
+    def cache_key(entry):
+        if not use_cache or not entry.get('id'):
+            return None
+        return whisper_transcribe.get_cache_key(entry['id'], model_name, language)
+    
+    def save(entry, result):
+        output_file = os.path.join(playlist_dir, f"{entry.get('id') or generate_short_hash(str(entry))}.{ext}")
+        whisper_transcribe.save_transcript(result, output_file, format_type)
+        print(f"✓ Saved: {output_file} ({entry.get('title', 'Unknown')})")
+    
+    def save_and_cache(entry, result):
+        key = cache_key(entry)
+        if key:
+            transcript_cache.put(*key, result)
+        save(entry, result)
+    
+    outcomes = []
+    uncached = []
+    for entry in playlist_info['entries']:
+        key = cache_key(entry)
+        result = transcript_cache.get(key[0]) if key else None
+        if result is None:
+            uncached.append(entry)
+        else:
+            save(entry, result)
+            outcomes.append((entry, result, None))
+    if outcomes:
+        print(f"⚡ {len(outcomes)} videos loaded from transcript cache\n")
+    
+    if caption_policy != 'off' and uncached:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def check_captions(entry):
+            try:
+                return whisper_transcribe.try_captions(get_entry_url(entry), caption_policy, caption_languages)
+            except Exception as e:
+                print(f"⚠️  Could not check captions for {entry.get('title') or entry.get('id')}: {e}")
+                return None
+        
+        print("📝 Checking for existing captions...")
+        with ThreadPoolExecutor(max_workers=max(1, download_workers)) as executor:
+            caption_results = list(executor.map(check_captions, uncached))
+        still_uncached = []
+        for entry, result in zip(uncached, caption_results):
+            if result is None:
+                still_uncached.append(entry)
+            else:
+                save(entry, result)
+                outcomes.append((entry, result, None))
+        print(f"📝 {len(uncached) - len(still_uncached)} videos saved from captions, "
+              f"{len(still_uncached)} need Whisper\n")
+        uncached = still_uncached
+    
+    outcomes += transcribe_pipeline.run_pipeline(
+        uncached,
+        download_fn,
+        make_transcriber,
+        handle_result=save_and_cache,
+        download_workers=download_workers,
+        transcribe_workers=transcribe_workers,
+        max_pending=max_pending,
+    )
+    
+    failures = [(entry, error) for entry, _, error in outcomes if error]
+    print(f"\n{'='*60}")
+    print(f"✅ Transcribed {len(outcomes) - len(failures)}/{len(outcomes)} videos")
+    for entry, error in failures:
+        print(f"   ❌ {entry.get('title') or entry.get('id')}: {error}")
+    print(f"📁 Files saved to: {playlist_dir}")
+    print(f"{'='*60}")
+    return outcomes
+
+
+def convert_to_txt(url, output_dir=None, model_name=None, format_type='timestamped', language=None,
+                   caption_policy='manual', caption_languages=None, use_cache=True):
+    """Transcribe a video in-process with whisper_transcribe and return the result dict
+
+    The metadata fetched here for the file name is reused for captions and the
+    audio download. Existing captions accepted by caption_policy are used
+    instead of Whisper.
+    """
+    import whisper_transcribe
+    
+    if output_dir is None:
+        output_dir = os.getcwd()
+    
+    print("📥 Fetching video information...")
+    video_info = get_video_info(url)
+    title = video_info['title']
+    ext = whisper_transcribe.get_output_extension(format_type)
+    output_path = os.path.join(output_dir, make_output_filename(url, title, ext))
+    
+    print(f"📝 Transcribing: {title}")
+    print(f"📁 Output: {output_path}")
+    
     try:
-        result = subprocess.run(
-            [sys.executable, whisper_script, url],
-            check=True,
-            capture_output=False
+        result = whisper_transcribe.transcribe_url(
+            url,
+            model_name,
+            language,
+            output_path,
+            format_type,
+            use_cache=use_cache,
+            caption_policy=caption_policy,
+            caption_languages=caption_languages,
+            info=video_info['info'],
         )
-        print("✅ Transcript generation completed")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error running whisper_transcribe.py: {e}")
+    except Exception as e:
+        print(f"❌ Error transcribing: {e}")
         sys.exit(1)
     except KeyboardInterrupt:
         print("\n⚠️  Cancelled by user")
         sys.exit(1)
+    
+    print("✅ Transcript generation completed")
+    return result
 
 
 def main():
@@ -238,7 +534,12 @@ def main():
 Examples:
   %(prog)s convert "https://www.youtube.com/watch?v=VIDEO_ID"
   %(prog)s convert "PLAYLIST_URL" --format mp3-playlist
+  %(prog)s convert "PLAYLIST_URL" --format mp3-playlist --jobs 8
+  %(prog)s convert "PLAYLIST_URL" --format mp3-playlist --sync -o mirror/
   %(prog)s convert "VIDEO_URL" --format txt
+  %(prog)s convert "VIDEO_URL" --format txt -m small -l en --transcript-format srt -o subs/
+  %(prog)s convert "PLAYLIST_URL" --format txt-playlist --download-workers 3
+  %(prog)s convert "PLAYLIST_URL" --format txt-playlist --preset fast
         """
     )
     
@@ -249,19 +550,118 @@ Examples:
     convert_parser.add_argument('url', help='YouTube video or playlist URL')
     convert_parser.add_argument(
         '--format', '-f',
-        choices=['mp3', 'mp3-playlist', 'txt'],
+        choices=['mp3', 'mp3-playlist', 'txt', 'txt-playlist'],
         help='Output format (if not specified, will prompt)'
     )
     convert_parser.add_argument(
         '--output', '-o',
         help='Output directory (default: current directory)'
     )
+    convert_parser.add_argument(
+        '--model', '-m',
+        choices=['tiny', 'base', 'small', 'medium', 'large'],
+        help='Whisper model for txt/txt-playlist (default: active model from whisper_manager.py use, or base)'
+    )
+    convert_parser.add_argument(
+        '--transcript-format',
+        choices=['text', 'timestamped', 'srt', 'json', 'jsonl'],
+        default='timestamped',
+        help='txt/txt-playlist: transcript file format (default: timestamped)'
+    )
+    convert_parser.add_argument(
+        '--language', '-l',
+        help='txt/txt-playlist: source language code (e.g., en); auto-detected if not specified'
+    )
+    convert_parser.add_argument(
+        '--preset',
+        choices=list(inference_config.PRESETS),
+        help='txt/txt-playlist: decoding preset, from fastest to most accurate '
+             '(default: config file setting, else library defaults)'
+    )
+    convert_parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='mp3-playlist: videos downloaded at once; MP3 encodes use every core (default: 1)'
+    )
+    convert_parser.add_argument(
+        '--per-host',
+        type=int,
+        default=2,
+        help='mp3-playlist with --jobs: max concurrent downloads per host (default: 2)'
+    )
+    convert_parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='mp3-playlist with --jobs: download attempts per video, with backoff (default: 3)'
+    )
+    convert_parser.add_argument(
+        '--sync',
+        action='store_true',
+        help='mp3-playlist: keep a manifest in the playlist folder and only convert '
+             'videos not already converted (resumes interrupted runs)'
+    )
+    convert_parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='mp3-playlist with --sync: re-hash converted MP3s and redo any that changed'
+    )
+    convert_parser.add_argument(
+        '--download-workers',
+        type=int,
+        default=2,
+        help='txt-playlist: parallel audio downloads (default: 2)'
+    )
+    convert_parser.add_argument(
+        '--transcribe-workers',
+        type=int,
+        default=1,
+        help='txt-playlist: parallel transcriptions, each loads its own model (default: 1)'
+    )
+    convert_parser.add_argument(
+        '--max-pending',
+        type=int,
+        default=2,
+        help='txt-playlist: max downloaded audio files waiting on disk (default: 2)'
+    )
+    convert_parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='txt/txt-playlist: ignore and do not update the transcript cache'
+    )
+    convert_parser.add_argument(
+        '--captions',
+        choices=['off', 'manual', 'any'],
+        default='manual',
+        help="txt/txt-playlist: use a video's own captions instead of Whisper when acceptable: "
+             "manual (uploaded tracks only, default), any (automatic captions too) or off"
+    )
+    convert_parser.add_argument(
+        '--caption-langs',
+        nargs='+',
+        metavar='LANG',
+        help="txt/txt-playlist: acceptable caption languages in order of preference "
+             "(default: the video's own language)"
+    )
     
     args = parser.parse_args()
     
     if args.command != 'convert':
         parser.print_help()
         sys.exit(1)
+    # yt-dlp is only imported by the conversions, so --help does not pay for it
+    from importlib.util import find_spec
+    if find_spec('yt_dlp') is None:
+        print("❌ Error: yt-dlp not installed. Install with:")
+        print("   pip install yt-dlp")
+        sys.exit(1)
+    if args.jobs < 1 or args.per_host < 1 or args.retries < 1:
+        parser.error("--jobs, --per-host and --retries must be at least 1")
+    if args.download_workers < 1 or args.transcribe_workers < 1 or args.max_pending < 1:
+        parser.error("--download-workers, --transcribe-workers and --max-pending must be at least 1")
+    # Applies to in-process transcription (the whisper daemon is not used)
+    inference_config.configure(preset=args.preset)
     
     # Sanitize URL
     sanitized_url = sanitize_url(args.url)
@@ -276,14 +676,16 @@ Examples:
         print("  1. mp3 - Single video to MP3")
         print("  2. mp3-playlist - Entire playlist to MP3")
         print("  3. txt - Video transcript (using Whisper AI)")
+        print("  4. txt-playlist - Transcripts for an entire playlist")
         print()
         
         try:
-            choice = input("Enter choice (1-3): ").strip()
+            choice = input("Enter choice (1-4): ").strip()
             choice_map = {
                 '1': 'mp3',
                 '2': 'mp3-playlist',
                 '3': 'txt',
+                '4': 'txt-playlist',
             }
             format_choice = choice_map.get(choice)
             if not format_choice:
@@ -299,9 +701,40 @@ Examples:
     if format_choice == 'mp3':
         convert_to_mp3(sanitized_url, output_dir)
     elif format_choice == 'mp3-playlist':
-        convert_playlist_to_mp3(sanitized_url, output_dir)
+        convert_playlist_to_mp3(
+            sanitized_url,
+            output_dir,
+            jobs=args.jobs,
+            per_host=args.per_host,
+            retries=args.retries,
+            sync=args.sync,
+            verify=args.verify,
+        )
     elif format_choice == 'txt':
-        convert_to_txt(sanitized_url)
+        convert_to_txt(
+            sanitized_url,
+            output_dir,
+            model_name=args.model,
+            format_type=args.transcript_format,
+            language=args.language,
+            caption_policy=args.captions,
+            caption_languages=args.caption_langs or ([args.language] if args.language else None),
+            use_cache=not args.no_cache,
+        )
+    elif format_choice == 'txt-playlist':
+        convert_playlist_to_txt(
+            sanitized_url,
+            output_dir,
+            model_name=args.model,
+            format_type=args.transcript_format,
+            language=args.language,
+            download_workers=args.download_workers,
+            transcribe_workers=args.transcribe_workers,
+            max_pending=args.max_pending,
+            use_cache=not args.no_cache,
+            caption_policy=args.captions,
+            caption_languages=args.caption_langs or ([args.language] if args.language else None),
+        )
     else:
         print(f"❌ Unknown format: {format_choice}")
         sys.exit(1)
@@ -0,0 +1,813 @@
+#!/usr/bin/env python3
+"""
+YTTOOL Job Service
+Local asyncio service that runs MP3 conversions and transcriptions from a
+persistent SQLite job queue. Duplicate requests for the same video and options
+share one job, jobs run by priority class with bounded concurrency, and clients
+submit, cancel and collect results over a Unix socket (JSON lines)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import transcript_cache
+
+# Socket and database locations (override with YTTOOL_SERVICE_SOCKET / YTTOOL_SERVICE_DB)
+DEFAULT_SOCKET_PATH = Path.home() / ".cache" / "yttool" / "service.sock"
+DEFAULT_DB_PATH = Path.home() / ".cache" / "yttool" / "jobs.sqlite3"
+
+# Job kinds, matching yttool.py convert --format
+KINDS = ('mp3', 'mp3-playlist', 'txt')
+
+# Kinds that run Whisper; limited separately so concurrent jobs do not load
+# several models at once
+TRANSCRIBE_KINDS = ('txt',)
+
+# Priority classes; lower numbers run first
+PRIORITIES = {'high': 0, 'normal': 1, 'low': 2}
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+DEFAULT_WORKERS = 2
+DEFAULT_TRANSCRIBE_WORKERS = 1
+
+# Clients wait this long for a response (seconds); result --wait waits for the job itself
+DEFAULT_TIMEOUT = 30
+
+
+def get_socket_path():
+    """Get the service socket path"""
+    return Path(os.environ.get('YTTOOL_SERVICE_SOCKET', DEFAULT_SOCKET_PATH))
+
+
+def get_db_path():
+    """Get the job database path"""
+    return Path(os.environ.get('YTTOOL_SERVICE_DB', DEFAULT_DB_PATH))
+
+
+def make_dedup_key(kind, url, options):
+    """Key under which identical requests share one job
+
+    Videos are identified by their YouTube ID, so different URL spellings of the
+    same video coalesce; playlists and other URLs by the URL itself.
+    """
+    source = url.strip()
+    if kind != 'mp3-playlist':
+        source = transcript_cache.extract_video_id(source) or source
+    return json.dumps([kind, source, options], sort_keys=True)
+
+
+# ---------------------------------------------------------------------------
+# Job store
+# ---------------------------------------------------------------------------
+
+class JobStore:
+    """Persistent job queue in SQLite; used from the event loop thread only"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            url TEXT NOT NULL,
+            options TEXT NOT NULL,
+            dedup_key TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            requests INTEGER NOT NULL DEFAULT 1,
+            result TEXT,
+            error TEXT,
+            created REAL NOT NULL,
+            started REAL,
+            finished REAL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, id);
+        CREATE INDEX IF NOT EXISTS jobs_dedup ON jobs (dedup_key, status);
+    """
+
+    def __init__(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        with self.db:
+            self.db.executescript(self.SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job['options'] = json.loads(job['options'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        del job['dedup_key']
+        return job
+
+    def recover(self):
+        """Re-queue jobs left running by a service that stopped; returns how many
+
+        Cancellations requested before the stop are applied instead.
+        """
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = ?, finished = ? WHERE status = ? AND cancel_requested",
+                (CANCELLED, time.time(), RUNNING),
+            )
+            return self.db.execute(
+                "UPDATE jobs SET status = ?, started = NULL WHERE status = ?", (QUEUED, RUNNING)
+            ).rowcount
+
+    def submit(self, kind, url, options, priority):
+        """Queue a job, or join the queued/running job for the same request
+
+        Returns (job, coalesced). Joining a queued job with a more urgent
+        priority moves it up to that priority.
+        """
+        dedup_key = make_dedup_key(kind, url, options)
+        with self.db:
+            row = self.db.execute(
+                "SELECT * FROM jobs WHERE dedup_key = ? AND status IN (?, ?) AND NOT cancel_requested "
+                "ORDER BY id LIMIT 1",
+                (dedup_key, QUEUED, RUNNING),
+            ).fetchone()
+            if row is not None:
+                self.db.execute(
+                    "UPDATE jobs SET requests = requests + 1, priority = MIN(priority, ?) WHERE id = ?",
+                    (priority, row['id']),
+                )
+                return self.get(row['id']), True
+            cursor = self.db.execute(
+                "INSERT INTO jobs (kind, url, options, dedup_key, priority, status, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, url, json.dumps(options, sort_keys=True), dedup_key, priority, QUEUED, time.time()),
+            )
+        return self.get(cursor.lastrowid), False
+
+    def claim_next(self, exclude_kinds=()):
+        """Mark the most urgent queued job (oldest first within a priority) as running"""
+        query = "SELECT * FROM jobs WHERE status = ?"
+        params = [QUEUED]
+        if exclude_kinds:
+            query += f" AND kind NOT IN ({', '.join('?' * len(exclude_kinds))})"
+            params.extend(exclude_kinds)
+        query += " ORDER BY priority, id LIMIT 1"
+        with self.db:
+            row = self.db.execute(query, params).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE jobs SET status = ?, started = ? WHERE id = ?", (RUNNING, time.time(), row['id'])
+            )
+        return self.get(row['id'])
+
+    def finish(self, job_id, status, result=None, error=None):
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished = ? WHERE id = ?",
+                (status, json.dumps(result, default=transcript_cache.json_default) if result is not None else None,
+                 error, time.time(), job_id),
+            )
+        return self.get(job_id)
+
+    def request_cancel(self, job_id):
+        with self.db:
+            self.db.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+        return self.get(job_id)
+
+    def get(self, job_id):
+        return self._to_dict(self.db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, status=None, limit=50):
+        """Most recent jobs first, optionally only those with a given status"""
+        if status:
+            rows = self.db.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit)
+            )
+        else:
+            rows = self.db.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self):
+        """Number of jobs per status"""
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+
+# ---------------------------------------------------------------------------
+# Job handlers
+# ---------------------------------------------------------------------------
+
+def run_mp3(url, options):
+    import yttool
+
+    return {'output_file': yttool.convert_to_mp3(url, options.get('output_dir'))}
+
+
+def run_mp3_playlist(url, options):
+    import yttool
+
+    return yttool.convert_playlist_to_mp3(
+        url,
+        options.get('output_dir'),
+        count=options.get('count'),
+        jobs=options.get('jobs', 1),
+        sync=options.get('sync', False),
+    )
+
+
+def run_txt(url, options):
+    import whisper_transcribe
+    import yttool
+
+    output_dir = options.get('output_dir') or os.getcwd()
+    format_type = options.get('format', 'timestamped')
+    video_info = yttool.get_video_info(url)
+    output_file = os.path.join(
+        output_dir,
+        yttool.make_output_filename(url, video_info['title'], whisper_transcribe.get_output_extension(format_type)),
+    )
+    result = whisper_transcribe.transcribe_url(
+        url,
+        options.get('model'),
+        options.get('language'),
+        output_file,
+        format_type,
+        caption_policy=options.get('captions', 'manual'),
+        info=video_info['info'],
+    )
+    return summarize_transcript(result, output_file)
+
+
+def summarize_transcript(result, output_file):
+    """What a txt job stores as its result; the transcript itself is in output_file"""
+    return {
+        'output_file': output_file,
+        'language': result.get('language'),
+        'source': result.get('source', 'whisper'),
+        'segments': len(result.get('segments', [])),
+        'words': len(result.get('text', '').split()),
+    }
+
+
+def default_handlers():
+    """Handlers that run the real yttool.py / whisper_transcribe.py code paths"""
+    return {'mp3': run_mp3, 'mp3-playlist': run_mp3_playlist, 'txt': run_txt}
+
+
+def offline_handlers(fixture_file, delay=0.0):
+    """Stand-in handlers that never touch the network
+
+    The download step is transcribe_pipeline.fixture_downloader(): every video
+    "downloads" as a copy of fixture_file after delay seconds. mp3 jobs keep that
+    copy as the converted file (named by video ID), playlists are
+    options['count'] (default 3) such videos, and txt jobs transcribe the
+    fixture with the local Whisper install. Used to exercise the queue,
+    coalescing and cancellation offline.
+    """
+    import transcribe_pipeline
+
+    download = transcribe_pipeline.fixture_downloader(fixture_file, delay)
+    extension = os.path.splitext(fixture_file)[1]
+
+    def stand_in_name(url):
+        return transcript_cache.extract_video_id(url) or hashlib.sha256(url.encode('utf-8')).hexdigest()[:12]
+
+    def mp3(url, options, name=None):
+        output_dir = options.get('output_dir') or os.getcwd()
+        os.makedirs(output_dir, exist_ok=True)
+        audio_file = download(url)
+        output_file = os.path.join(output_dir, (name or stand_in_name(url)) + extension)
+        shutil.copyfile(audio_file, output_file)
+        transcribe_pipeline.cleanup_audio(audio_file)
+        return {'output_file': output_file}
+
+    def mp3_playlist(url, options):
+        playlist_dir = os.path.join(options.get('output_dir') or os.getcwd(), 'playlist')
+        count = options.get('count') or 3
+        for index in range(count):
+            mp3(url, dict(options, output_dir=playlist_dir), name=f"{index + 1:03d}")
+        return {'playlist_dir': playlist_dir, 'converted': count, 'failures': []}
+
+    def txt(url, options):
+        import whisper_transcribe
+
+        format_type = options.get('format', 'timestamped')
+        output_file = os.path.join(
+            options.get('output_dir') or os.getcwd(),
+            stand_in_name(url) + '.' + whisper_transcribe.get_output_extension(format_type),
+        )
+        audio_file = download(url)
+        try:
+            transcribe = whisper_transcribe.make_transcriber(
+                options.get('model') or whisper_transcribe.get_default_model(), options.get('language')
+            )
+            result = transcribe(audio_file)
+        finally:
+            transcribe_pipeline.cleanup_audio(audio_file)
+        whisper_transcribe.save_transcript(result, output_file, format_type)
+        return summarize_transcript(result, output_file)
+
+    return {'mp3': mp3, 'mp3-playlist': mp3_playlist, 'txt': txt}
+
+
+def _call_handler(handler, url, options):
+    """Run a handler in a worker thread
+
+    The yttool.py conversion functions exit the process on errors; inside the
+    service that becomes a failed job instead.
+    """
+    try:
+        return handler(url, options)
+    except SystemExit as e:
+        raise RuntimeError(f"job exited with status {e.code} (details in the service log)")
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+class JobService:
+    """Runs queued jobs on worker threads and answers client requests
+
+    Handlers are blocking functions handler(url, options) -> result dict, run
+    in a thread pool. At most workers jobs run at once, and at most
+    transcribe_workers of them are transcriptions. A running job cannot be
+    interrupted: cancelling it discards its result when it finishes.
+    """
+
+    def __init__(self, store, handlers=None, workers=DEFAULT_WORKERS,
+                 transcribe_workers=DEFAULT_TRANSCRIBE_WORKERS):
+        self.store = store
+        self.handlers = handlers or default_handlers()
+        self.workers = max(1, workers)
+        self.transcribe_workers = max(1, transcribe_workers)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='yttool-job')
+        self.started_at = time.time()
+        self.request_count = 0
+        self._running = {}  # job id -> kind
+        self._waiters = {}  # job id -> futures resolved when the job finishes
+        self.interrupted = []  # job ids whose handlers were still running at shutdown
+        self._wakeup = asyncio.Event()
+        self.stopped = asyncio.Event()
+
+    def _claim(self):
+        running_transcriptions = sum(1 for kind in self._running.values() if kind in TRANSCRIBE_KINDS)
+        exclude = TRANSCRIBE_KINDS if running_transcriptions >= self.transcribe_workers else ()
+        return self.store.claim_next(exclude)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = self._claim()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            self._running[job['id']] = job['kind']
+            print(f"▶️  Job {job['id']}: {job['kind']} {job['url']}")
+            result, error = None, None
+            try:
+                handler = self.handlers[job['kind']]
+                result = await loop.run_in_executor(
+                    self.executor, _call_handler, handler, job['url'], job['options']
+                )
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            finally:
+                del self._running[job['id']]
+
+            if self.store.get(job['id'])['cancel_requested']:
+                status, result = CANCELLED, None
+            else:
+                status = FAILED if error else DONE
+            job = self.store.finish(job['id'], status, result, error)
+            mark = {DONE: '✓', FAILED: '❌', CANCELLED: '🚫'}[status]
+            print(f"{mark} Job {job['id']} {status}" + (f": {error}" if error else ""))
+            self._notify(job)
+            # A finished transcription may unblock a queued one
+            self._wakeup.set()
+
+    def _notify(self, job):
+        for future in self._waiters.pop(job['id'], []):
+            if not future.done():
+                future.set_result(job)
+
+    def start(self):
+        """Start the worker tasks (call from the running event loop)"""
+        recovered = self.store.recover()
+        if recovered:
+            print(f"🔁 Re-queued {recovered} job(s) interrupted by the last shutdown")
+        return [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def submit(self, kind, url, options=None, priority='normal'):
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind '{kind}' (choose from: {', '.join(self.handlers)})")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}' (choose from: {', '.join(PRIORITIES)})")
+        job, coalesced = self.store.submit(kind, url, options or {}, PRIORITIES[priority])
+        self._wakeup.set()
+        return job, coalesced
+
+    def cancel(self, job_id):
+        """Cancel a queued job now, or a running one when it finishes"""
+        job = self._get(job_id)
+        if job['status'] == QUEUED:
+            job = self.store.finish(job_id, CANCELLED)
+            self._notify(job)
+        elif job['status'] == RUNNING:
+            job = self.store.request_cancel(job_id)
+        return job
+
+    async def wait(self, job_id):
+        """The job once it has finished"""
+        job = self._get(job_id)
+        if job['status'] in FINISHED:
+            return job
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, []).append(future)
+        return await future
+
+    def _get(self, job_id):
+        job = self.store.get(job_id)
+        if job is None:
+            raise ValueError(f"No job {job_id}")
+        return job
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started_at,
+            'requests': self.request_count,
+            'workers': self.workers,
+            'transcribe_workers': self.transcribe_workers,
+            'running': sorted(self._running),
+            'counts': self.store.counts(),
+        }
+
+    async def dispatch(self, message):
+        """Handle one request message; returns the response dict"""
+        self.request_count += 1
+        op = message.get('op')
+        if op == 'ping':
+            return {'ok': True}
+        if op == 'submit':
+            job, coalesced = self.submit(
+                message.get('kind'), message['url'], message.get('options'), message.get('priority', 'normal')
+            )
+            return {'ok': True, 'job': job, 'coalesced': coalesced}
+        if op == 'status':
+            if message.get('id') is not None:
+                return {'ok': True, 'job': self._get(message['id'])}
+            return dict(self.status(), ok=True)
+        if op == 'list':
+            return {'ok': True, 'jobs': self.store.list(message.get('status'), message.get('limit', 50))}
+        if op == 'result':
+            if message.get('wait'):
+                return {'ok': True, 'job': await self.wait(message['id'])}
+            return {'ok': True, 'job': self._get(message['id'])}
+        if op == 'cancel':
+            return {'ok': True, 'job': self.cancel(message['id'])}
+        if op == 'shutdown':
+            self.stopped.set()
+            return {'ok': True}
+        return {'ok': False, 'error': f"Unknown op: {op}"}
+
+    async def handle_client(self, reader, writer):
+        """Answer JSON-line requests on one connection until the client closes it"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.dispatch(json.loads(line.decode('utf-8')))
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                writer.write(json.dumps(response, default=transcript_cache.json_default,
+                                        ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Client went away, or the service is shutting down
+            pass
+        finally:
+            writer.close()
+
+
+async def run_service(service, socket_path):
+    """Serve requests and run jobs until a shutdown request arrives"""
+    server = await asyncio.start_unix_server(service.handle_client, path=str(socket_path))
+    os.chmod(socket_path, 0o600)
+    workers = service.start()
+    try:
+        async with server:
+            await service.stopped.wait()
+    finally:
+        service.interrupted = sorted(service._running)
+        for task in workers:
+            task.cancel()
+        # Jobs still running are re-queued on the next start
+        service.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(workers=DEFAULT_WORKERS, transcribe_workers=DEFAULT_TRANSCRIBE_WORKERS, handlers=None):
+    """Run the service in the foreground until stopped"""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("❌ Error: Unix sockets are not supported on this platform")
+        sys.exit(1)
+
+    socket_path = get_socket_path()
+    if is_running():
+        print(f"⚠️  YTTOOL service already running on {socket_path}")
+        sys.exit(1)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        socket_path.unlink()  # Stale socket from a crashed service
+
+    store = JobStore(get_db_path())
+    service = None
+    exit_code = 0
+    try:
+        print(f"🚀 YTTOOL service listening on {socket_path} "
+              f"(workers: {workers}, for transcription: {transcribe_workers})")
+        print(f"   Jobs: {get_db_path()}")
+        print("   Stop with: python3 yttool_service.py stop")
+
+        async def main():
+            nonlocal service
+            # Created inside the loop, which its asyncio primitives belong to
+            service = JobService(store, handlers, workers, transcribe_workers)
+            await run_service(service, socket_path)
+
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+    except Exception:
+        traceback.print_exc()
+        print("❌ Error: YTTOOL service crashed")
+        exit_code = 1
+    finally:
+        if socket_path.exists():
+            socket_path.unlink()
+
+    if service is not None and service.interrupted:
+        # Handler threads cannot be interrupted and would keep the interpreter
+        # alive; their jobs are re-queued on the next start. The store is not
+        # closed under them (every committed row is already on disk).
+        print(f"🛑 YTTOOL service stopped (re-queueing {len(service.interrupted)} running job(s) on next start)")
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)
+    if service is not None:
+        service.executor.shutdown(wait=True)
+    store.close()
+    print("🛑 YTTOOL service stopped")
+    if exit_code:
+        sys.exit(exit_code)
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+def send_request(message, timeout=DEFAULT_TIMEOUT):
+    """Send one request to the service and return its response dict
+
+    Returns None if no service is listening on the socket.
+    """
+    socket_path = get_socket_path()
+    if not hasattr(socket, 'AF_UNIX') or not socket_path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(str(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return None
+        sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as rfile:
+            line = rfile.readline()
+        if not line:
+            raise ConnectionError("Connection closed before a response was received")
+        return json.loads(line.decode('utf-8'))
+    finally:
+        sock.close()
+
+
+def is_running():
+    """Check whether the service is accepting connections"""
+    try:
+        response = send_request({'op': 'ping'}, timeout=2)
+    except (OSError, ValueError):
+        return False
+    return bool(response and response.get('ok'))
+
+
+def format_job(job):
+    """One-line job summary for the CLI"""
+    priority = {number: name for name, number in PRIORITIES.items()}.get(job['priority'], job['priority'])
+    line = f"#{job['id']:<5} {job['status']:9} {priority:6} {job['kind']:12} {job['url']}"
+    if job['requests'] > 1:
+        line += f" (x{job['requests']})"
+    if job['cancel_requested'] and job['status'] == RUNNING:
+        line += " [cancelling]"
+    return line
+
+
+def print_job(job):
+    print(format_job(job))
+    if job['error']:
+        print(f"   ❌ {job['error']}")
+    for key, value in (job['result'] or {}).items():
+        print(f"   {key}: {value}")
+    if job['started'] and job['finished']:
+        print(f"   Ran for {job['finished'] - job['started']:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Queue MP3 conversions and transcriptions in a local background service",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s serve                                    # Run the service (2 workers)
+  %(prog)s serve --offline fixture.mp3 --delay 2    # Offline, with a stand-in downloader
+  %(prog)s submit "VIDEO_URL"                       # Queue an MP3 conversion
+  %(prog)s submit "VIDEO_URL" --kind txt -m small --priority high --wait
+  %(prog)s list                                     # Recent jobs
+  %(prog)s status 12                                # One job
+  %(prog)s result 12 --wait                         # Wait for a job and show its result
+  %(prog)s cancel 12
+  %(prog)s stop
+
+Submitting the same video with the same options while a job for it is queued
+or running returns that job instead of creating a new one.
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+
+    serve_parser = subparsers.add_parser('serve', help='Run the service in the foreground')
+    serve_parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                              help=f'Jobs running at once (default: {DEFAULT_WORKERS})')
+    serve_parser.add_argument('--transcribe-workers', type=int, default=DEFAULT_TRANSCRIBE_WORKERS,
+                              help=f'Transcriptions running at once (default: {DEFAULT_TRANSCRIBE_WORKERS})')
+    serve_parser.add_argument('--offline', metavar='FIXTURE',
+                              help='Serve every download from this local audio file instead of YouTube')
+    serve_parser.add_argument('--delay', type=float, default=0.0,
+                              help='Simulated download time in seconds with --offline (default: 0)')
+
+    submit_parser = subparsers.add_parser('submit', help='Queue a job')
+    submit_parser.add_argument('url', help='YouTube video or playlist URL')
+    submit_parser.add_argument('--kind', choices=KINDS, default='mp3', help='Job kind (default: mp3)')
+    submit_parser.add_argument('--priority', choices=list(PRIORITIES), default='normal',
+                               help='Priority class (default: normal)')
+    submit_parser.add_argument('-o', '--output', help='Output directory (default: current directory)')
+    submit_parser.add_argument('-m', '--model', choices=['tiny', 'base', 'small', 'medium', 'large'],
+                               help='Whisper model for txt jobs')
+    submit_parser.add_argument('-l', '--language', help='Language code for txt jobs')
+    submit_parser.add_argument('--transcript-format', choices=['text', 'timestamped', 'srt', 'json', 'jsonl'],
+                               default='timestamped', help='Transcript format for txt jobs (default: timestamped)')
+    submit_parser.add_argument('--captions', choices=['off', 'manual', 'any'], default='manual',
+                               help='Use existing captions for txt jobs (default: manual)')
+    submit_parser.add_argument('--jobs', type=int, default=1, help='Concurrent downloads for mp3-playlist jobs')
+    submit_parser.add_argument('--count', type=int, help='Only the first COUNT playlist entries')
+    submit_parser.add_argument('--sync', action='store_true', help='Incremental playlist sync (mp3-playlist)')
+    submit_parser.add_argument('--wait', action='store_true', help='Wait for the job to finish')
+
+    status_parser = subparsers.add_parser('status', help='Show service status, or one job')
+    status_parser.add_argument('job', type=int, nargs='?', help='Job ID')
+
+    list_parser = subparsers.add_parser('list', help='List recent jobs')
+    list_parser.add_argument('--status', choices=[QUEUED, RUNNING] + list(FINISHED), help='Only jobs in this state')
+    list_parser.add_argument('--limit', type=int, default=50, help='Number of jobs (default: 50)')
+
+    result_parser = subparsers.add_parser('result', help="Show a job's result")
+    result_parser.add_argument('job', type=int, help='Job ID')
+    result_parser.add_argument('--wait', action='store_true', help='Wait for the job to finish')
+
+    cancel_parser = subparsers.add_parser('cancel', help='Cancel a job')
+    cancel_parser.add_argument('job', type=int, help='Job ID')
+
+    subparsers.add_parser('stop', help='Stop the running service')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        handlers = None
+        if args.offline:
+            if not os.path.exists(args.offline):
+                print(f"❌ Error: Fixture file not found: {args.offline}")
+                sys.exit(1)
+            handlers = offline_handlers(os.path.abspath(args.offline), args.delay)
+            print(f"📴 Offline: downloads are served from {args.offline}")
+        serve(args.workers, args.transcribe_workers, handlers)
+        return
+
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+
+    def request(message, timeout=DEFAULT_TIMEOUT):
+        try:
+            response = send_request(message, timeout)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: Could not talk to the YTTOOL service: {e}")
+            sys.exit(1)
+        if not response:
+            print(f"📭 YTTOOL service not running ({get_socket_path()})")
+            sys.exit(1)
+        if not response.get('ok'):
+            print(f"❌ Error: {response.get('error', 'unknown service error')}")
+            sys.exit(1)
+        return response
+
+    if args.command == 'submit':
+        options = {'output_dir': os.path.abspath(args.output or os.getcwd())}
+        if args.kind == 'txt':
+            options.update(model=args.model, language=args.language,
+                           format=args.transcript_format, captions=args.captions)
+        elif args.kind == 'mp3-playlist':
+            options.update(jobs=args.jobs, count=args.count, sync=args.sync)
+        response = request({'op': 'submit', 'kind': args.kind, 'url': args.url,
+                            'options': options, 'priority': args.priority})
+        job = response['job']
+        if response['coalesced']:
+            print(f"🔗 Joined existing job #{job['id']} ({job['status']})")
+        else:
+            print(f"📥 Queued job #{job['id']}")
+        if args.wait:
+            job = request({'op': 'result', 'id': job['id'], 'wait': True}, timeout=None)['job']
+            print_job(job)
+            if job['status'] != DONE:
+                sys.exit(1)
+
+    elif args.command == 'status':
+        if args.job is not None:
+            print_job(request({'op': 'status', 'id': args.job})['job'])
+            return
+        response = request({'op': 'status'})
+        counts = response['counts']
+        print(f"✓ YTTOOL service running (pid {response['pid']})")
+        print(f"   Socket: {get_socket_path()}")
+        print(f"   Workers: {response['workers']} ({response['transcribe_workers']} for transcription)")
+        print(f"   Running: {', '.join(f'#{job_id}' for job_id in response['running']) or 'nothing'}")
+        print("   Jobs: " + ', '.join(f"{counts.get(status, 0)} {status}"
+                                       for status in (QUEUED, RUNNING) + FINISHED))
+        print(f"   Requests served: {response['requests']}")
+        print(f"   Uptime: {response['uptime'] / 60:.1f} min")
+
+    elif args.command == 'list':
+        jobs = request({'op': 'list', 'status': args.status, 'limit': args.limit})['jobs']
+        if not jobs:
+            print("📭 No jobs")
+        for job in jobs:
+            print(format_job(job))
+
+    elif args.command == 'result':
+        job = request({'op': 'result', 'id': args.job, 'wait': args.wait},
+                      timeout=None if args.wait else DEFAULT_TIMEOUT)['job']
+        print_job(job)
+        if job['status'] not in FINISHED:
+            print("⏳ Not finished yet (use --wait)")
+        elif job['status'] != DONE:
+            sys.exit(1)
+
+    elif args.command == 'cancel':
+        job = request({'op': 'cancel', 'id': args.job})['job']
+        if job['status'] == CANCELLED:
+            print(f"🚫 Job #{job['id']} cancelled")
+        elif job['status'] == RUNNING:
+            print(f"🚫 Job #{job['id']} is running; its result will be discarded when it finishes")
+        else:
+            print(f"⚠️  Job #{job['id']} already {job['status']}")
+
+    elif args.command == 'stop':
+        request({'op': 'shutdown'}, timeout=5)
+        print("✓ YTTOOL service stopping")
+
+
+if __name__ == "__main__":
+    main()